@@ -0,0 +1,76 @@
+"""
+Benchmark: blink-rate curves across many sessions of one two-hour film.
+
+Synthetic blink-only sessions (Poisson blinks with a per-viewer base rate modulated by the
+film's "tension" curve, random partial viewing) are written in the session_store format,
+then curves are computed cold (load + bin), from the in-memory cache, and binning only.
+
+    python bench_blink_analytics.py [--sessions 10000] [--film-minutes 120] [--bin-seconds 60]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from blink_analytics import _curve_cache, blink_rate_curves, compute_curves, session_positions
+from session_store import load_session, write_session
+
+
+def synthetic_sessions(root, sessions, film_minutes, seed=0):
+    rng = np.random.default_rng(seed)
+    film_ms = film_minutes * 60000
+    minutes = np.arange(film_minutes)
+    tension = 1.0 + 0.4 * np.sin(minutes / 9.0)
+    paths = []
+    for i in range(sessions):
+        base = rng.uniform(8, 22)  # blinks per minute
+        start = 0 if rng.random() < 0.7 else int(rng.integers(0, film_ms // 2))
+        end = film_ms if rng.random() < 0.8 else int(rng.integers(start + 60000, film_ms + 1))
+        per_minute = rng.poisson(base * tension)
+        media = np.sort(np.concatenate([m * 60000 + rng.integers(0, 60000, n) for m, n in enumerate(per_minute)]))
+        media = media[(media >= start) & (media < end)]
+        t_ms = 1_745_000_000_000 + i * 10_000_000 + (media - start)
+        path = os.path.join(root, f'session_{i:05d}')
+        write_session(path, {'t_ms': t_ms, 'media_position_ms': media, 'ear': np.full(len(media), np.nan, np.float32),
+                             'blink': np.ones(len(media), bool)}, source='synthetic', movie_name='Bench Film')
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=10000)
+    parser.add_argument('--film-minutes', type=int, default=120)
+    parser.add_argument('--bin-seconds', type=float, default=60.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        start = time.perf_counter()
+        paths = synthetic_sessions(root, args.sessions, args.film_minutes)
+        print(f"wrote {len(paths)} sessions in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        curves = blink_rate_curves(paths, args.bin_seconds)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        blink_rate_curves(paths, args.bin_seconds)
+        warm = time.perf_counter() - start
+
+        _curve_cache.clear()
+        positions = [session_positions(load_session(p)) for p in paths]
+        start = time.perf_counter()
+        compute_curves(positions, args.bin_seconds)
+        binning = time.perf_counter() - start
+
+        total_blinks = sum(len(b) for b, _ in positions)
+        print(f"{args.sessions} sessions, {total_blinks:,} blinks, {len(curves.mean)} bins")
+        print(f"  cold (load + bin + percentiles): {cold:.2f}s")
+        print(f"  binning + percentiles only:      {binning * 1000:.0f} ms")
+        print(f"  cached:                          {warm * 1000:.1f} ms")
+        print(f"  mean rate {np.nanmean(curves.mean):.1f}/min, median viewers per bin {np.median(curves.viewers):.0f}")
+
+
+if __name__ == '__main__':
+    main()
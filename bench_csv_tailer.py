@@ -0,0 +1,83 @@
+"""
+Benchmark: per-event cost of reading new rows from the realtime CSV log as it grows.
+
+The legacy watcher re-read and parsed the whole file on every modify event; CsvTailer reads
+only the appended bytes. For each log size, one row is appended per event and the time to
+pick it up is measured.
+
+    python bench_csv_tailer.py [--sizes 10000,100000,1000000,3000000] [--events 200]
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from csv_tailer import CsvTailer
+
+HEADER = ['real_time', 'elapsed_time', 'blink_count', 'movie_name']
+
+
+def legacy_get_new_rows(path, state):
+    # What realtime_csv_watcher.get_new_rows did
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = list(csv.DictReader(f))
+        new_rows = reader[state['last_line']:]
+        state['last_line'] = len(reader)
+        return new_rows
+
+
+def row(i):
+    return f"2025-01-01 20:{i // 60 % 60:02d}:{i % 60:02d},{i // 3600}:{i // 60 % 60:02d}:{i % 60:02d},{i},Bench Movie\n"
+
+
+def grow(path, rows_now, target):
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        if rows_now == 0:
+            f.write(','.join(HEADER) + '\n')
+        f.writelines(row(i) for i in range(rows_now, target))
+    return target
+
+
+def per_event(path, read, start, events):
+    """Seconds per appended row picked up by `read()`."""
+    total = 0.0
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        for i in range(start, start + events):
+            f.write(row(i))
+            f.flush()
+            t0 = time.perf_counter()
+            rows = read()
+            total += time.perf_counter() - t0
+            assert len(rows) == 1
+    return total / events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000,1000000,3000000')
+    parser.add_argument('--events', type=int, default=200)
+    parser.add_argument('--legacy-events', type=int, default=3, help='legacy reads per size (each parses the whole file)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'realtime_log.csv')
+        rows = 0
+        for size in (int(s) for s in args.sizes.split(',')):
+            rows = grow(path, rows, size)
+            mb = os.path.getsize(path) / 1e6
+
+            tailer = CsvTailer(path)
+            tailer.seek_to_end()
+            tail_cost = per_event(path, tailer.read_new_rows, rows, args.events)
+            rows += args.events
+
+            state = {'last_line': rows}
+            legacy_cost = per_event(path, lambda: legacy_get_new_rows(path, state), rows, args.legacy_events)
+            rows += args.legacy_events
+            print(f"{size:>9} rows ({mb:7.1f} MB): tailer {tail_cost * 1e6:8.1f} us/event, "
+                  f"legacy {legacy_cost * 1000:9.1f} ms/event ({legacy_cost / tail_cost:,.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
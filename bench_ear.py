@@ -0,0 +1,66 @@
+"""
+Micro-benchmark: per-frame cost of eye landmark extraction + EAR, legacy vs. vectorized.
+Uses synthetic MediaPipe-shaped landmarks, so neither a camera nor mediapipe is needed.
+
+    python bench_ear.py [--frames 20000] [--batch 100000]
+"""
+import argparse
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from eye_metrics import LEFT_EYE, RIGHT_EYE, calculate_ear, eye_points, batch_ear
+
+NUM_LANDMARKS = 478  # FaceMesh with refine_landmarks=True
+
+
+def fake_face(rng):
+    points = [SimpleNamespace(x=float(x), y=float(y)) for x, y in rng.uniform(0.2, 0.8, (NUM_LANDMARKS, 2))]
+    return SimpleNamespace(landmark=points)
+
+
+def legacy_ear(face_landmarks, iw, ih):
+    left_eye = np.array([(int(face_landmarks.landmark[i].x * iw), int(face_landmarks.landmark[i].y * ih)) for i in LEFT_EYE])
+    right_eye = np.array([(int(face_landmarks.landmark[i].x * iw), int(face_landmarks.landmark[i].y * ih)) for i in RIGHT_EYE])
+    return (calculate_ear(left_eye) + calculate_ear(right_eye)) / 2.0
+
+
+def vectorized_ear(face_landmarks, iw, ih):
+    return float(batch_ear(eye_points(face_landmarks, iw, ih)))
+
+
+def time_per_call(fn, faces, iw, ih):
+    start = time.perf_counter()
+    for face in faces:
+        fn(face, iw, ih)
+    return (time.perf_counter() - start) / len(faces)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=20000)
+    parser.add_argument('--batch', type=int, default=100000)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+    iw, ih = 1280, 720
+    faces = [fake_face(rng) for _ in range(min(args.frames, 200))]
+    faces = (faces * (args.frames // len(faces) + 1))[:args.frames]
+
+    for face in faces[:50]:
+        assert abs(legacy_ear(face, iw, ih) - vectorized_ear(face, iw, ih)) < 1e-9
+
+    legacy = time_per_call(legacy_ear, faces, iw, ih)
+    vectorized = time_per_call(vectorized_ear, faces, iw, ih)
+    print(f"legacy     : {legacy * 1e6:8.2f} us/frame")
+    print(f"vectorized : {vectorized * 1e6:8.2f} us/frame  ({legacy / vectorized:.1f}x)")
+
+    points = rng.uniform(0, 1000, (args.batch, 2, 6, 2))
+    start = time.perf_counter()
+    batch_ear(points)
+    batched = (time.perf_counter() - start) / args.batch
+    print(f"batched    : {batched * 1e6:8.3f} us/frame over {args.batch} frames ({legacy / batched:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
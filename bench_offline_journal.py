@@ -0,0 +1,89 @@
+"""
+Benchmark: replaying queued offline events from the SQLite journal vs. the legacy
+one-JSON-file-per-event pending directory. Both run against storage_backend.FakeBackend,
+so nothing reaches the production project.
+
+    python bench_offline_journal.py [--events 100000] [--legacy-events 2000] [--rtt-ms 20]
+
+The legacy path costs one round trip per event, so it is measured on `--legacy-events`
+and extrapolated to the full count.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from bench_upload_worker import make_payload
+from offline_journal import OfflineJournal
+from storage_backend import FIRESTORE_MAX_BATCH, FakeBackend
+
+
+def bench_legacy(directory, events, rtt):
+    from datetime import datetime
+    start = time.perf_counter()
+    for i in range(events):
+        payload = make_payload(i)
+        fname = f"offline_{payload['collection_name']}_{datetime.now().strftime('%H%M%S%f')}_{i}.json"
+        with open(os.path.join(directory, fname), 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+    write = time.perf_counter() - start
+
+    client = FakeBackend(latency=rtt)
+    start = time.perf_counter()
+    # What upload_pending_logs used to do: listdir, then open/parse/add/delete one by one
+    for fname in os.listdir(directory):
+        if fname.endswith('.json'):
+            fpath = os.path.join(directory, fname)
+            with open(fpath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            client.add(data["collection_name"], data["data"])
+            os.remove(fpath)
+    replay = time.perf_counter() - start
+    return write, replay, client.round_trips
+
+
+def bench_journal(path, events, rtt, batch_size):
+    with OfflineJournal(path) as journal:
+        start = time.perf_counter()
+        # Offline writes arrive one per blink
+        for i in range(events):
+            journal.append(make_payload(i))
+        write = time.perf_counter() - start
+        size = os.path.getsize(path) + os.path.getsize(path + '-wal')
+
+        client = FakeBackend(latency=rtt)
+        start = time.perf_counter()
+        sent = journal.replay(client.commit_batch, batch_size=batch_size)
+        replay = time.perf_counter() - start
+        assert sent == events and len(client.docs) == events
+        after = os.path.getsize(path) + os.path.getsize(path + '-wal')
+    return write, replay, client.round_trips, size, after
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', type=int, default=100000)
+    parser.add_argument('--legacy-events', type=int, default=2000)
+    parser.add_argument('--rtt-ms', type=float, default=20.0)
+    parser.add_argument('--batch', type=int, default=FIRESTORE_MAX_BATCH)
+    args = parser.parse_args()
+    rtt = args.rtt_ms / 1000.0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_events = min(args.legacy_events, args.events)
+        write, replay, trips = bench_legacy(tmp, legacy_events, rtt)
+        scale = args.events / legacy_events
+        print(f"legacy JSON files: {legacy_events} events, write {write:.2f}s, replay {replay:.2f}s "
+              f"({trips} round trips); extrapolated to {args.events}: replay ~{replay * scale:.0f}s")
+
+        write, replay, trips, size, after = bench_journal(os.path.join(tmp, 'journal.sqlite3'),
+                                                          args.events, rtt, args.batch)
+        print(f"SQLite journal:    {args.events} events, write {write:.2f}s "
+              f"({write / args.events * 1e6:.1f} us/event), replay {replay:.2f}s ({trips} round trips, "
+              f"{args.events / replay:.0f} events/s)")
+        print(f"  journal size {size / 1e6:.1f} MB before replay, {after / 1e6:.2f} MB after compaction")
+
+
+if __name__ == '__main__':
+    main()
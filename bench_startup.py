@@ -0,0 +1,146 @@
+"""
+Benchmark application start-up: per-module import cost, construction time of the widgets that
+load fonts, and time from launch to the player window being shown. Every measurement runs in a
+fresh interpreter so nothing is cached.
+
+    python bench_startup.py [--runs 5] [--top 15]
+
+Without a display, Qt's offscreen platform is used for the window measurement.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Modules on (or formerly on) the start-up path, cheapest first
+MODULES = ['firebase_upload', 'blink_counter_thread', 'controls', 'player_window', 'main']
+
+# Launch, build the window, report once the event loop has shown it
+WINDOW_SNIPPET = r"""
+import os, sys, time
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
+from player_window import ModernVideoPlayer
+app = QApplication(sys.argv)
+app.setStyle("Fusion")
+player = ModernVideoPlayer()
+player.show()
+def shown():
+    print(time.time() - float(os.environ['BENCH_T0']))
+    app.quit()
+QTimer.singleShot(0, shown)
+app.exec()
+"""
+
+# Widgets that used to register font files in their constructors
+WIDGETS = ['overlay_title.OverlayTitleLabel', 'window_controls.ModernWindowControls', 'time_display.TimeDisplayLabel']
+
+# First construction (pays for font registration) and the mean of `repeat` further ones, in ms
+WIDGET_SNIPPET = r"""
+import importlib, sys, time
+from PyQt6.QtWidgets import QApplication
+app = QApplication(sys.argv)
+module, _, name = sys.argv[1].rpartition('.')
+cls = getattr(importlib.import_module(module), name)
+t = time.perf_counter(); cls(); first = time.perf_counter() - t
+repeat = int(sys.argv[2])
+t = time.perf_counter()
+widgets = [cls() for _ in range(repeat)]
+print(first * 1000, (time.perf_counter() - t) / repeat * 1000)
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    if not env.get('DISPLAY') and not env.get('WAYLAND_DISPLAY'):
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    return env
+
+
+def _run(code, env=None, extra_args=(), args=()):
+    return subprocess.run([sys.executable, *extra_args, '-c', code, *args], cwd=HERE, env=env or _env(),
+                          capture_output=True, text=True)
+
+
+def time_import(module, runs):
+    """Median wall time of `import module` in a fresh interpreter, or the error message."""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    samples = []
+    for _ in range(runs):
+        proc = _run(code)
+        if proc.returncode:
+            return None, proc.stderr.strip().splitlines()[-1]
+        samples.append(float(proc.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples), None
+
+
+def import_profile(module, top):
+    """Heaviest imports (cumulative microseconds) below `module`, from python -X importtime."""
+    proc = _run(f"import {module}", extra_args=('-X', 'importtime'))
+    parsed = []
+    for line in proc.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        parsed.append((int(cumulative_us), int(self_us), name.rstrip()))
+    parsed.sort(reverse=True)
+    return parsed[:top], (proc.stderr.strip().splitlines()[-1] if proc.returncode else None)
+
+
+def time_widget(widget, runs, repeat=20):
+    """Median (first, repeated) construction time in ms of `widget` ("module.Class")."""
+    samples = []
+    for _ in range(runs):
+        proc = _run(WIDGET_SNIPPET, args=(widget, str(repeat)))
+        if proc.returncode:
+            return None, proc.stderr.strip().splitlines()[-1]
+        samples.append([float(v) for v in proc.stdout.strip().splitlines()[-1].split()])
+    return (statistics.median(s[0] for s in samples), statistics.median(s[1] for s in samples)), None
+
+
+def time_window(runs):
+    """Median seconds from process launch to the player window being shown."""
+    samples = []
+    for _ in range(runs):
+        env = _env()
+        env['BENCH_T0'] = repr(time.time())
+        proc = _run(WINDOW_SNIPPET, env)
+        if proc.returncode:
+            return None, proc.stderr.strip().splitlines()[-1]
+        samples.append(float(proc.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    print(f"import time (median of {args.runs}, fresh interpreter):")
+    for module in MODULES:
+        seconds, error = time_import(module, args.runs)
+        print(f"  {module:<22} " + (f"{seconds * 1000:8.1f} ms" if error is None else f"failed: {error}"))
+
+    rows, error = import_profile('main', args.top)
+    print("\nheaviest imports under main (cumulative):" + (f"  [main failed: {error}]" if error else ""))
+    for cumulative_us, self_us, name in rows:
+        print(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name}")
+
+    print(f"\nwidget construction (median of {args.runs}): first / repeated")
+    for widget in WIDGETS:
+        times, error = time_widget(widget, args.runs)
+        print(f"  {widget:<38} " + (f"{times[0]:7.2f} / {times[1]:6.2f} ms" if error is None else f"failed: {error}"))
+
+    seconds, error = time_window(args.runs)
+    print("\nlaunch to player window shown: " +
+          (f"{seconds * 1000:.1f} ms (median of {args.runs})" if error is None else f"failed: {error}"))
+
+
+if __name__ == '__main__':
+    main()
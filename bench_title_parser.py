@@ -0,0 +1,71 @@
+"""
+Benchmark: title extraction per file name, the previous inline implementation (regexes built
+from strings on every call) against title_parser.parse uncached and memoized.
+
+    python bench_title_parser.py [--names 2000] [--repeat 20]
+"""
+import argparse
+import re
+import time
+
+import title_parser
+from release_names import SAMPLE_FILE_NAMES, random_release_names
+
+_LEGACY_TAGS = title_parser._TAGS.pattern
+
+
+def legacy_title(file_name):
+    # The overlay's extraction before title_parser, kept for comparison
+    name = re.sub(r'\.[^.]+$', '', file_name)
+    name = re.sub(r'[._]+', ' ', name)
+    match_year = re.search(r'(19|20)\d{2}', name)
+    cut_idx = match_year.end() if match_year else None
+    match_tag = re.search(_LEGACY_TAGS, name, re.IGNORECASE)
+    if match_tag:
+        cut_idx = min(cut_idx, match_tag.start()) if cut_idx else match_tag.start()
+    if cut_idx:
+        name = name[:cut_idx]
+    name = re.sub(r'[^\w\s\)]+$', '', name)
+    name = re.sub(r'\s+', ' ', name).strip()
+    if len(name) < 4:
+        name = ' '.join(file_name.replace('.', ' ').replace('_', ' ').split()[:2])
+    match = re.search(r'(S\d{1,2}[\s._-]*E\d{1,2})', file_name, re.IGNORECASE)
+    return name.title(), match.group(1).upper() if match else None
+
+
+def _per_call_us(func, names, repeat, before_each=None):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for name in names:
+            if before_each:
+                before_each()
+            func(name)
+    return (time.perf_counter() - start) / (repeat * len(names)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--names', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    names = SAMPLE_FILE_NAMES + [name for name, _, _, _ in random_release_names(args.names)]
+
+    # The legacy code relied on re's internal pattern cache; clearing it shows a cold call
+    legacy_cold = _per_call_us(legacy_title, names[:200], 1, before_each=re.purge)
+    legacy = _per_call_us(legacy_title, names, args.repeat)
+    uncached = _per_call_us(title_parser.parse.__wrapped__, names, args.repeat)
+    # Fill the cache first so only hits are timed
+    title_parser.parse.cache_clear()
+    for name in names[:200]:
+        title_parser.parse(name)
+    memoized = _per_call_us(title_parser.parse, names[:200], args.repeat)
+
+    print(f"{len(names)} file names, {args.repeat} passes")
+    print(f"  legacy, re cache purged:   {legacy_cold:8.2f} us/call")
+    print(f"  legacy, re cache warm:     {legacy:8.2f} us/call")
+    print(f"  parse, precompiled:        {uncached:8.2f} us/call")
+    print(f"  parse, memoized (hits):    {memoized:8.2f} us/call  {title_parser.parse.cache_info()}")
+
+
+if __name__ == '__main__':
+    main()
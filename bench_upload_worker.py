@@ -0,0 +1,73 @@
+"""
+Benchmark: synchronous per-event Firestore add() vs. the batched UploadWorker.
+Runs entirely against storage_backend.FakeBackend with a simulated round-trip time,
+so it never touches the production project.
+
+    python bench_upload_worker.py [--events 500] [--rtt-ms 40] [--batch 50] [--latency 0.5]
+"""
+import argparse
+import time
+
+from storage_backend import FakeBackend
+from upload_worker import UploadWorker
+
+
+def make_payload(i):
+    return {
+        "collection_name": "benchuser_benchmovie_20250101",
+        "data": {'blink_count': i, 'elapsed_time': '0:00:01', 'real_time': '2025-01-01 00:00:00',
+                 'movie_name': 'Bench Movie', 'user_name': 'benchuser'},
+    }
+
+
+def bench_sync(events, rtt):
+    client = FakeBackend(latency=rtt)
+    start = time.perf_counter()
+    worst = 0.0
+    for i in range(events):
+        t0 = time.perf_counter()
+        payload = make_payload(i)
+        client.add(payload["collection_name"], payload["data"])
+        worst = max(worst, time.perf_counter() - t0)
+    total = time.perf_counter() - start
+    return total, worst, client.round_trips
+
+
+def bench_worker(events, rtt, batch_size, max_latency):
+    client = FakeBackend(latency=rtt)
+    worker = UploadWorker(client, max_batch_size=batch_size, max_latency=max_latency)
+    worker.start()
+    start = time.perf_counter()
+    worst = 0.0
+    for i in range(events):
+        t0 = time.perf_counter()
+        worker.enqueue(make_payload(i))
+        worst = max(worst, time.perf_counter() - t0)
+    producer = time.perf_counter() - start
+    worker.stop(timeout=60)
+    total = time.perf_counter() - start
+    return producer, total, worst, client.round_trips, worker.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', type=int, default=500)
+    parser.add_argument('--rtt-ms', type=float, default=40.0)
+    parser.add_argument('--batch', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.5)
+    args = parser.parse_args()
+    rtt = args.rtt_ms / 1000.0
+
+    total, worst, trips = bench_sync(args.events, rtt)
+    print(f"sync add():   {args.events} events, {trips} round trips, total {total:.2f}s, "
+          f"worst call blocking producer {worst * 1000:.1f} ms")
+
+    producer, total, worst, trips, stats = bench_worker(args.events, rtt, args.batch, args.latency)
+    print(f"UploadWorker: {args.events} events, {trips} round trips, total {total:.2f}s, "
+          f"producer busy {producer * 1000:.1f} ms, worst enqueue {worst * 1e6:.1f} us")
+    print(f"  batches={stats['batches_committed']} mean flush={stats['mean_flush_latency'] * 1000:.1f} ms "
+          f"max flush={stats['max_flush_latency'] * 1000:.1f} ms mean queue wait={stats['mean_queue_wait'] * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+End-to-end upload benchmark against a local FakeBackend (never touches the production project).
+
+Simulated viewing sessions produce blinks at the given aggregate rates and feed them through
+the same path as the player: UploadWorker batches, failed batches go to the offline journal,
+and the journal is drained afterwards. For each rate it reports throughput, p50/p99
+enqueue-to-commit latency and peak Python memory (tracemalloc) while the backlog builds up.
+
+    python bench_uploads.py [--rates 5,50,500,5000] [--seconds 5] [--latency-ms 40] [--jitter-ms 20]
+                            [--failure-rate 0.05] [--batch 50] [--max-latency 0.5]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from offline_journal import OfflineJournal
+from pending_sync import PendingDrainer
+from storage_backend import FakeBackend
+from upload_worker import UploadWorker
+
+
+def make_payload(i, sessions):
+    session = i % sessions
+    return {
+        "collection_name": f"benchuser{session}_benchmovie_20250101",
+        "data": {'blink_count': i // sessions + 1, 'elapsed_time': '0:00:01', 'real_time': '2025-01-01 00:00:00',
+                 'movie_name': 'Bench Movie', 'user_name': f'benchuser{session}',
+                 'enqueued_at': time.perf_counter()},
+    }
+
+
+def run_scenario(rate, seconds, sessions, backend, journal, batch_size, max_latency):
+    worker = UploadWorker(backend, max_batch_size=batch_size, max_latency=max_latency,
+                          on_failure=journal.append_many)
+    tracemalloc.start()
+    worker.start()
+    events = int(rate * seconds)
+    max_depth = 0
+    start = time.perf_counter()
+    for i in range(events):
+        # Pace the producer: event i is due at i / rate
+        due = start + i / rate
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        worker.enqueue(make_payload(i, sessions))
+        if i % 64 == 0:
+            max_depth = max(max_depth, worker.stats()['queue_depth'])
+    produced = time.perf_counter()
+    worker.stop(timeout=600)
+    # Whatever failed was journaled; drain it as the background sync would
+    drainer = PendingDrainer(journal, backend.commit_batch, batch_size=500, max_rate=None)
+    while journal.pending_count():
+        try:
+            drainer.drain()
+        except ConnectionError:
+            pass
+    end = time.perf_counter()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    latencies = np.array([t - data['enqueued_at'] for (_, data), t in zip(backend.docs, backend.committed_at)])
+    return {
+        'events': events,
+        'committed': backend.committed,
+        'produce_seconds': produced - start,
+        'total_seconds': end - start,
+        'latencies': latencies,
+        'peak_memory': peak,
+        'max_queue_depth': max_depth,
+        'round_trips': backend.round_trips,
+        'failures': backend.failures,
+        'worker': worker.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rates', default='5,50,500,5000', help='comma-separated aggregate blink rates (events/s)')
+    parser.add_argument('--seconds', type=float, default=5.0, help='simulated duration per rate')
+    parser.add_argument('--sessions', type=int, default=20, help='concurrent viewers (distinct collections)')
+    parser.add_argument('--latency-ms', type=float, default=40.0)
+    parser.add_argument('--jitter-ms', type=float, default=20.0)
+    parser.add_argument('--failure-rate', type=float, default=0.05)
+    parser.add_argument('--batch', type=int, default=50)
+    parser.add_argument('--max-latency', type=float, default=0.5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"backend: {args.latency_ms:.0f}+{args.jitter_ms:.0f} ms per round trip, "
+          f"{args.failure_rate:.0%} failures; worker batch {args.batch}, max latency {args.max_latency}s")
+    for rate in (float(r) for r in args.rates.split(',')):
+        backend = FakeBackend(args.latency_ms / 1000.0, args.jitter_ms / 1000.0, args.failure_rate, seed=args.seed)
+        with tempfile.TemporaryDirectory() as tmp:
+            with OfflineJournal(os.path.join(tmp, 'journal.sqlite3')) as journal:
+                result = run_scenario(rate, args.seconds, args.sessions, backend, journal, args.batch, args.max_latency)
+        lat = result['latencies'] * 1000
+        p50, p99 = (np.percentile(lat, [50, 99]) if len(lat) else (float('nan'),) * 2)
+        print(f"{rate:>8.0f} ev/s: {result['committed']}/{result['events']} committed in {result['total_seconds']:.2f}s "
+              f"({result['committed'] / result['total_seconds']:.0f} ev/s), "
+              f"latency p50 {p50:.0f} ms p99 {p99:.0f} ms, "
+              f"peak mem {result['peak_memory'] / 1e6:.1f} MB, max queue {result['max_queue_depth']}, "
+              f"{result['round_trips']} round trips ({result['failures']} failed)")
+
+
+if __name__ == '__main__':
+    main()
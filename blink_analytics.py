@@ -0,0 +1,239 @@
+"""
+Blink-rate-over-movie-time curves across many viewing sessions.
+
+Sessions (see session_store) are first grouped into viewings: everything one viewer recorded
+for one movie under one session start (kept across pause and resume, so it also joins the
+separate sessions older players wrote on every resume) counts as a single viewer. Viewings are placed on a common timeline, either the media position
+('media', needs sessions recorded with a position) or the viewing time since the start
+('elapsed', works for sessions converted from the old CSV logs; pauses are cut out, so every
+resume continues where the previous segment stopped). Blinks of all viewings are binned in one
+np.bincount over (viewing, bin) pairs, giving a viewings x bins matrix of blinks per minute;
+bins a viewer did not watch are left out of the statistics rather than counted as zero.
+Results are cached, in memory and optionally on disk, keyed by the exact session set.
+
+    python blink_analytics.py csv/sessions/* [--bin-seconds 60] [--timeline elapsed]
+"""
+import argparse
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from session_store import META_FILE, list_sessions, load_session
+
+TIMELINES = ('media', 'elapsed')
+DEFAULT_PERCENTILES = (10, 50, 90)
+_CACHE_SIZE = 16
+_curve_cache = OrderedDict()
+
+
+class BlinkRateCurves:
+    """
+    Blink-rate curves on a common timeline. `mean` and each `percentiles[q]` are blinks per
+    minute per bin (NaN where nobody watched); `viewers` is how many viewings covered each bin
+    and `sessions` the number of viewings.
+    """
+    def __init__(self, bin_seconds, mean, percentiles, viewers, sessions):
+        self.bin_seconds = bin_seconds
+        self.mean = mean
+        self.percentiles = percentiles
+        self.viewers = viewers
+        self.sessions = sessions
+
+    @property
+    def bin_start_s(self):
+        return np.arange(len(self.mean)) * self.bin_seconds
+
+    def save(self, path):
+        np.savez(path, bin_seconds=self.bin_seconds, mean=self.mean, viewers=self.viewers, sessions=self.sessions,
+                 percentile_q=np.array(sorted(self.percentiles), dtype=float),
+                 percentile_values=np.array([self.percentiles[q] for q in sorted(self.percentiles)]))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            percentiles = {float(q): values for q, values in zip(data['percentile_q'], data['percentile_values'])}
+            return cls(float(data['bin_seconds']), data['mean'], percentiles, data['viewers'], int(data['sessions']))
+
+
+def _segments(session):
+    """(begin, end) row ranges of the recorded segments (one per resume) of a session."""
+    bounds = sorted(set(session.meta.get('segments') or [0]) | {0, len(session)})
+    return [(begin, end) for begin, end in zip(bounds[:-1], bounds[1:]) if end > begin]
+
+
+def viewing_positions(sessions, timeline='media'):
+    """
+    (blink_positions_ms, covered_ms) for one viewing: the sessions (and segments within them) a
+    viewer recorded in one viewing session (see `viewing_key`). `covered_ms` holds the positions of every recorded
+    sample, or, if some of the data is blink-only (converted CSV logs), an array of [first, last]
+    spans, one per segment, each taken as watched from start to end.
+    On the 'elapsed' timeline each segment starts where the previous one ended.
+    """
+    if timeline not in TIMELINES:
+        raise ValueError(f"Unknown timeline {timeline!r}, expected one of {TIMELINES}")
+    blinks, samples, spans = [], [], []
+    blink_only = False
+    offset = 0
+    for session in sorted(sessions, key=lambda s: s.meta.get('start_ms') or 0):
+        for begin, end in _segments(session):
+            blink = np.asarray(session.blink[begin:end])
+            if timeline == 'media':
+                positions = np.asarray(session.media_position_ms[begin:end])
+                known = positions >= 0
+                positions, blink = positions[known], blink[known]
+            else:
+                t_ms = np.asarray(session.t_ms[begin:end])
+                positions = t_ms - t_ms[0] + offset
+                offset = int(positions[-1])
+            if not len(positions):
+                continue
+            blink_only |= bool(blink.all())
+            blinks.append(positions[blink])
+            samples.append(positions)
+            spans.append((positions.min(), positions.max()))
+    if not samples:
+        empty = np.empty(0, np.int64)
+        return empty, empty
+    covered = np.array(spans, dtype=np.int64) if blink_only else np.concatenate(samples)
+    return np.concatenate(blinks), covered
+
+
+def session_positions(session, timeline='media'):
+    """(blink_positions_ms, covered_ms) for a single session; see `viewing_positions`."""
+    return viewing_positions([session], timeline)
+
+
+def viewing_key(session):
+    """
+    Sessions with the same key belong to one viewing: (user, movie, session_start_ms), which the
+    player keeps across pause and resume. Sessions without a viewer or session start stand alone.
+    """
+    meta = session.meta
+    if not meta.get('user_name') or meta.get('session_start_ms') is None:
+        return session.path
+    return meta['user_name'], meta.get('movie_name'), meta['session_start_ms']
+
+
+def group_viewings(sessions):
+    """Group loaded sessions into viewings (lists of sessions), in first-seen order."""
+    groups = {}
+    for session in sessions:
+        groups.setdefault(viewing_key(session), []).append(session)
+    return list(groups.values())
+
+
+def bin_sessions(positions, bin_seconds=60, duration_s=None):
+    """
+    Bin many viewings at once. `positions` is a list of (blink_positions_ms, covered_ms) pairs.
+    Returns (counts, watched): viewings x bins arrays of blink counts and covered-bin flags.
+    """
+    bin_ms = int(bin_seconds * 1000)
+    if duration_s is None:
+        ends = [covered.max() for _, covered in positions if len(covered)]
+        duration_s = (max(ends) + 1) / 1000 if ends else bin_seconds
+    n_bins = max(1, int(np.ceil(duration_s * 1000 / bin_ms)))
+    n_sessions = len(positions)
+    lengths = np.array([len(b) for b, _ in positions], dtype=np.int64)
+    blinks = np.concatenate([b for b, _ in positions]) if n_sessions else np.empty(0, np.int64)
+    owner = np.repeat(np.arange(n_sessions), lengths)
+    bins = np.minimum(blinks // bin_ms, n_bins - 1)
+    keep = bins >= 0
+    counts = np.bincount(owner[keep] * n_bins + bins[keep], minlength=n_sessions * n_bins).reshape(n_sessions, n_bins)
+
+    watched = np.zeros((n_sessions, n_bins), dtype=bool)
+    for i, (_, covered) in enumerate(positions):
+        if not len(covered):
+            continue
+        covered_bins = np.minimum(covered // bin_ms, n_bins - 1)
+        if covered.ndim == 2:
+            for first, last in covered_bins:
+                watched[i, first:last + 1] = True
+        else:
+            watched[i, covered_bins] = True
+    # A blink always marks its bin as watched
+    watched |= counts > 0
+    return counts, watched
+
+
+def compute_curves(positions, bin_seconds=60, percentiles=DEFAULT_PERCENTILES, duration_s=None):
+    counts, watched = bin_sessions(positions, bin_seconds, duration_s)
+    rates = np.where(watched, counts * (60.0 / bin_seconds), np.nan)
+    viewers = watched.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nansum(rates, axis=0) / viewers
+    mean[viewers == 0] = np.nan
+    values = {}
+    if len(percentiles):
+        columns = viewers > 0
+        stacked = np.full((len(percentiles), rates.shape[1]), np.nan)
+        if columns.any():
+            stacked[:, columns] = np.nanpercentile(rates[:, columns], percentiles, axis=0)
+        values = {float(q): stacked[i] for i, q in enumerate(percentiles)}
+    return BlinkRateCurves(bin_seconds, mean, values, viewers, len(positions))
+
+
+def _cache_key(session_paths, bin_seconds, percentiles, timeline, duration_s):
+    digest = hashlib.sha1()
+    digest.update(json.dumps([bin_seconds, list(percentiles), timeline, duration_s]).encode())
+    for path in sorted(session_paths):
+        meta = os.path.join(path, META_FILE)
+        st = os.stat(meta)
+        # A rewritten session gets a new meta.json, so its mtime and size invalidate the entry
+        digest.update(f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}\n".encode())
+    return digest.hexdigest()
+
+
+def blink_rate_curves(session_paths, bin_seconds=60, percentiles=DEFAULT_PERCENTILES, timeline='media',
+                      duration_s=None, cache_dir=None):
+    """Mean and percentile blink-rate curves across `session_paths`, cached by session set."""
+    key = _cache_key(session_paths, bin_seconds, percentiles, timeline, duration_s)
+    if key in _curve_cache:
+        _curve_cache.move_to_end(key)
+        return _curve_cache[key]
+    cache_path = os.path.join(cache_dir, f'{key}.npz') if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        curves = BlinkRateCurves.load(cache_path)
+    else:
+        fields = ('media_position_ms' if timeline == 'media' else 't_ms', 'blink')
+        sessions = [load_session(path, mmap=False, fields=fields) for path in session_paths]
+        positions = [viewing_positions(group, timeline) for group in group_viewings(sessions)]
+        curves = compute_curves(positions, bin_seconds, percentiles, duration_s)
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            curves.save(cache_path)
+    _curve_cache[key] = curves
+    if len(_curve_cache) > _CACHE_SIZE:
+        _curve_cache.popitem(last=False)
+    return curves
+
+
+def sessions_for_movie(movie_name, root=None):
+    """Session directories under `root` recorded for `movie_name` (as stored in meta.json)."""
+    paths = list_sessions(root) if root else list_sessions()
+    selected = []
+    for path in paths:
+        with open(os.path.join(path, META_FILE), 'r', encoding='utf-8') as f:
+            if json.load(f).get('movie_name') == movie_name:
+                selected.append(path)
+    return selected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Blink-rate curves across viewing sessions")
+    parser.add_argument('sessions', nargs='+', help="session directories (see session_store.py)")
+    parser.add_argument('--bin-seconds', type=float, default=60.0)
+    parser.add_argument('--timeline', default='media', choices=TIMELINES)
+    parser.add_argument('--cache-dir', default=None)
+    args = parser.parse_args()
+    curves = blink_rate_curves(args.sessions, args.bin_seconds, timeline=args.timeline, cache_dir=args.cache_dir)
+    print("start_s  viewers   mean  " + "  ".join(f"p{q:g}" for q in curves.percentiles))
+    for i, start in enumerate(curves.bin_start_s):
+        values = "  ".join(f"{curves.percentiles[q][i]:5.1f}" for q in curves.percentiles)
+        print(f"{start:7.0f}  {curves.viewers[i]:7d}  {curves.mean[i]:5.1f}  {values}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,30 +1,33 @@
 from PyQt6.QtCore import QThread, pyqtSignal
 import cv2
-import mediapipe as mp
 import numpy as np
-import time
+from blink_log_writer import BlinkLogWriter
+from blink_detector import BlinkDetector, OnlineThresholdAdapter
+from frame_grabber import FrameGrabber
+from frame_governor import FrameRateGovernor
+from face_roi import FaceRoiTracker
+from lighting import LightingNormalizer
+from session_store import REALTIME_LOG_HEADER, SESSIONS_DIR, SessionWriter
+from telemetry_aggregator import EVENT_LOG_HEADER, TelemetryAggregator
+from user_config import load_calibration, save_calibration
+from title_parser import parse as parse_title
+from eye_metrics import LEFT_EYE, RIGHT_EYE, calculate_ear, eye_points, batch_ear, frame_ear  # noqa: F401 (re-exported)
 
-LEFT_EYE = [33, 160, 158, 133, 153, 144]
-RIGHT_EYE = [263, 387, 385, 362, 380, 373]
-
-def calculate_ear(eye_landmarks):
-    A = np.linalg.norm(eye_landmarks[1] - eye_landmarks[5])
-    B = np.linalg.norm(eye_landmarks[2] - eye_landmarks[4])
-    C = np.linalg.norm(eye_landmarks[0] - eye_landmarks[3])
-    ear = (A + B) / (2.0 * C)
-    return ear
-
-def normalize_lighting(frame):
-    yuv = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV)
-    yuv[:,:,0] = cv2.equalizeHist(yuv[:,:,0])
-    return cv2.cvtColor(yuv, cv2.COLOR_YUV2BGR)
+# Target rate for blink detection; the governor backs off below this when the CPU is saturated
+DETECTION_FPS = 20.0
+# Lighting correction before FaceMesh, one of lighting.LIGHTING_MODES
+LIGHTING_MODE = 'equalize'
+# Cloud telemetry granularity, one of telemetry_aggregator.TELEMETRY_MODES. 'blink' (one document per
+# blink) is the schema the dashboards read; window modes write a different document shape, so opt in per thread.
+TELEMETRY_MODE = 'blink'
 
 
 class BlinkCounterThread(QThread):
     blink_count_changed = pyqtSignal(int)
     calibration_complete = pyqtSignal(float)
+    frame_rate_report = pyqtSignal(float, float)  # achieved fps, target fps
 
-    def __init__(self, log_base_name="blink_log", movie_name="", user_name=None, parent=None):
+    def __init__(self, log_base_name="blink_log", movie_name="", user_name=None, target_fps=DETECTION_FPS, roi_tracking=True, lighting_mode=LIGHTING_MODE, recalibrate=False, telemetry_mode=TELEMETRY_MODE, scene_bounds=None, session_start=None, parent=None):
         super().__init__(parent)
         self._running = True
         self.blink_count = 0
@@ -32,124 +35,172 @@ class BlinkCounterThread(QThread):
         self.log_base_name = log_base_name
         self.movie_name = movie_name
         self.user_name = user_name
+        self.grabber = None
+        self.governor = FrameRateGovernor(target_fps)
+        # Crop inference to the tracked face box instead of the full camera frame
+        self.roi_tracker = FaceRoiTracker() if roi_tracking else None
+        self.normalizer = LightingNormalizer(lighting_mode)
+        # Reuse the user's saved calibration unless a fresh one is requested
+        self.recalibrate = recalibrate
+        self.open_ear = 0.3
+        self.closed_ear = 0.18
+        self.telemetry_mode = telemetry_mode
+        self.scene_bounds = scene_bounds
+        # Start of the viewing session (datetime). The player passes the same value to every thread
+        # it starts for one movie, so telemetry time keeps counting across pause and resume.
+        self.session_start = session_start
+        # Playback position (ms) fed from the UI thread; read once per frame
+        self.media_position_ms = None
+
+    def set_media_position(self, position_ms):
+        self.media_position_ms = position_ms
+
+    def capture_stats(self):
+        """Dropped-frame and queue-age counters of the camera capture thread (empty before it starts)."""
+        return self.grabber.stats() if self.grabber else {}
 
     def run(self):
         import csv
         import os
+        import time
+        # mediapipe takes seconds to import; keep it off the application start-up path
+        import mediapipe as mp
         from datetime import datetime, timedelta
         cap = cv2.VideoCapture(0)
+        # Camera reads run on their own thread; we always process the newest frame
+        grabber = FrameGrabber(cap)
+        self.grabber = grabber
+        grabber.start()
         blink_count = self.blink_count  # Start from the last known count
-        closed_frames = 0
-        consecutive_frames = 2
-        ear_history = []
-        max_history = 5
         csv_dir = os.path.join(os.getcwd(), 'csv')
         os.makedirs(csv_dir, exist_ok=True)
         log_path = os.path.join(csv_dir, f'{self.log_base_name}.csv')
-        log_header = ['real_time_12h', 'elapsed_hms', 'blink_count']
         start_time = datetime.now()
-        # Write header if file doesn't exist
-        if not os.path.exists(log_path):
-            with open(log_path, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(log_header)
-        real_time_log_path = os.path.join(os.getcwd(), 'csv', 'realtime', 'realtime_log.csv')
-        real_time_log_header = ['real_time', 'elapsed_time', 'blink_count', 'movie_name']
-        # Write header if file doesn't exist
-        if not os.path.exists(real_time_log_path):
-            with open(real_time_log_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(real_time_log_header)
-        with mp.solutions.face_mesh.FaceMesh(
-            max_num_faces=1,
-            refine_landmarks=True,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.7
-        ) as face_mesh:
-            # Get initial frame size for calibration
-            ret, frame = cap.read()
-            if not ret:
-                return
-            ih, iw, _ = frame.shape
-            self.blink_threshold = self.calibrate_ear(face_mesh, cap, iw, ih)
-            self.calibration_complete.emit(self.blink_threshold)
-            while self._running and cap.isOpened():
-                ret, frame = cap.read()
+        session_start = self.session_start or start_time
+        session_start_ms = int(session_start.timestamp() * 1000)
+        # Append-only handle; rows are rolled up per second at read time (see read_blink_log)
+        log_writer = BlinkLogWriter(log_path)
+        # Raw events stay on this machine; the cloud only gets per-window summaries
+        event_writer = BlinkLogWriter(os.path.join(csv_dir, 'events', f'{self.log_base_name}.csv'), header=EVENT_LOG_HEADER)
+        aggregator = TelemetryAggregator(self.telemetry_mode, self.scene_bounds)
+        session = None
+        from firebase_upload import enqueue_viewer_log, enqueue_window_summary
+        # Same title the overlay and title bar show
+        movie_name = (parse_title(self.movie_name).title if self.movie_name else '') or 'Unknown'
+
+        def upload_windows(windows, total_blinks):
+            now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            for summary in windows:
+                enqueue_window_summary(summary, total_blinks, now_str, movie_name, self.user_name)
+
+        try:
+            real_time_log_path = os.path.join(os.getcwd(), 'csv', 'realtime', 'realtime_log.csv')
+            # Write header if file doesn't exist
+            if not os.path.exists(real_time_log_path):
+                with open(real_time_log_path, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(REALTIME_LOG_HEADER)
+            with mp.solutions.face_mesh.FaceMesh(
+                max_num_faces=1,
+                refine_landmarks=True,
+                min_detection_confidence=0.7,
+                min_tracking_confidence=0.7
+            ) as face_mesh:
+                # Get initial frame size for calibration; some webcams take several seconds to start
+                ret, frame = self._next_frame(grabber)
                 if not ret:
-                    break
-                frame = normalize_lighting(frame)
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = face_mesh.process(rgb_frame)
-                if results.multi_face_landmarks:
-                    for face_landmarks in results.multi_face_landmarks:
-                        left_eye = np.array([(int(face_landmarks.landmark[i].x * iw), int(face_landmarks.landmark[i].y * ih)) for i in LEFT_EYE])
-                        right_eye = np.array([(int(face_landmarks.landmark[i].x * iw), int(face_landmarks.landmark[i].y * ih)) for i in RIGHT_EYE])
-                        left_ear = calculate_ear(left_eye)
-                        right_ear = calculate_ear(right_eye)
-                        ear = (left_ear + right_ear) / 2.0
-                        ear_history.append(ear)
-                        if len(ear_history) > max_history:
-                            ear_history.pop(0)
-                        smooth_ear = np.median(ear_history)
-                        if smooth_ear < self.blink_threshold:
-                            closed_frames += 1
-                        else:
-                            if closed_frames >= consecutive_frames:
-                                blink_count += 1
-                                self.blink_count = blink_count
-                                self.blink_count_changed.emit(blink_count)
-                                # Log to CSV
-                                now = datetime.now()
-                                elapsed = now - start_time
-                                elapsed_hms = str(timedelta(seconds=int(elapsed.total_seconds())))
-                                real_time_12h = now.strftime('%I:%M:%S %p')
-                                # Read all rows, replace any with matching elapsed_hms, else append
-                                import csv
-                                import os
-                                rows = []
-                                replaced = False
-                                if os.path.exists(log_path):
-                                    with open(log_path, 'r', newline='') as f:
-                                        reader = list(csv.reader(f))
-                                        header = reader[0] if reader else []
-                                        rows = reader[1:] if len(reader) > 1 else []
-                                # Replace any row with the same elapsed_hms
-                                for i, row in enumerate(rows):
-                                    if len(row) > 1 and row[1] == elapsed_hms:
-                                        rows[i] = [real_time_12h, elapsed_hms, blink_count]
-                                        replaced = True
-                                        break
-                                if not replaced:
-                                    rows.append([real_time_12h, elapsed_hms, blink_count])
-                                # Write header and all rows
-                                with open(log_path, 'w', newline='') as f:
-                                    writer = csv.writer(f)
-                                    if header:
-                                        writer.writerow(header)
-                                    writer.writerows(rows)
-                                # Upload to Firebase in real time
-                                from firebase_upload import upload_viewer_log
-                                import re
-                                def clean_movie_name(name):
-                                    name = re.sub(r'\.[^.]+$', '', name)
-                                    name = re.sub(r'[._]+', ' ', name)
-                                    match_year = re.search(r'(19|20)\d{2}', name)
-                                    cut_idx = match_year.end() if match_year else None
-                                    if cut_idx:
-                                        name = name[:cut_idx]
-                                    # Remove trailing | and spaces
-                                    name = re.sub(r'[|]+$', '', name)
-                                    name = re.sub(r'[^\w\s]+$', '', name)
-                                    name = re.sub(r'\s+', ' ', name).strip()
-                                    return name.title()
-                                import os
-                                filename_only = os.path.basename(self.movie_name) if self.movie_name else ""
-                                movie_name = clean_movie_name(filename_only) if filename_only else 'Unknown'
-                                upload_viewer_log(blink_count, elapsed_hms, now.strftime('%Y-%m-%d %H:%M:%S'), movie_name, self.user_name)
+                    return
+                ih, iw, _ = frame.shape
+                # Every processed frame, in the binary session format, written chunk by chunk. Threads
+                # started for the same viewing session (pause/resume) append to the same directory.
+                session = SessionWriter(
+                    os.path.join(os.getcwd(), SESSIONS_DIR, f"{self.log_base_name}_{session_start.strftime('%Y%m%d_%H%M%S')}"),
+                    source='live', movie_name=self.log_base_name, user_name=self.user_name,
+                    session_start_ms=session_start_ms)
+                profile = None if self.recalibrate else load_calibration(self.user_name)
+                if profile:
+                    self.blink_threshold = profile["threshold"]
+                    self.open_ear = profile["open_ear"]
+                    self.closed_ear = profile["closed_ear"]
+                else:
+                    self.blink_threshold = self.calibrate_ear(face_mesh, grabber, iw, ih)
+                self.calibration_complete.emit(self.blink_threshold)
+                detector = BlinkDetector(self.blink_threshold, consecutive_frames=2, window=5)
+                # Keep refining the threshold from the live EAR distribution
+                adapter = OnlineThresholdAdapter(self.open_ear, self.closed_ear)
+                governor = self.governor
+                while self._running:
+                    ret, frame = self._next_frame(grabber)
+                    if not ret:
+                        break
+                    governor.frame_start()
+                    ear = self._frame_ear(face_mesh, frame)
+                    now_ms = int(time.time() * 1000)
+                    # Telemetry time: ms since the viewing session started, not since this thread did
+                    t_ms = now_ms - session_start_ms
+                    media_position = self.media_position_ms
+                    if ear is not None:
+                        detector.threshold = self.blink_threshold = adapter.update(ear)
+                    blink = ear is not None and detector.update(ear)
+                    if blink:
+                        blink_count += 1
+                        self.blink_count = blink_count
+                        self.blink_count_changed.emit(blink_count)
+                        # Log to CSV
+                        now = datetime.now()
+                        elapsed = now - start_time
+                        elapsed_hms = str(timedelta(seconds=int(elapsed.total_seconds())))
+                        real_time_12h = now.strftime('%I:%M:%S %p')
+                        log_writer.append([real_time_12h, elapsed_hms, blink_count])
+                        event_writer.append([t_ms, now.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3], blink_count,
+                                             f"{ear:.4f}", '' if media_position is None else media_position])
+                        if self.telemetry_mode == 'blink':
+                            # Queue for batched background upload; never blocks this loop
+                            enqueue_viewer_log(blink_count, elapsed_hms, now.strftime('%Y-%m-%d %H:%M:%S'), movie_name, self.user_name)
+                    if ear is not None and self.telemetry_mode != 'blink':
+                        closed = aggregator.update(t_ms, ear, media_position, int(blink))
+                        if closed:
+                            # The windows closed before this sample, so its blink is not theirs
+                            upload_windows(closed, blink_count - int(blink))
+                    session.append(now_ms, media_position, ear, blink)
+                    log_writer.maybe_flush()
+                    event_writer.maybe_flush()
+                    if governor.wait():
+                        self.frame_rate_report.emit(governor.achieved_fps, governor.target_fps)
+                self._save_calibration(adapter)
+                if self.telemetry_mode != 'blink':
+                    upload_windows(aggregator.flush(), blink_count)
+                session.meta['threshold'] = adapter.threshold
+        finally:
+            # Every exit, including a camera that never delivers a frame or an exception, closes all writers
+            if session is not None:
+                session.close()
+            log_writer.close()
+            event_writer.close()
+            grabber.stop()
+            cap.release()
+
+    def _save_calibration(self, adapter):
+        """
+        Persist the refined levels so the next session starts from them without calibrating.
+        Sessions without a face, or too short to see both open and closed eyes, leave the saved profile alone.
+        """
+        if not adapter.calibrated:
+            return False
+        save_calibration(self.user_name, adapter.threshold, adapter.open_ear, adapter.closed_ear)
+        return True
+
+    def _next_frame(self, grabber, poll=0.5):
+        """Wait for the next camera frame however long it takes, until the camera ends or the thread is stopped."""
+        while self._running:
+            ret, frame = grabber.read(timeout=poll)
+            if ret or grabber.finished:
+                return ret, frame
+        return False, None
 
-                            closed_frames = 0
-                time.sleep(0.05)
-        cap.release()
+    def _frame_ear(self, face_mesh, frame):
+        """EAR for one camera frame (None if no face), using this thread's ROI tracker and lighting mode."""
+        return frame_ear(face_mesh, frame, self.normalizer, self.roi_tracker)
 
     def calibrate_ear(self, face_mesh, cap, iw, ih):
         closed_ears = []
@@ -157,33 +208,23 @@ class BlinkCounterThread(QThread):
             ret, frame = cap.read()
             if not ret:
                 continue
-            frame = normalize_lighting(frame)
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = face_mesh.process(rgb_frame)
-            if results.multi_face_landmarks:
-                face_landmarks = results.multi_face_landmarks[0]
-                left_eye = np.array([(int(face_landmarks.landmark[i].x * iw), int(face_landmarks.landmark[i].y * ih)) for i in LEFT_EYE])
-                right_eye = np.array([(int(face_landmarks.landmark[i].x * iw), int(face_landmarks.landmark[i].y * ih)) for i in RIGHT_EYE])
-                ear = (calculate_ear(left_eye) + calculate_ear(right_eye)) / 2.0
+            ear = self._frame_ear(face_mesh, frame)
+            if ear is not None:
                 closed_ears.append(ear)
         open_ears = []
         for _ in range(20):
             ret, frame = cap.read()
             if not ret:
                 continue
-            frame = normalize_lighting(frame)
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = face_mesh.process(rgb_frame)
-            if results.multi_face_landmarks:
-                face_landmarks = results.multi_face_landmarks[0]
-                left_eye = np.array([(int(face_landmarks.landmark[i].x * iw), int(face_landmarks.landmark[i].y * ih)) for i in LEFT_EYE])
-                right_eye = np.array([(int(face_landmarks.landmark[i].x * iw), int(face_landmarks.landmark[i].y * ih)) for i in RIGHT_EYE])
-                ear = (calculate_ear(left_eye) + calculate_ear(right_eye)) / 2.0
+            ear = self._frame_ear(face_mesh, frame)
+            if ear is not None:
                 open_ears.append(ear)
         closed_mean = np.median(closed_ears) if closed_ears else 0.18
         open_mean = np.median(open_ears) if open_ears else 0.3
+        self.closed_ear = float(closed_mean)
+        self.open_ear = float(open_mean)
         blink_threshold = (closed_mean + open_mean) / 2.2
-        return blink_threshold
+        return float(blink_threshold)
 
     def stop(self):
         self._running = False
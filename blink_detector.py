@@ -0,0 +1,189 @@
+import math
+from bisect import bisect_left, insort
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+SMOOTHING_MODES = ('median', 'ema')
+
+
+class BlinkDetector:
+    """
+    Streaming blink detector fed one EAR sample per frame.
+    Samples are smoothed over a fixed-size ring buffer (running median, kept incrementally
+    in a sorted window) or with an exponential moving average. A blink is reported on the
+    first open frame after at least `consecutive_frames` closed (below-threshold) frames,
+    exactly like the original capture loop. Feeding the same samples always gives the
+    same blinks, so recorded EAR traces can be replayed offline.
+    """
+    def __init__(self, threshold=0.22, consecutive_frames=2, window=5, smoothing='median', alpha=0.5):
+        if smoothing not in SMOOTHING_MODES:
+            raise ValueError(f"Unknown smoothing {smoothing!r}, expected one of {SMOOTHING_MODES}")
+        self.threshold = threshold
+        self.consecutive_frames = consecutive_frames
+        self.window = window
+        self.smoothing = smoothing
+        self.alpha = alpha
+        self.reset()
+
+    def reset(self):
+        self._ring = np.zeros(self.window)
+        self._pos = 0
+        self._count = 0
+        self._sorted = []
+        self._ema = None
+        self.closed_frames = 0
+        self.smooth_ear = None
+
+    def _smooth(self, ear):
+        if self.smoothing == 'ema':
+            self._ema = ear if self._ema is None else self.alpha * ear + (1.0 - self.alpha) * self._ema
+            return self._ema
+        if self._count == self.window:
+            oldest = self._ring[self._pos]
+            del self._sorted[bisect_left(self._sorted, oldest)]
+        else:
+            self._count += 1
+        self._ring[self._pos] = ear
+        self._pos = (self._pos + 1) % self.window
+        insort(self._sorted, ear)
+        n = len(self._sorted)
+        mid = n // 2
+        return self._sorted[mid] if n % 2 else (self._sorted[mid - 1] + self._sorted[mid]) / 2.0
+
+    def update(self, ear):
+        """Consume one EAR sample; returns True if it completes a blink. NaN/inf samples are ignored."""
+        ear = float(ear)
+        if not math.isfinite(ear):
+            # A NaN would break the sorted window's ordering for as long as it stays in the ring
+            return False
+        self.smooth_ear = self._smooth(ear)
+        if self.smooth_ear < self.threshold:
+            self.closed_frames += 1
+            return False
+        blink = self.closed_frames >= self.consecutive_frames
+        self.closed_frames = 0
+        return blink
+
+
+def smooth_ears(ears, window=5, smoothing='median', alpha=0.5):
+    """Vectorised equivalent of the detector's smoothing over a whole EAR array."""
+    ears = np.asarray(ears, dtype=np.float64)
+    if smoothing == 'ema':
+        return _ema(ears, alpha)
+    if smoothing != 'median':
+        raise ValueError(f"Unknown smoothing {smoothing!r}, expected one of {SMOOTHING_MODES}")
+    out = np.empty_like(ears)
+    head = min(window - 1, len(ears))
+    # The first samples only have a partially filled window
+    for i in range(head):
+        out[i] = np.median(ears[:i + 1])
+    if len(ears) >= window:
+        # Sorting each small window is about twice as fast as np.median's partitioning
+        ordered = np.sort(sliding_window_view(ears, window), axis=1)
+        mid = window // 2
+        out[window - 1:] = ordered[:, mid] if window % 2 else (ordered[:, mid - 1] + ordered[:, mid]) / 2.0
+    return out
+
+
+def _ema(ears, alpha):
+    """
+    s[0] = x[0], s[i] = alpha * x[i] + (1 - alpha) * s[i - 1], in closed form per chunk:
+    s[i] = d^(i+1) * s_prev + alpha * d^i * cumsum(x[k] / d^k), with d = 1 - alpha.
+    Chunks are short enough that d^-k stays far from overflow.
+    """
+    out = np.empty_like(ears)
+    if not len(ears):
+        return out
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[:] = ears
+        return out
+    chunk = len(ears) if decay >= 1.0 else max(1, min(len(ears), int(math.log(1e-150) / math.log(decay))))
+    powers = decay ** np.arange(chunk + 1)
+    inverse = 1.0 / powers[:-1]
+    prev = ears[0]
+    for start in range(0, len(ears), chunk):
+        x = ears[start:start + chunk]
+        n = len(x)
+        out[start:start + n] = powers[1:n + 1] * prev + alpha * powers[:n] * np.cumsum(x * inverse[:n])
+        prev = out[start + n - 1]
+    return out
+
+
+def find_blinks(smooth, threshold, consecutive_frames=2):
+    """
+    Blink indices for an already smoothed EAR array with no gaps.
+    Handy for threshold sweeps: smooth once with `smooth_ears`, then call this per threshold.
+    """
+    closed = np.asarray(smooth) < threshold
+    # Runs of closed frames: a blink fires on the open frame ending a long enough run
+    edges = np.diff(np.concatenate(([0], closed.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return ends[(ends - starts >= consecutive_frames) & (ends < len(closed))]
+
+
+def detect_blinks(ears, threshold=0.22, consecutive_frames=2, window=5, smoothing='median', alpha=0.5):
+    """
+    Batch version of `BlinkDetector`: returns the indices of the samples at which a blink is
+    reported, identical to feeding `ears` one by one to a fresh detector.
+    NaN samples (frames without a face) and other non-finite values are skipped, as
+    `BlinkDetector.update` skips them.
+    `threshold` may be a scalar or a per-sample array.
+    """
+    ears = np.asarray(ears, dtype=np.float64)
+    valid = np.flatnonzero(np.isfinite(ears))
+    smooth = smooth_ears(ears[valid], window, smoothing, alpha)
+    threshold = np.asarray(threshold, dtype=np.float64)
+    if threshold.ndim:
+        threshold = threshold[valid]
+    return valid[find_blinks(smooth, threshold, consecutive_frames)]
+
+
+class OnlineThresholdAdapter:
+    """
+    Keeps refining the blink threshold from the live EAR distribution.
+    Two running quantile estimates are maintained by stochastic approximation: a low one
+    (`closed_q`, the closed-eye level reached during blinks) and the median (`open_q`, the
+    open-eye level). The threshold follows calibrate_ear's rule, (closed + open) / 2.2,
+    clamped to [min_threshold, max_threshold]. Each sample costs O(1) and no history is kept.
+    The levels are only worth saving once `calibrated`, i.e. enough samples were seen on both
+    sides of the threshold (at least `min_open` open and `min_closed` closed frames).
+    """
+    def __init__(self, open_ear=0.3, closed_ear=0.18, closed_q=0.02, open_q=0.5, rate=0.002,
+                 min_threshold=0.1, max_threshold=0.35, min_open=200, min_closed=20):
+        self.open_ear = float(open_ear)
+        self.closed_ear = float(closed_ear)
+        self.closed_q = closed_q
+        self.open_q = open_q
+        self.rate = rate
+        self.min_threshold = min_threshold
+        self.max_threshold = max_threshold
+        self.min_open = min_open
+        self.min_closed = min_closed
+        self.samples = 0
+        self.open_samples = 0
+        self.closed_samples = 0
+
+    @property
+    def threshold(self):
+        value = (self.closed_ear + self.open_ear) / 2.2
+        return min(self.max_threshold, max(self.min_threshold, value))
+
+    @property
+    def calibrated(self):
+        return self.open_samples >= self.min_open and self.closed_samples >= self.min_closed
+
+    def update(self, ear):
+        """Consume one raw EAR sample and return the refined threshold."""
+        ear = float(ear)
+        if ear < self.threshold:
+            self.closed_samples += 1
+        else:
+            self.open_samples += 1
+        # Pinball-loss gradient step: the estimate settles where a fraction q of samples lies below it
+        self.closed_ear += self.rate * (self.closed_q - (ear < self.closed_ear))
+        self.open_ear += self.rate * (self.open_q - (ear < self.open_ear))
+        self.samples += 1
+        return self.threshold
@@ -0,0 +1,79 @@
+import csv
+import os
+import time
+
+LOG_HEADER = ['real_time_12h', 'elapsed_hms', 'blink_count']
+
+
+class BlinkLogWriter:
+    """
+    Append-only writer for the per-movie blink CSV.
+    Keeps one open handle for the whole session and flushes rows to disk in batches,
+    either after `flush_every` rows or once `flush_interval` seconds have passed,
+    so logging a blink costs O(1) regardless of how long the file already is.
+    Several blinks in the same second produce several rows; use `read_blink_log`
+    to get the rolled-up one-row-per-second view.
+    """
+    def __init__(self, path, header=LOG_HEADER, flush_every=16, flush_interval=2.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        if write_header:
+            self._writer.writerow(header)
+            self._file.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def append(self, row):
+        """Queue one row for writing and flush if the count or time budget is spent."""
+        self._writer.writerow(row)
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+        else:
+            self.maybe_flush()
+
+    def maybe_flush(self):
+        """Flush pending rows if they have been buffered longer than `flush_interval`."""
+        if self._pending and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if not self._file.closed:
+            self._file.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_blink_log(path):
+    """
+    Read a blink log and roll it up to one row per `elapsed_hms` second.
+    The last row logged for a second wins, but keeps the position of the first one,
+    matching what the old rewrite-in-place logger left on disk.
+    Returns (header, rows).
+    """
+    if not os.path.exists(path):
+        return list(LOG_HEADER), []
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, list(LOG_HEADER))
+        by_second = {}
+        for row in reader:
+            if len(row) > 1:
+                by_second[row[1]] = row
+    return header, list(by_second.values())
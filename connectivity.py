@@ -0,0 +1,127 @@
+import socket
+import threading
+import time
+
+
+def tcp_probe(host="8.8.8.8", port=53, timeout=2.0):
+    """True if a TCP connection to `host:port` (a public DNS server by default) succeeds."""
+    try:
+        socket.create_connection((host, port), timeout=timeout).close()
+        return True
+    except Exception:
+        return False
+
+
+class ConnectivityMonitor(threading.Thread):
+    """
+    Background thread that keeps a cached online/offline flag so callers never block on a probe.
+
+    While online the probe runs every `interval` seconds. While offline it is retried with
+    exponential backoff, starting at `min_backoff` and multiplying by `backoff_factor` up to
+    `max_backoff`; the backoff resets as soon as a probe succeeds. `recheck()` wakes the thread
+    for an immediate probe, e.g. after an upload error.
+
+    Until the first probe finishes the state is unknown (`online` is None, or `initial` if
+    given) and `is_online()` optimistically reports True, so uploads made right at start-up are
+    attempted instead of going straight to the offline journal.
+
+    `probe` is any zero-argument callable returning a bool (tcp_probe by default), so tests can
+    simulate flapping networks. Listeners added with `add_listener(callback)` are called as
+    `callback(online)` on the monitor thread whenever the flag changes, including when the first
+    probe result replaces the unknown state.
+    """
+    def __init__(self, probe=tcp_probe, interval=15.0, min_backoff=1.0, max_backoff=60.0,
+                 backoff_factor=2.0, initial=None):
+        super().__init__(daemon=True, name="ConnectivityMonitor")
+        self.probe = probe
+        self.interval = interval
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.backoff_factor = backoff_factor
+        self._online = None if initial is None else bool(initial)
+        self._backoff = min_backoff
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        self._stopped = False
+        self._probes = 0
+        self._transitions = 0
+        self._last_change = None
+
+    @property
+    def online(self):
+        """Last probe result, or None before the first probe."""
+        return self._online
+
+    def is_online(self):
+        """Cached connectivity flag, True while still unknown; never blocks."""
+        return self._online is not False
+
+    def add_listener(self, callback):
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def recheck(self):
+        """Probe again as soon as possible instead of waiting for the current delay."""
+        self._wake.set()
+
+    def wait_for(self, online, timeout=None):
+        """Block until the flag equals `online`; returns False on timeout."""
+        with self._changed:
+            return self._changed.wait_for(lambda: self._online == online, timeout)
+
+    def stop(self, timeout=5.0):
+        self._stopped = True
+        self._wake.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'online': self._online,
+                'probes': self._probes,
+                'transitions': self._transitions,
+                'last_change': self._last_change,
+                'next_backoff': self._backoff,
+            }
+
+    def check(self):
+        """Run one probe, update the flag and return the delay before the next probe (seconds)."""
+        try:
+            online = bool(self.probe())
+        except Exception:
+            online = False
+        with self._changed:
+            self._probes += 1
+            changed = online != self._online
+            self._online = online
+            if changed:
+                self._transitions += 1
+                self._last_change = time.time()
+                self._changed.notify_all()
+            listeners = list(self._listeners) if changed else []
+            if online:
+                self._backoff = self.min_backoff
+                delay = self.interval
+            else:
+                delay = self._backoff
+                self._backoff = min(self.max_backoff, self._backoff * self.backoff_factor)
+        for callback in listeners:
+            try:
+                callback(online)
+            except Exception as e:
+                print(f"[WARNING] Connectivity listener failed: {e}")
+        return delay
+
+    def run(self):
+        while not self._stopped:
+            delay = self.check()
+            self._wake.wait(delay)
+            self._wake.clear()
@@ -1,12 +1,13 @@
 from PyQt6.QtWidgets import QHBoxLayout, QPushButton, QSlider, QLabel, QFileDialog, QStyle, QWidget, QGraphicsOpacityEffect, QHBoxLayout, QVBoxLayout
 from PyQt6.QtCore import Qt, QUrl, QTimer, QEasingCurve, QPropertyAnimation, QSize
-from PyQt6.QtGui import QIcon, QPixmap, QColor, QFontDatabase, QFont
+from PyQt6.QtGui import QIcon, QPixmap, QColor
 from controller_icons import PLAY_ICON, PAUSE_ICON, OPEN_ICON, VOLUME_ICON, FULLSCREEN_ICON, EXIT_FULLSCREEN_ICON
 from PyQt6.QtSvgWidgets import QSvgWidget
 from gradient_slider import GradientSlider
+from time_display import TimeDisplayLabel
+import font_registry
 from blink_counter_thread import BlinkCounterThread
 import base64
-import os
 from user_config import get_or_create_username
 
 from PyQt6.QtCore import pyqtSignal
@@ -38,6 +39,8 @@ class ControlsBar(QHBoxLayout):
         self.widget.setGraphicsEffect(self.opacity_effect)
         self.widget.setStyleSheet("background: transparent; border: none; margin: 0; padding: 0;")
         self.blink_thread = None
+        # (movie path, start datetime) of the current viewing session, kept across pause/resume
+        self._blink_session = None
         self.init_controls()
 
     def init_controls(self):
@@ -72,12 +75,13 @@ class ControlsBar(QHBoxLayout):
         # Removed previewLabel and percentage popup logic
         # self.positionSlider.setMouseTracking(True)
 
-        self.timeLabel = QLabel('<span style="font-family: monospace, Gotham, GothamRegular, Arial, sans-serif; font-size:16px; color:#e0e6f0; letter-spacing: 0.5px;">00:00:00.00 <span style="color:#4f8cff; font-weight: bold; margin-left:16px;">00.00 %</span></span>')
+        self.timeLabel = TimeDisplayLabel()
         self.timeLabel.setObjectName("timeLabel")
-        self.timeLabel.mousePressEvent = self.toggle_time_display
+        self.timeLabel.clicked.connect(self.toggle_time_display)
         self.show_remaining = False
 
-        self.volumeSlider = GradientSlider(Qt.Orientation.Horizontal)
+        # Static gradient: the volume bar has nothing to animate
+        self.volumeSlider = GradientSlider(Qt.Orientation.Horizontal, animated=False)
         self.volumeSlider.setObjectName("volumeSlider")
         self.volumeSlider.setValue(50)
         self.volumeSlider.setMinimumHeight(12)
@@ -99,17 +103,7 @@ class ControlsBar(QHBoxLayout):
         self.blinkLabel = QLabel()
         self.blinkLabel.setText("BLINKS: 0")
         self.blinkLabel.setObjectName("blinkLabel")
-        fonts_dir = os.path.join(os.path.dirname(__file__), 'fonts')
-        gotham_path = os.path.join(fonts_dir, 'GothamBook.ttf')
-        font_loaded = False
-        if os.path.exists(gotham_path):
-            font_id = QFontDatabase.addApplicationFont(gotham_path)
-            if font_id != -1:
-                family = QFontDatabase.applicationFontFamilies(font_id)[0]
-                self.blinkLabel.setFont(QFont(family, 13, QFont.Weight.Normal))
-                font_loaded = True
-        if not font_loaded:
-            self.blinkLabel.setFont(QFont("Arial", 13, QFont.Weight.Normal))
+        self.blinkLabel.setFont(font_registry.font('blink_label'))
         self.blinkLabel.setStyleSheet('''
             QLabel {
                 font-size: 13px;
@@ -189,6 +183,8 @@ class ControlsBar(QHBoxLayout):
         self.mediaPlayer.positionChanged.connect(self.position_changed)
         self.mediaPlayer.durationChanged.connect(self.duration_changed)
         self.mediaPlayer.playbackStateChanged.connect(self.update_play_icon)
+        self.mediaPlayer.playbackStateChanged.connect(
+            lambda state: self.positionSlider.set_playing(state == self.mediaPlayer.PlaybackState.PlayingState))
         self.mediaPlayer.errorOccurred.connect(self.handle_error)
         self.audio_output.setVolume(0.5)
 
@@ -231,14 +227,18 @@ class ControlsBar(QHBoxLayout):
 
     def position_changed(self, position):
         self.positionSlider.setValue(position)
+        if self.blink_thread:
+            # Lets the blink thread stamp events and telemetry windows with the media position
+            self.blink_thread.set_media_position(position)
         self.update_time_label()
 
     def duration_changed(self, duration):
         self.positionSlider.setRange(0, duration)
-        self.update_time_label()
+        self.update_time_label(immediate=True)
 
     def _on_playback_state_changed(self, state):
         import os
+        from datetime import datetime
         if not hasattr(self, '_last_blink_count'):
             self._last_blink_count = 0
         # Get movie file name (without extension)
@@ -251,9 +251,14 @@ class ControlsBar(QHBoxLayout):
         if state == self.mediaPlayer.PlaybackState.PlayingState:
             if not self.blink_thread or not self.blink_thread.isRunning():
                 user_name = get_or_create_username()
-                self.blink_thread = BlinkCounterThread(log_base_name=movie_base, movie_name=movie_path if movie_path else "", user_name=user_name)
+                # A resumed movie continues its viewing session; another movie starts a new one
+                if self._blink_session is None or self._blink_session[0] != movie_path:
+                    self._blink_session = (movie_path, datetime.now())
+                self.blink_thread = BlinkCounterThread(log_base_name=movie_base, movie_name=movie_path if movie_path else "",
+                                                       user_name=user_name, session_start=self._blink_session[1])
                 self.blink_thread.blink_count = self._last_blink_count
                 self.blink_thread.blink_count_changed.connect(self._update_and_store_blink_label)
+                self.blink_thread.frame_rate_report.connect(self._show_frame_rate)
                 self.blink_thread.start()
         else:
             if self.blink_thread and self.blink_thread.isRunning():
@@ -263,6 +268,18 @@ class ControlsBar(QHBoxLayout):
         self._last_blink_count = count
         self.update_blink_label(count)
 
+    def _show_frame_rate(self, achieved_fps, target_fps):
+        # Once per governor window: detection rate and the camera thread's capture counters,
+        # shown on the blink counter's tooltip and logged whenever the governor changes its target
+        stats = self.blink_thread.capture_stats() if self.blink_thread else {}
+        report = (f"{achieved_fps:.1f}/{target_fps:.0f} fps, "
+                  f"dropped {stats.get('frames_dropped', 0)} of {stats.get('frames_captured', 0)} frames, "
+                  f"mean frame age {stats.get('mean_queue_age', 0.0) * 1000:.0f} ms")
+        self.blinkLabel.setToolTip(f"Blink detection: {report}")
+        if target_fps != getattr(self, '_last_target_fps', None):
+            self._last_target_fps = target_fps
+            print(f"[Camera] {report}")
+
 
     def update_blink_label(self, count):
         self.blinkLabel.setText(f"BLINKS: {count}")
@@ -286,31 +303,14 @@ class ControlsBar(QHBoxLayout):
             from PyQt6.QtCore import QTimer
             QTimer.singleShot(180, lambda: self.blinkCircle.setStyleSheet(base_style))
 
-    def update_time_label(self):
-        pos_ms = self.mediaPlayer.position()
-        dur_ms = self.mediaPlayer.duration()
-        def format_time(ms):
-            total_seconds = abs(ms) // 1000
-            cs_part = round((abs(ms) % 1000) / 10)  # centiseconds, 2 digits
-            hours = total_seconds // 3600
-            minutes = (total_seconds % 3600) // 60
-            seconds = total_seconds % 60
-            return f"{hours:02}:{minutes:02}:{seconds:02}.{cs_part:02}"  # Always show centiseconds
-        if getattr(self, 'show_remaining', False) and dur_ms > 0:
-            time_str = format_time(pos_ms - dur_ms)
-        else:
-            time_str = format_time(pos_ms)
-        percent = (pos_ms / dur_ms * 100) if dur_ms else 0.0
-        percent_str = f"{percent:05.2f} %"
-        self.timeLabel.setText(
-            f'<span style="font-family: monospace, Gotham, GothamRegular, Arial, sans-serif; font-size:16px; color:#e0e6f0; letter-spacing: 0.5px;">'
-            f'{time_str} <span style="color:#4f8cff; font-weight: bold; margin-left:16px;">{percent_str}</span>'
-            f'</span>'
-        )
-
-    def toggle_time_display(self, event):
-        self.show_remaining = not getattr(self, 'show_remaining', False)
-        self.update_time_label()
+    def update_time_label(self, immediate=False):
+        # Throttled inside the label; called on every positionChanged
+        self.timeLabel.set_time(self.mediaPlayer.position(), self.mediaPlayer.duration(),
+                                self.show_remaining, immediate)
+
+    def toggle_time_display(self):
+        self.show_remaining = not self.show_remaining
+        self.update_time_label(immediate=True)
 
 
     # Also set the initial label HTML in __init__ or init_controls (wherever QLabel("00:00 / 00:00") is set)
@@ -324,7 +324,7 @@ class ControlsBar(QHBoxLayout):
         print(f"[Speed] Playback speed set to {speed}x")
 
     def handle_error(self, error, errorString):
-        self.timeLabel.setText(f"Error: {errorString}")
+        self.timeLabel.set_message(f"Error: {errorString}")
 
     def toggle_maximize(self):
         mw = self.parent.window() if self.parent else None
@@ -0,0 +1,95 @@
+import csv
+import io
+import os
+
+
+class CsvTailer:
+    """
+    Incremental reader for an append-only CSV log such as csv/realtime/realtime_log.csv.
+
+    Remembers the byte offset it has consumed and the identity (device, inode) of the file,
+    so each `read_new_rows()` call reads only the bytes appended since the last one, no matter
+    how long the file has grown. A trailing line without its newline yet is held back until it
+    is complete. If the file shrinks (truncation) or is replaced by a new file (rotation, e.g.
+    the old log being moved into csv/archive/), reading restarts from the top of the new file,
+    header included. The file is not kept open between calls, so it can be moved or deleted
+    at any time.
+    """
+    def __init__(self, path, encoding='utf-8'):
+        self.path = path
+        self.encoding = encoding
+        self._reset(None)
+
+    def _reset(self, identity):
+        self._identity = identity
+        self._offset = 0
+        self._partial = b''
+        self.header = None
+
+    @property
+    def offset(self):
+        return self._offset
+
+    def lag_bytes(self):
+        """Bytes in the file not yet returned as rows (appended data plus a held-back partial line)."""
+        identity, size = self._stat()
+        if identity is None:
+            return 0
+        if identity != self._identity or size < self._offset:
+            return size
+        return size - self._offset + len(self._partial)
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None, 0
+        return (st.st_dev, st.st_ino), st.st_size
+
+    def seek_to_end(self):
+        """Skip the rows already in the file: only rows appended after this call are returned."""
+        identity, size = self._stat()
+        self._reset(identity)
+        if identity is None:
+            return
+        with open(self.path, 'rb') as f:
+            header_line = f.readline()
+            if not header_line.endswith(b'\n'):
+                # Not even a complete header yet: read everything later
+                return
+            self.header = next(csv.reader([header_line.decode(self.encoding)]))
+            # Stop before an incomplete last line so it is returned once it is finished
+            tail_start = max(len(header_line), size - 65536)
+            f.seek(tail_start)
+            tail = f.read(size - tail_start)
+        cut = tail.rfind(b'\n')
+        self._offset = tail_start + cut + 1 if cut >= 0 else len(header_line)
+
+    def read_new_rows(self):
+        """Rows appended since the last call, as dicts keyed by the header."""
+        identity, size = self._stat()
+        if identity is None:
+            # Moved away and not recreated yet; start over once it reappears
+            self._reset(None)
+            return []
+        if identity != self._identity or size < self._offset:
+            self._reset(identity)
+        if size == self._offset:
+            return []
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read(size - self._offset)
+        self._offset += len(data)
+        data = self._partial + data
+        cut = data.rfind(b'\n')
+        if cut < 0:
+            self._partial = data
+            return []
+        self._partial = data[cut + 1:]
+        reader = csv.reader(io.StringIO(data[:cut + 1].decode(self.encoding), newline=''))
+        if self.header is None:
+            self.header = next(reader, None)
+            if self.header is None:
+                return []
+        header = self.header
+        return [dict(zip(header, row)) for row in reader if row]
@@ -0,0 +1,90 @@
+from operator import itemgetter
+
+import numpy as np
+
+LEFT_EYE = [33, 160, 158, 133, 153, 144]
+RIGHT_EYE = [263, 387, 385, 362, 380, 373]
+# Both eyes as one (2, 6) index array: row 0 = left eye, row 1 = right eye
+EYE_INDICES = np.array([LEFT_EYE, RIGHT_EYE])
+
+# EAR point pairs per eye: vertical p2-p6, vertical p3-p5, horizontal p1-p4.
+# Encoded as a (6, 12) +1/-1 matrix so all six difference vectors come out of one matmul.
+_EAR_PAIRS = [(1, 5), (2, 4), (0, 3)]
+
+
+def _ear_diff_matrix():
+    m = np.zeros((6, 12))
+    for eye in range(2):
+        for k, (a, b) in enumerate(_EAR_PAIRS):
+            m[eye * 3 + k, eye * 6 + a] = 1.0
+            m[eye * 3 + k, eye * 6 + b] = -1.0
+    return m
+
+
+_EAR_DIFF = _ear_diff_matrix()
+# Fetches all 12 eye landmarks from a MediaPipe landmark list in a single call
+_get_eye_landmarks = itemgetter(*LEFT_EYE, *RIGHT_EYE)
+
+
+def calculate_ear(eye_landmarks):
+    A = np.linalg.norm(eye_landmarks[1] - eye_landmarks[5])
+    B = np.linalg.norm(eye_landmarks[2] - eye_landmarks[4])
+    C = np.linalg.norm(eye_landmarks[0] - eye_landmarks[3])
+    ear = (A + B) / (2.0 * C)
+    return ear
+
+
+def eye_points(face_landmarks, iw, ih):
+    """
+    Gather both eyes' landmarks from a MediaPipe face as integer pixel coordinates.
+    Returns an array of shape (2, 6, 2): [left, right] x 6 points x (x, y).
+    """
+    eye = _get_eye_landmarks(face_landmarks.landmark)
+    xy = np.fromiter((c for p in eye for c in (p.x, p.y)), dtype=np.float64, count=24)
+    xy = xy.reshape(2, 6, 2) * np.array((iw, ih), dtype=np.float64)
+    # Truncate like int() did, so thresholds stay comparable with older logs
+    return xy.astype(np.int32)
+
+
+def eye_points_from_array(landmarks):
+    """Same as `eye_points` for landmarks already held as an (N, 2+) pixel array (or (F, N, 2+) for F frames)."""
+    landmarks = np.asarray(landmarks)
+    return landmarks[..., EYE_INDICES, :2]
+
+
+def batch_ear(points):
+    """
+    Eye aspect ratio averaged over both eyes, in one NumPy expression.
+    `points` has shape (..., 2, 6, 2); a single frame gives a 0-d result, (F, 2, 6, 2) gives F values.
+    """
+    pts = np.asarray(points, dtype=np.float64)
+    lead = pts.shape[:-3]
+    diff = _EAR_DIFF @ pts.reshape(lead + (12, 2))
+    dist = np.hypot(diff[..., 0], diff[..., 1]).reshape(lead + (2, 3))
+    ratio = (dist[..., 0] + dist[..., 1]) / dist[..., 2]
+    # (A + B) / (2C) per eye, then the mean of both eyes
+    return (ratio[..., 0] + ratio[..., 1]) * 0.25
+
+
+def frame_ear(face_mesh, frame, normalizer, tracker=None):
+    """
+    Run FaceMesh on one BGR frame and return the eye aspect ratio, or None if no face.
+    `normalizer` turns the frame into FaceMesh's RGB input (see lighting.LightingNormalizer).
+    With a `tracker` (face_roi.FaceRoiTracker) inference runs on the tracked face box, and a
+    miss there is retried once on the full frame before giving up.
+    """
+    if tracker is None:
+        results = face_mesh.process(normalizer(frame))
+        if not results.multi_face_landmarks:
+            return None
+        ih, iw = frame.shape[:2]
+        return float(batch_ear(eye_points(results.multi_face_landmarks[0], iw, ih)))
+    while True:
+        image, roi = tracker.crop(frame)
+        results = face_mesh.process(normalizer(image, tracker.eye_region(roi, image.shape)))
+        if results.multi_face_landmarks:
+            return float(batch_ear(tracker.eye_points(results.multi_face_landmarks[0], roi)))
+        if not tracker.tracking:
+            return None
+        # Lost the face inside the box: fall back to a full-frame search
+        tracker.reset()
@@ -0,0 +1,103 @@
+import cv2
+import numpy as np
+
+from eye_metrics import eye_points
+
+# Landmarks bounding the face: forehead, chin, right and left cheek contour
+FACE_BOUNDS = [10, 152, 234, 454]
+
+
+class FaceRoiTracker:
+    """
+    Keeps a face bounding box from the previous frame's landmarks so FaceMesh can run on a
+    cropped (and optionally downscaled) region instead of the full camera frame.
+
+    `crop(frame)` returns the image to run inference on plus the ROI it came from, as
+    (x, y, w, h) in full-frame pixels. Landmarks found in that image are mapped back with
+    `eye_points(face_landmarks, roi)`, which also updates the box for the next frame.
+    The box only moves when the face drifts towards its edge, which keeps FaceMesh's own
+    tracking stable. Call `reset()` when no face is found to go back to a full-frame search.
+    """
+    def __init__(self, margin=0.35, max_side=320, min_side=96):
+        self.margin = margin
+        self.max_side = max_side
+        self.min_side = min_side
+        self.roi = None
+        self.eye_box = None
+        self._frame_size = None
+
+    @property
+    def tracking(self):
+        return self.roi is not None
+
+    def reset(self):
+        self.roi = None
+        self.eye_box = None
+
+    def crop(self, frame):
+        ih, iw = frame.shape[:2]
+        if self._frame_size != (iw, ih):
+            # Camera resolution changed: the old box is meaningless
+            self._frame_size = (iw, ih)
+            self.reset()
+        if self.roi is None:
+            return frame, (0, 0, iw, ih)
+        x, y, w, h = self.roi
+        image = frame[y:y + h, x:x + w]
+        longest = max(w, h)
+        if self.max_side and longest > self.max_side:
+            scale = self.max_side / longest
+            image = cv2.resize(image, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+        return image, self.roi
+
+    def eye_points(self, face_landmarks, roi):
+        """Eye landmarks in full-frame pixels, shape (2, 6, 2); updates the tracked box."""
+        x, y, w, h = roi
+        points = eye_points(face_landmarks, w, h) + np.array((x, y), dtype=np.int32)
+        (ex0, ey0), (ex1, ey1) = points.reshape(-1, 2).min(axis=0), points.reshape(-1, 2).max(axis=0)
+        pad_x, pad_y = (ex1 - ex0) * 0.15, max(ey1 - ey0, 4) * 1.5
+        self.eye_box = (ex0 - pad_x, ey0 - pad_y, ex1 + pad_x, ey1 + pad_y)
+        self._update(face_landmarks, roi)
+        return points
+
+    def eye_region(self, roi, image_shape):
+        """Last known eye box as (x, y, w, h) in the pixels of the image `crop` returned for `roi`, or None."""
+        if self.eye_box is None:
+            return None
+        x, y, w, h = roi
+        ih, iw = image_shape[:2]
+        sx, sy = iw / w, ih / h
+        ex0, ey0, ex1, ey1 = self.eye_box
+        x0 = int(max(0, (ex0 - x) * sx))
+        y0 = int(max(0, (ey0 - y) * sy))
+        x1 = int(min(iw, (ex1 - x) * sx))
+        y1 = int(min(ih, (ey1 - y) * sy))
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return (x0, y0, x1 - x0, y1 - y0)
+
+    def _update(self, face_landmarks, roi):
+        x, y, w, h = roi
+        lm = face_landmarks.landmark
+        xs = [x + lm[i].x * w for i in FACE_BOUNDS]
+        ys = [y + lm[i].y * h for i in FACE_BOUNDS]
+        fx0, fx1, fy0, fy1 = min(xs), max(xs), min(ys), max(ys)
+        if self.roi is not None:
+            # Keep the current box while the face stays inside its inner region
+            rx, ry, rw, rh = self.roi
+            inset_x, inset_y = rw * self.margin / 4, rh * self.margin / 4
+            if (fx0 >= rx + inset_x and fx1 <= rx + rw - inset_x
+                    and fy0 >= ry + inset_y and fy1 <= ry + rh - inset_y):
+                return
+        iw, ih = self._frame_size
+        side = max(fx1 - fx0, fy1 - fy0) * (1 + 2 * self.margin)
+        side = max(side, self.min_side)
+        cx, cy = (fx0 + fx1) / 2, (fy0 + fy1) / 2
+        x0 = int(max(0, cx - side / 2))
+        y0 = int(max(0, cy - side / 2))
+        x1 = int(min(iw, cx + side / 2))
+        y1 = int(min(ih, cy + side / 2))
+        if x1 - x0 < 8 or y1 - y0 < 8:
+            self.roi = None
+        else:
+            self.roi = (x0, y0, x1 - x0, y1 - y0)
@@ -1,59 +1,177 @@
-import firebase_admin
-from firebase_admin import credentials, firestore
 import os
-import json
-import socket
+import atexit
+import threading
+from connectivity import ConnectivityMonitor
+from offline_journal import OfflineJournal
+from pending_sync import PendingDrainer
+from storage_backend import FirestoreBackend
+from upload_worker import UploadWorker
 
 # Path to your downloaded service account key
 cred_path = os.path.join(os.path.dirname(__file__), '../filmda-aiplayer-firebase-adminsdk-fbsvc-72a30fa4a2.json')
-if not firebase_admin._apps:
-    cred = credentials.Certificate(cred_path)
-    firebase_admin.initialize_app(cred)
-db = firestore.client()
+
+# The Firestore client (and firebase_admin/gRPC themselves) are only loaded on first use
+_db = None
+_db_lock = threading.Lock()
+# Where uploads go; Firestore unless replaced with set_backend()
+_backend = None
 
 PENDING_DIR = os.path.join(os.path.dirname(__file__), 'pending_uploads')
 os.makedirs(PENDING_DIR, exist_ok=True)
+# Events recorded while offline, replayed in bulk once the connection is back
+JOURNAL_PATH = os.path.join(PENDING_DIR, 'journal.sqlite3')
+
+# Batched background uploads: commit after this many events or this many seconds
+UPLOAD_BATCH_SIZE = 50
+UPLOAD_MAX_LATENCY = 2.0
+# Background drain of the offline journal: events per write and events per second
+DRAIN_BATCH_SIZE = 100
+DRAIN_MAX_RATE = 200.0
+
+_worker = None
+_worker_lock = threading.Lock()
+_monitor = None
+_monitor_lock = threading.Lock()
+_journal = None
+_journal_lock = threading.Lock()
+# Only one drain at a time, otherwise two replays could send the same unacknowledged batch
+_drain_lock = threading.Lock()
+
+def get_db():
+    """Return the shared Firestore client, initialising firebase_admin on first call."""
+    global _db
+    if _db is not None:
+        return _db
+    with _db_lock:
+        if _db is None:
+            import firebase_admin
+            from firebase_admin import credentials, firestore
+            if not firebase_admin._apps:
+                cred = credentials.Certificate(cred_path)
+                firebase_admin.initialize_app(cred)
+            _db = firestore.client()
+        return _db
+
+def get_backend():
+    """Return the storage backend all uploads go through (Firestore by default)."""
+    global _backend
+    if _backend is None:
+        _backend = FirestoreBackend(get_db)
+    return _backend
+
+def set_backend(backend):
+    """Route all uploads through `backend`, e.g. a storage_backend.FakeBackend for local runs."""
+    global _backend
+    _backend = backend
+
+def _warm_up():
+    try:
+        get_db()
+    except Exception as e:
+        print(f"[WARNING] Firebase warm-up failed: {e}")
+
+def warm_up_async():
+    """Create the Firestore client on a background thread so the first upload does not pay for it."""
+    get_connectivity()
+    thread = threading.Thread(target=_warm_up, name="FirebaseWarmUp", daemon=True)
+    thread.start()
+    return thread
+
+def __getattr__(name):
+    # Keeps `firebase_upload.db` working for older scripts without importing Firestore eagerly
+    if name == 'db':
+        return get_db()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def get_connectivity():
+    """Return the shared connectivity monitor, starting its background probe on first use."""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = ConnectivityMonitor()
+            _monitor.start()
+            atexit.register(_monitor.stop)
+        return _monitor
 
 def is_connected():
+    # Cached flag from the background probe: never blocks the caller
+    return get_connectivity().is_online()
+
+def wait_until_online(timeout=None):
+    """Block until the connectivity monitor reports online; False on timeout."""
+    return get_connectivity().wait_for(True, timeout)
+
+def get_journal():
+    """Return the shared offline journal, folding in any legacy offline_*.json files on first use."""
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = OfflineJournal(JOURNAL_PATH)
+            migrated = _journal.migrate_json_dir(PENDING_DIR)
+            if migrated:
+                print(f"Moved {migrated} pending log file(s) into {JOURNAL_PATH}")
+            atexit.register(_journal.close)
+        return _journal
+
+def _commit_pending(payloads):
+    get_backend().commit_batch(payloads)
+
+def drain_pending_logs(should_stop=None, on_progress=None, max_rate=DRAIN_MAX_RATE):
+    """
+    Rate-limited upload of the logs saved while offline; returns how many were uploaded.
+    Stops early when the connection drops. If another drain is already running this returns 0
+    immediately. Upload errors propagate; everything sent before them stays acknowledged.
+    """
+    if not _drain_lock.acquire(blocking=False):
+        return 0
     try:
-        # Try to connect to a public DNS server
-        socket.create_connection(("8.8.8.8", 53), timeout=2)
-        return True
-    except Exception:
-        return False
-
-def upload_pending_logs():
-    """Upload all logs saved while offline."""
-    for fname in os.listdir(PENDING_DIR):
-        if fname.endswith('.json'):
-            fpath = os.path.join(PENDING_DIR, fname)
-            try:
-                with open(fpath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                _upload_to_firebase(data)
-                os.remove(fpath)
-            except Exception as e:
-                print(f"Failed to upload pending log {fname}: {e}")
+        drainer = PendingDrainer(get_journal(), _commit_pending, DRAIN_BATCH_SIZE, max_rate, is_online=is_connected)
+        return drainer.drain(should_stop, on_progress)
+    finally:
+        _drain_lock.release()
+
+def upload_pending_logs(max_rate=None):
+    """
+    Upload all logs saved while offline, in batched writes of at most `max_rate` events per
+    second (unlimited by default); returns how many were uploaded.
+    """
+    try:
+        uploaded = drain_pending_logs(max_rate=max_rate)
+    except Exception as e:
+        print(f"Failed to upload pending logs: {e}")
+        return 0
+    if uploaded:
+        print(f"Uploaded {uploaded} pending log(s) to Firebase")
+    return uploaded
+
+def start_pending_drain(max_rate=DRAIN_MAX_RATE):
+    """
+    Upload pending logs on a daemon thread, rate-limited like PendingSyncThread's drain so it does
+    not compete with playback; returns immediately.
+    """
+    thread = threading.Thread(target=upload_pending_logs, args=(max_rate,), name="PendingDrain", daemon=True)
+    thread.start()
+    return thread
 
 def _upload_to_firebase(data):
     collection_name = data["collection_name"]
     data_to_upload = data["data"]
-    db.collection(collection_name).add(data_to_upload)
+    get_backend().add(collection_name, data_to_upload)
     print(f"Uploaded to Firebase [{collection_name}]:", data_to_upload)
 
-def upload_viewer_log(blink_count, elapsed_time, real_time, movie_name, user_name=None):
+def viewer_collection_name(movie_name, user_name):
+    """Firestore collection for one viewer, movie and day: user_movie_yyyymmdd."""
     from datetime import datetime
-    import re
-    def clean_for_collection(name):
-        name = re.sub(r'[^a-zA-Z0-9]', '_', name)
-        name = re.sub(r'_+', '_', name)
-        return name.strip('_').lower()
+    from title_parser import slug
+    today = datetime.now().strftime('%Y%m%d')
+    movie_clean = slug(movie_name) if movie_name else 'unknownmovie'
+    user_clean = slug(user_name)
+    return f"{user_clean}_{movie_clean}_{today}"
+
+def build_viewer_log_payload(blink_count, elapsed_time, real_time, movie_name, user_name=None):
     if not user_name:
         user_name = 'unknownuser'
-    today = datetime.now().strftime('%Y%m%d')
-    movie_clean = clean_for_collection(movie_name) if movie_name else 'unknownmovie'
-    user_clean = clean_for_collection(user_name)
-    collection_name = f"{user_clean}_{movie_clean}_{today}"
+    collection_name = viewer_collection_name(movie_name, user_name)
     data = {
         'blink_count': blink_count,
         'elapsed_time': elapsed_time,
@@ -61,27 +179,75 @@ def upload_viewer_log(blink_count, elapsed_time, real_time, movie_name, user_nam
         'movie_name': movie_name,
         'user_name': user_name
     }
-    payload = {
+    return {
         "collection_name": collection_name,
         "data": data
     }
+
+def build_window_payload(summary, blink_count, real_time, movie_name, user_name=None):
+    """One document per telemetry window (see telemetry_aggregator) instead of one per blink."""
+    if not user_name:
+        user_name = 'unknownuser'
+    data = dict(summary)
+    data.update({
+        'blink_count': blink_count,
+        'real_time': real_time,
+        'movie_name': movie_name,
+        'user_name': user_name
+    })
+    return {
+        "collection_name": viewer_collection_name(movie_name, user_name),
+        "data": data
+    }
+
+def _save_offline(payload, reason="No internet"):
+    seq = get_journal().append(payload)
+    print(f"{reason}, saved offline: {payload['collection_name']} #{seq}")
+
+def _save_failed_batch(payloads):
+    get_journal().append_many(payloads)
+    print(f"Failed to upload, saved {len(payloads)} log(s) offline")
+
+def get_upload_worker():
+    """Return the shared background upload worker, starting it on first use."""
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            # The worker resolves the backend (and so the Firestore client) lazily, on its first flush
+            _worker = UploadWorker(
+                get_backend,
+                max_batch_size=UPLOAD_BATCH_SIZE,
+                max_latency=UPLOAD_MAX_LATENCY,
+                is_online=is_connected,
+                on_failure=_save_failed_batch,
+                # Never drain a backlog on the worker thread itself: live events would wait behind it.
+                # The drain is rate-limited and shares _drain_lock with PendingSyncThread's.
+                on_reconnect=start_pending_drain,
+            )
+            _worker.start()
+            atexit.register(_worker.stop)
+        return _worker
+
+def enqueue_viewer_log(blink_count, elapsed_time, real_time, movie_name, user_name=None):
+    """Queue a viewer log for batched background upload; returns immediately."""
+    payload = build_viewer_log_payload(blink_count, elapsed_time, real_time, movie_name, user_name)
+    get_upload_worker().enqueue(payload)
+
+def enqueue_window_summary(summary, blink_count, real_time, movie_name, user_name=None):
+    """Queue one aggregated telemetry window for batched background upload; returns immediately."""
+    payload = build_window_payload(summary, blink_count, real_time, movie_name, user_name)
+    get_upload_worker().enqueue(payload)
+
+def upload_viewer_log(blink_count, elapsed_time, real_time, movie_name, user_name=None):
+    payload = build_viewer_log_payload(blink_count, elapsed_time, real_time, movie_name, user_name)
     if is_connected():
-        # First upload any pending logs
-        upload_pending_logs()
-        # Then upload this log
+        # Pending logs are drained in the background, not in front of every live upload
         try:
             _upload_to_firebase(payload)
         except Exception as e:
-            # If upload fails, save locally
-            fname = f"offline_{collection_name}_{datetime.now().strftime('%H%M%S%f')}.json"
-            fpath = os.path.join(PENDING_DIR, fname)
-            with open(fpath, 'w', encoding='utf-8') as f:
-                json.dump(payload, f)
-            print(f"Failed to upload, saved offline: {fpath}")
+            # If upload fails, save locally and confirm the connection is still up
+            get_connectivity().recheck()
+            _save_offline(payload, "Failed to upload")
     else:
         # Save log locally for later upload
-        fname = f"offline_{collection_name}_{datetime.now().strftime('%H%M%S%f')}.json"
-        fpath = os.path.join(PENDING_DIR, fname)
-        with open(fpath, 'w', encoding='utf-8') as f:
-            json.dump(payload, f)
-        print(f"No internet, saved offline: {fpath}")
+        _save_offline(payload)
@@ -0,0 +1,153 @@
+"""
+Process-wide registry of the application's fonts.
+
+Font files under fonts/ are registered with QFontDatabase once per process, the first time a
+role needs them, and QFont / QFontMetrics objects are cached per role, so constructing widgets
+never touches the disk or the font database again:
+
+    label.setFont(font_registry.font('overlay'))
+    width = font_registry.metrics('branding').horizontalAdvance(text)
+
+`preload_async()` reads the font files on a background thread while the QApplication and the
+main window are being created; registration itself always happens on the calling (GUI) thread.
+"""
+import os
+import threading
+
+from PyQt6.QtGui import QFont, QFontDatabase, QFontMetrics
+
+FONTS_DIR = os.path.join(os.path.dirname(__file__), 'fonts')
+LEGACY_FONT = os.path.join(os.path.dirname(__file__), 'gotham-regular.ttf')
+MONOSPACE_FAMILIES = ['monospace', 'Gotham', 'GothamRegular', 'Arial', 'sans-serif']
+
+# role -> (font files to try in order, the first one that registers wins, or None for a plain
+# family; family when no file is used; point size, or -pixel size; weight; italic; letter spacing px)
+ROLES = {
+    'overlay': ([
+        'GothamBook.ttf', 'GothamMedium.ttf', 'Gotham-Regular.ttf', 'GothamBook.otf', 'GothamMedium.otf',
+        'Gotham-Book.otf', 'Gotham-Medium.otf', 'Gotham-Bold.otf', 'GothamBold.ttf', 'GothamLight.ttf', 'Gotham-Light.otf',
+        LEGACY_FONT,
+    ], 'Arial', 24, QFont.Weight.Normal, False, 0),
+    'blink_label': (['GothamBook.ttf'], 'Arial', 13, QFont.Weight.Normal, False, 0),
+    'branding': (['Gotham-UltraItalic.otf'], 'Arial', 13, QFont.Weight.Bold, True, 0),
+    'branding_sub': (None, 'Gotham', 11, QFont.Weight.Normal, False, 0),
+    'time': (None, MONOSPACE_FAMILIES, -16, QFont.Weight.Normal, False, 0.5),
+    'time_percent': (None, MONOSPACE_FAMILIES, -16, QFont.Weight.Bold, False, 0.5),
+}
+
+_lock = threading.RLock()
+_file_data = {}     # path -> bytes read ahead by preload_async, until registered
+_registered = {}    # path -> registered family names ([] if the file is missing or invalid)
+_fonts = {}
+_metrics = {}
+_preload_thread = None
+
+
+def _font_paths(role):
+    files = ROLES[role][0] or []
+    return [name if os.path.isabs(name) else os.path.join(FONTS_DIR, name) for name in files]
+
+
+def _read_files(roles):
+    for role in roles:
+        for path in _font_paths(role):
+            with _lock:
+                if path in _file_data or path in _registered:
+                    break
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                # Missing: try the role's next candidate
+                continue
+            with _lock:
+                _file_data.setdefault(path, data)
+            break
+
+
+def preload_async(roles=None):
+    """Read the font files of `roles` (default: all) on a background thread. Safe before QApplication."""
+    global _preload_thread
+    with _lock:
+        if _preload_thread is None:
+            _preload_thread = threading.Thread(target=_read_files, args=(list(roles or ROLES),), daemon=True,
+                                               name="FontPreload")
+            _preload_thread.start()
+    return _preload_thread
+
+
+def register_font_file(path):
+    """Register one font file with QFontDatabase (once per process); returns its family names."""
+    with _lock:
+        if path in _registered:
+            return _registered[path]
+    if _preload_thread is not None:
+        _preload_thread.join()
+    with _lock:
+        if path in _registered:
+            return _registered[path]
+        data = _file_data.pop(path, None)
+        if data is not None:
+            font_id = QFontDatabase.addApplicationFontFromData(data)
+        elif os.path.exists(path):
+            font_id = QFontDatabase.addApplicationFont(path)
+        else:
+            font_id = -1
+        families = QFontDatabase.applicationFontFamilies(font_id) if font_id != -1 else []
+        if os.path.exists(path) and not families:
+            print(f'[WARNING] Failed to load font {os.path.basename(path)}.')
+        _registered[path] = families
+        return families
+
+
+def _build_font(role):
+    paths, fallback, size, weight, italic, letter_spacing = ROLES[role]
+    family = None
+    for path in _font_paths(role):
+        families = register_font_file(path)
+        if families:
+            family = families[0]
+            break
+    if paths and family is None:
+        print(f'[WARNING] No font file found for {role!r}, falling back to {fallback}.')
+    font = QFont()
+    if family is not None:
+        font.setFamily(family)
+    elif isinstance(fallback, list):
+        font.setFamilies(fallback)
+    else:
+        font.setFamily(fallback)
+    if size < 0:
+        font.setPixelSize(-size)
+    else:
+        font.setPointSize(size)
+    font.setWeight(weight)
+    font.setItalic(italic)
+    if letter_spacing:
+        font.setLetterSpacing(QFont.SpacingType.AbsoluteSpacing, letter_spacing)
+    return font
+
+
+def font(role):
+    """A QFont for `role` (a key of ROLES). Built once; each call returns a copy safe to modify."""
+    with _lock:
+        cached = _fonts.get(role)
+        if cached is None:
+            cached = _fonts[role] = _build_font(role)
+    return QFont(cached)
+
+
+def metrics(role):
+    """Cached QFontMetrics for `role`."""
+    with _lock:
+        cached = _metrics.get(role)
+        if cached is None:
+            cached = _metrics[role] = QFontMetrics(font(role))
+    return cached
+
+
+def clear_cache():
+    """Forget cached fonts and metrics (registered font files stay registered)."""
+    with _lock:
+        _fonts.clear()
+        _metrics.clear()
@@ -0,0 +1,82 @@
+import time
+
+
+class FrameRateGovernor:
+    """
+    Paces a processing loop at a target frame rate instead of a fixed sleep.
+    Call `frame_start()` once the frame is in hand and `wait()` at the bottom of the iteration;
+    `wait()` only sleeps for whatever is left of the frame budget, measured from the end of the
+    previous `wait()`, so both capture waits and processing time count against it.
+
+    Once per `window` seconds the governor looks at the average processing time. If frames
+    use more than `saturation` of their budget the CPU is considered saturated and the
+    effective rate backs off by `backoff` (never below `min_fps`), leaving headroom for video
+    playback. When load drops it recovers by `recover_step` fps per window up to the target.
+    """
+    def __init__(self, target_fps=20.0, min_fps=5.0, backoff=0.8, recover_step=2.0,
+                 saturation=0.9, window=1.0, clock=time.monotonic, sleep=time.sleep):
+        self.target_fps = float(target_fps)
+        self.min_fps = min(float(min_fps), self.target_fps)
+        self.backoff = backoff
+        self.recover_step = recover_step
+        self.saturation = saturation
+        self.window = window
+        self.effective_fps = self.target_fps
+        self.achieved_fps = 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._start = None
+        self._last_tick = None
+        self._window_start = None
+        self._window_frames = 0
+        self._window_busy = 0.0
+        self.mean_busy = 0.0
+
+    def frame_start(self):
+        now = self._clock()
+        if self._window_start is None:
+            self._window_start = now
+        self._start = now
+
+    def wait(self):
+        """
+        Sleep out the rest of this frame's budget.
+        Returns True when a measurement window just closed (achieved/effective fps updated).
+        """
+        if self._start is None:
+            self.frame_start()
+        now = self._clock()
+        busy = now - self._start
+        self._window_frames += 1
+        self._window_busy += busy
+        budget = 1.0 / self.effective_fps
+        spent = now - (self._last_tick if self._last_tick is not None else self._start)
+        if spent < budget:
+            self._sleep(budget - spent)
+        self._start = None
+        self._last_tick = self._clock()
+        elapsed = self._last_tick - self._window_start
+        if elapsed < self.window:
+            return False
+        self._close_window(elapsed)
+        return True
+
+    def _close_window(self, elapsed):
+        self.achieved_fps = self._window_frames / elapsed
+        self.mean_busy = self._window_busy / self._window_frames
+        budget = 1.0 / self.effective_fps
+        if self.mean_busy > self.saturation * budget:
+            self.effective_fps = max(self.min_fps, self.effective_fps * self.backoff)
+        elif self.mean_busy < 0.5 * budget and self.effective_fps < self.target_fps:
+            self.effective_fps = min(self.target_fps, self.effective_fps + self.recover_step)
+        self._window_start = self._last_tick
+        self._window_frames = 0
+        self._window_busy = 0.0
+
+    def stats(self):
+        return {
+            'target_fps': self.target_fps,
+            'effective_fps': self.effective_fps,
+            'achieved_fps': self.achieved_fps,
+            'mean_busy': self.mean_busy,
+        }
@@ -0,0 +1,119 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+class FrameGrabber(threading.Thread):
+    """
+    Camera producer thread that keeps reading into a small ring of preallocated frame buffers,
+    so camera I/O overlaps with inference and the consumer always gets the newest frame
+    instead of whatever has been sitting in the driver queue.
+
+    `read()` mirrors `cv2.VideoCapture.read()` and returns (ret, frame). The frame is a view
+    into the ring and stays valid until the next `read()` call; copy it if you need it longer.
+    Frames that were captured but replaced before anyone read them count as dropped.
+    """
+    def __init__(self, cap, slots=3):
+        super().__init__(daemon=True, name="FrameGrabber")
+        # Need at least: one slot being read, one published, one being written
+        self.cap = cap
+        self.num_slots = max(3, slots)
+        self._slots = None
+        self._stamps = [0.0] * self.num_slots
+        self._latest = -1       # slot holding the newest published frame
+        self._reading = -1      # slot currently handed out to the consumer
+        self._seq = 0           # sequence number of the newest published frame
+        self._read_seq = 0      # sequence number last handed to the consumer
+        self._running = True
+        self._eof = False
+        self._cond = threading.Condition()
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.frames_read = 0
+        self._age_total = 0.0
+        self.last_age = 0.0
+        self.max_age = 0.0
+        # Ask the driver to keep as few stale frames as it can (not every backend honours this)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    def run(self):
+        while self._running and self.cap.isOpened():
+            with self._cond:
+                idx = self._free_slot()
+            buf = self._slots[idx] if self._slots is not None else None
+            ret, frame = self.cap.read(buf) if buf is not None else self.cap.read()
+            stamp = time.monotonic()
+            if not ret:
+                break
+            if self._slots is None or frame.shape != self._slots[0].shape:
+                # First frame (or a resolution change): (re)allocate the ring to match
+                with self._cond:
+                    self._slots = [np.empty_like(frame) for _ in range(self.num_slots)]
+                    self._latest = self._reading = -1
+                    idx = 0
+                buf = self._slots[idx]
+            if frame is not buf:
+                np.copyto(buf, frame)
+            with self._cond:
+                if self._seq > self._read_seq:
+                    self.frames_dropped += 1
+                self._stamps[idx] = stamp
+                self._latest = idx
+                self._seq += 1
+                self.frames_captured += 1
+                self._cond.notify_all()
+        with self._cond:
+            self._eof = True
+            self._cond.notify_all()
+
+    def _free_slot(self):
+        for idx in range(self.num_slots):
+            if idx != self._latest and idx != self._reading:
+                return idx
+        return 0
+
+    @property
+    def finished(self):
+        """True once the capture hit end of stream or `stop()` was called; no further frames will arrive."""
+        with self._cond:
+            return self._eof or not self._running
+
+    def read(self, timeout=2.0):
+        """
+        Block until a frame newer than the last one read is available; returns (ret, frame).
+        `timeout=None` waits until a frame arrives or the grabber finishes. On (False, None) check
+        `finished` to tell a slow camera from the end of the stream.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > self._read_seq or self._eof or not self._running, timeout):
+                return False, None
+            if self._seq <= self._read_seq:
+                return False, None
+            self._reading = self._latest
+            self._read_seq = self._seq
+            age = time.monotonic() - self._stamps[self._reading]
+            self.frames_read += 1
+            self._age_total += age
+            self.last_age = age
+            self.max_age = max(self.max_age, age)
+            return True, self._slots[self._reading]
+
+    def stats(self):
+        """Capture counters; ages are seconds between capture and hand-off to the consumer."""
+        with self._cond:
+            return {
+                'frames_captured': self.frames_captured,
+                'frames_read': self.frames_read,
+                'frames_dropped': self.frames_dropped,
+                'last_queue_age': self.last_age,
+                'mean_queue_age': self._age_total / self.frames_read if self.frames_read else 0.0,
+                'max_queue_age': self.max_age,
+            }
+
+    def stop(self, timeout=2.0):
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        self.join(timeout)
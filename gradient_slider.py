@@ -1,19 +1,35 @@
 from PyQt6.QtWidgets import QSlider
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal
-from PyQt6.QtGui import QPainter, QBrush, QPen, QLinearGradient, QColor, QPainterPath
+from PyQt6.QtCore import Qt, QTimer, QRect, QRectF, pyqtSignal
+from PyQt6.QtGui import QPainter, QBrush, QLinearGradient, QColor, QPainterPath, QPixmap, QTransform
 import math
 
+GROOVE_HEIGHT = 22  # Slightly taller for modern look
+GROOVE_MARGIN = 14
+GLOW_MARGIN = 3
+# Width of the pre-rendered gradient ramp; it is stretched over the progress bar when drawn
+GRADIENT_STRIP_WIDTH = 256
+
+
 class GradientSlider(QSlider):
+    """
+    Slider drawn as a pill groove with an animated gradient progress bar.
+
+    The gradient only animates while the slider is visible, not minimised and playing (see
+    `set_playing`) or buffering; `animated=False` (e.g. the volume slider) never starts the
+    timer. The groove and the gradient ramp are cached as pixmaps, rebuilt on resize and colour
+    changes, and value changes or animation ticks repaint only the part of the bar that changed.
+    """
     hoverPositionChanged = pyqtSignal(float)
 
-    def __init__(self, orientation=Qt.Orientation.Horizontal, parent=None):
+    def __init__(self, orientation=Qt.Orientation.Horizontal, parent=None, animated=True):
         super().__init__(orientation, parent)
         self.setObjectName("positionSlider")
         self.setMinimumHeight(24)
         self.gradient_shift = 0.0
+        self.animated = animated
         self.timer = QTimer(self)
+        self.timer.setInterval(40)  # ~25 FPS
         self.timer.timeout.connect(self.animate_gradient)
-        self.timer.start(40)  # ~25 FPS
         self._gradient_colors = [  # Default gradient (progress bar style)
             (0.0, '#4f8cff'),
             (0.5, '#8f5cff'),
@@ -22,27 +38,98 @@ class GradientSlider(QSlider):
         self._glow_color = QColor(79, 140, 255, 80)
         self._buffering = False
         self._buffer_anim_offset = 0
+        self._playing = False
+        self._groove_pixmap = None
+        self._gradient_strip = None
+        self._stripes_path = None
+        self._painted_progress = 0.0
 
     def set_buffering(self, buffering: bool):
         self._buffering = buffering
+        self._update_timer()
         self.update()
 
+    def set_playing(self, playing: bool):
+        """Run the gradient animation only while media is playing."""
+        self._playing = playing
+        self._update_timer()
+
     def set_gradient_colors(self, stops):
         """
         Set gradient stops: list of (position, color_str) tuples, e.g. [(0.0, '#4f8cff'), (1.0, '#8f5cff')]
         """
         self._gradient_colors = stops
+        self._gradient_strip = None
         self.update()
 
     def set_glow_color(self, color):
         self._glow_color = color
         self.update()
 
+    def _should_animate(self):
+        if not (self.animated and (self._playing or self._buffering)):
+            return False
+        return self.isVisible() and not self.window().isMinimized()
+
+    def _update_timer(self):
+        if self._should_animate():
+            if not self.timer.isActive():
+                self.timer.start()
+        elif self.timer.isActive():
+            self.timer.stop()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update_timer()
+
+    def hideEvent(self, event):
+        # Also delivered (spontaneously) when the window is minimised
+        super().hideEvent(event)
+        self._update_timer()
+
+    def resizeEvent(self, event):
+        self._groove_pixmap = None
+        self._stripes_path = None
+        super().resizeEvent(event)
+
     def animate_gradient(self):
+        if not self._should_animate():
+            self.timer.stop()
+            return
         self.gradient_shift = (self.gradient_shift + 0.0125) % 1.0
         if self._buffering:
             self._buffer_anim_offset = (self._buffer_anim_offset + 4) % 32
-        self.update()
+            self.update(self._groove_rect())
+        else:
+            self._update_progress_span(0.0, self._progress_width())
+
+    def sliderChange(self, change):
+        if change == QSlider.SliderChange.SliderValueChange:
+            # Only the stretch between the old and new end of the bar changes
+            old, new = self._painted_progress, self._progress_width()
+            self._update_progress_span(min(old, new), max(old, new))
+        else:
+            super().sliderChange(change)
+
+    def _groove_rect(self):
+        rect = self.rect()
+        groove_y = (rect.height() - GROOVE_HEIGHT) // 2
+        return rect.adjusted(GROOVE_MARGIN, groove_y, -GROOVE_MARGIN, -groove_y)
+
+    def _progress_width(self):
+        if self.maximum() > 0:
+            percent = float(self.value() - self.minimum()) / float(self.maximum() - self.minimum())
+        else:
+            percent = 0.0
+        return self._groove_rect().width() * percent
+
+    def _update_progress_span(self, start, end):
+        groove = self._groove_rect()
+        # The rounded end cap and glow reach a little past the changed span on both sides
+        pad = groove.height() / 2 + GLOW_MARGIN + 1
+        left = int(math.floor(groove.left() + start - pad))
+        right = int(math.ceil(groove.left() + end + pad))
+        self.update(QRect(left, groove.top() - GLOW_MARGIN - 1, right - left, groove.height() + 2 * GLOW_MARGIN + 2))
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
@@ -64,63 +151,87 @@ class GradientSlider(QSlider):
         self.hoverPositionChanged.emit(percent)
         super().mouseMoveEvent(event)
 
+    def _render_groove(self):
+        # Full-length, low-opacity pill behind the progress bar
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(max(1, round(self.width() * ratio)), max(1, round(self.height() * ratio)))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        painter.setPen(Qt.PenStyle.NoPen)
+        groove_rect = self._groove_rect()
+        pill_radius = min(groove_rect.width(), groove_rect.height()) / 2
+        painter.setBrush(QColor(79, 140, 255, int(255 * 0.13)))  # Low opacity blue
+        painter.drawRoundedRect(groove_rect, pill_radius, pill_radius)
+        painter.end()
+        return pixmap
+
+    def _render_gradient_strip(self):
+        # Ramp laid out as [first colour padding | gradient | last colour padding], one strip
+        # width each, so the animated shift is just a different window into the same pixmap
+        w = GRADIENT_STRIP_WIDTH
+        strip = QPixmap(3 * w, 1)
+        strip.fill(Qt.GlobalColor.transparent)
+        grad = QLinearGradient(w, 0, 2 * w, 0)
+        for stop, color in self._gradient_colors:
+            grad.setColorAt(stop, QColor(color))
+        painter = QPainter(strip)
+        painter.fillRect(strip.rect(), QBrush(grad))
+        painter.end()
+        return strip
+
+    def _render_stripes(self, groove_rect):
+        stripe_width = 18
+        stripe_spacing = 14
+        path = QPainterPath()
+        for x in range(int(groove_rect.left()) - 40, int(groove_rect.right()) + 40, stripe_width + stripe_spacing):
+            path.moveTo(x, groove_rect.top())
+            path.lineTo(x + stripe_width, groove_rect.top())
+            path.lineTo(x + stripe_width - groove_rect.height(), groove_rect.bottom())
+            path.lineTo(x - groove_rect.height(), groove_rect.bottom())
+            path.closeSubpath()
+        return path
+
     def paintEvent(self, event):
+        if self._groove_pixmap is None:
+            self._groove_pixmap = self._render_groove()
+        if self._gradient_strip is None:
+            self._gradient_strip = self._render_gradient_strip()
         painter = QPainter(self)
-        rect = self.rect()
-        groove_height = 22  # Slightly taller for modern look
-        groove_y = (rect.height() - groove_height) // 2
-        groove_rect = rect.adjusted(14, groove_y, -14, -groove_y)
-        # Draw a full-length, low-opacity groove (background)
+        painter.drawPixmap(0, 0, self._groove_pixmap)
+        groove_rect = self._groove_rect()
         painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
         painter.setPen(Qt.PenStyle.NoPen)
         pill_radius = min(groove_rect.width(), groove_rect.height()) / 2
-        groove_color = QColor(79, 140, 255, int(255 * 0.13))  # Low opacity blue
-        painter.setBrush(groove_color)
-        painter.drawRoundedRect(groove_rect, pill_radius, pill_radius)
         # Buffering animation overlay
-        if getattr(self, '_buffering', False):
-            stripe_width = 18
-            stripe_spacing = 14
-            offset = getattr(self, '_buffer_anim_offset', 0)
+        if self._buffering:
+            if self._stripes_path is None:
+                self._stripes_path = self._render_stripes(groove_rect)
             painter.save()
-            painter.setClipRect(groove_rect)
-            painter.setPen(Qt.PenStyle.NoPen)
-            for x in range(int(groove_rect.left()) - 40, int(groove_rect.right()) + 40, stripe_width + stripe_spacing):
-                path = QPainterPath()
-                path.moveTo(x + offset, groove_rect.top())
-                path.lineTo(x + offset + stripe_width, groove_rect.top())
-                path.lineTo(x + offset + stripe_width - groove_rect.height(), groove_rect.bottom())
-                path.lineTo(x + offset - groove_rect.height(), groove_rect.bottom())
-                path.closeSubpath()
-                painter.setBrush(QColor(255,255,255,55))
-                painter.drawPath(path)
+            painter.setClipRect(groove_rect, Qt.ClipOperation.IntersectClip)
+            painter.translate(self._buffer_anim_offset, 0)
+            painter.setBrush(QColor(255, 255, 255, 55))
+            painter.drawPath(self._stripes_path)
             painter.restore()
-        # Draw animated vibrant gradient progress
-        if self.maximum() > 0:
-            percent = float(self.value() - self.minimum()) / float(self.maximum() - self.minimum())
-        else:
-            percent = 0.0
-        # Use floating-point for smooth progress
-        progress_width = groove_rect.width() * percent
-        progress_rect = groove_rect.adjusted(0, 0, int(progress_width - groove_rect.width()), 0)
-        shift = self.gradient_shift
-        grad = QLinearGradient(
-            progress_rect.left() + progress_rect.width() * shift,
-            0,
-            progress_rect.right() + progress_rect.width() * shift,
-            0
-        )
-        # Use custom gradient stops
-        for stop, color in getattr(self, '_gradient_colors', [ (0.0, '#4f8cff'), (0.5, '#8f5cff'), (1.0, '#ff6ec4') ]):
-            grad.setColorAt(stop, QColor(color))
-        painter.setBrush(QBrush(grad))
+        # Draw animated vibrant gradient progress; floating-point width for smooth progress
+        progress_width = self._progress_width()
+        self._painted_progress = progress_width
+        progress_rect = QRectF(groove_rect.left(), groove_rect.top(), progress_width, groove_rect.height())
         # Soft glow effect
-        glow_rect = progress_rect.adjusted(-2, -3, 2, 3)
-        glow_color = getattr(self, '_glow_color', QColor(79, 140, 255, 80))
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(glow_color)
-        painter.drawRoundedRect(glow_rect, groove_height/2+2, groove_height/2+2)
-        # Draw the main progress bar on top
-        painter.setBrush(QBrush(grad))
-        painter.drawRoundedRect(progress_rect, pill_radius, pill_radius)
+        painter.setBrush(self._glow_color)
+        painter.drawRoundedRect(progress_rect.adjusted(-2, -GLOW_MARGIN, 2, GLOW_MARGIN),
+                                GROOVE_HEIGHT / 2 + 2, GROOVE_HEIGHT / 2 + 2)
+        if progress_width > 0:
+            # Map the strip window starting at (1 - shift) onto the progress bar
+            w = GRADIENT_STRIP_WIDTH
+            transform = QTransform()
+            transform.translate(progress_rect.left(), 0)
+            transform.scale(progress_width / w, 1)
+            transform.translate(-w * (1 - self.gradient_shift), 0)
+            brush = QBrush(self._gradient_strip)
+            brush.setTransform(transform)
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+            painter.setBrush(brush)
+            painter.drawRoundedRect(progress_rect, pill_radius, pill_radius)
         painter.end()
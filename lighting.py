@@ -0,0 +1,67 @@
+import cv2
+import numpy as np
+
+# equalize: legacy full-frame Y-plane histogram equalisation (default)
+# none:     colour conversion only
+# gamma:    LUT-based gamma curve, brightens dark webcams cheaply
+# clahe:    CLAHE on the luma of the eye region only
+LIGHTING_MODES = ('equalize', 'none', 'gamma', 'clahe')
+
+
+class LightingNormalizer:
+    """
+    Converts a BGR camera frame into the RGB image FaceMesh consumes, applying the selected
+    lighting correction on the way. Output buffers are allocated once per frame size and
+    reused, so the returned array is only valid until the next call.
+    """
+    def __init__(self, mode='equalize', gamma=0.7, clip_limit=2.0, tile_grid=(4, 4)):
+        if mode not in LIGHTING_MODES:
+            raise ValueError(f"Unknown lighting mode {mode!r}, expected one of {LIGHTING_MODES}")
+        self.mode = mode
+        self._buffers = {}
+        table = (np.linspace(0.0, 1.0, 256) ** gamma) * 255.0
+        self._gamma_lut = np.clip(table + 0.5, 0, 255).astype(np.uint8)
+        self._clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=tile_grid)
+
+    def _buffer(self, name, shape):
+        key = (name, shape)
+        buf = self._buffers.get(key)
+        if buf is None:
+            if len(self._buffers) > 8:
+                # Frame sizes changed a lot (e.g. ROI tracking): drop stale buffers
+                self._buffers.clear()
+            buf = self._buffers[key] = np.empty(shape, dtype=np.uint8)
+        return buf
+
+    def __call__(self, frame, eye_region=None):
+        """
+        Return the corrected RGB image for `frame`.
+        `eye_region` is an optional (x, y, w, h) box in `frame` pixels used by the 'clahe' mode;
+        without it the whole frame is corrected.
+        """
+        shape = frame.shape
+        rgb = self._buffer('rgb', shape)
+        if self.mode == 'equalize':
+            # BGR -> YUV -> equalise Y -> straight to RGB: two conversions instead of three
+            yuv = self._buffer('yuv', shape)
+            luma = self._buffer('y', shape[:2])
+            cv2.cvtColor(frame, cv2.COLOR_BGR2YUV, dst=yuv)
+            cv2.extractChannel(yuv, 0, dst=luma)
+            cv2.equalizeHist(luma, dst=luma)
+            cv2.insertChannel(luma, yuv, 0)
+            cv2.cvtColor(yuv, cv2.COLOR_YUV2RGB, dst=rgb)
+            return rgb
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+        if self.mode == 'gamma':
+            cv2.LUT(rgb, self._gamma_lut, dst=rgb)
+        elif self.mode == 'clahe':
+            if eye_region is not None:
+                x, y, w, h = eye_region
+                target = rgb[y:y + h, x:x + w]
+            else:
+                target = rgb
+            if target.size:
+                yuv = cv2.cvtColor(target, cv2.COLOR_RGB2YUV)
+                yuv[:, :, 0] = self._clahe.apply(np.ascontiguousarray(yuv[:, :, 0]))
+                target[...] = cv2.cvtColor(yuv, cv2.COLOR_YUV2RGB)
+        return rgb
@@ -1,18 +1,32 @@
 from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
 import sys
 from player_window import ModernVideoPlayer
-from firebase_upload import upload_pending_logs
+import font_registry
+
+def _start_background_uploads(app, player):
+    # Imported here so Firebase never sits on the path to the first window
+    from firebase_upload import warm_up_async, drain_pending_logs, wait_until_online
+    from pending_sync import PendingSyncThread
+    warm_up_async()
+    # Upload logs left over from offline sessions without blocking the UI
+    sync_thread = PendingSyncThread(drain_pending_logs, wait_online=wait_until_online, parent=player)
+    sync_thread.sync_progress.connect(player.windowControls.set_sync_status)
+    sync_thread.sync_finished.connect(lambda uploaded: player.windowControls.set_sync_status(uploaded, 0))
+    sync_thread.sync_failed.connect(lambda error: print(f"[WARNING] Could not upload pending logs: {error}"))
+    app.aboutToQuit.connect(sync_thread.stop)
+    sync_thread.start()
+    player.sync_thread = sync_thread
 
 def main():
-    # Try to upload any pending logs from offline sessions
-    try:
-        upload_pending_logs()
-    except Exception as e:
-        print(f"[WARNING] Could not upload pending logs: {e}")
+    # Read the font files while Qt starts up; widgets register them on first use
+    font_registry.preload_async()
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     player = ModernVideoPlayer()
     player.show()
+    # Create the Firestore client and start syncing once the event loop is running and the window is up
+    QTimer.singleShot(0, lambda: _start_background_uploads(app, player))
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -0,0 +1,191 @@
+"""
+Headless blink analysis for recorded webcam sessions.
+
+Runs the same landmark -> EAR -> blink pipeline as BlinkCounterThread over video files instead
+of the live camera. Long files are split into time chunks processed by a pool of worker
+processes, each with its own FaceMesh instance; the per-frame EAR traces are stitched back
+together before blink detection, so blinks straddling a chunk boundary are not lost.
+
+    python offline_analysis.py session.mp4 [--workers 4] [--chunk-seconds 120] [--out csv/offline/session.csv]
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+import multiprocessing
+
+import cv2
+import numpy as np
+
+from blink_detector import detect_blinks
+from blink_log_writer import BlinkLogWriter
+from eye_metrics import frame_ear
+
+
+class FaceMeshEarExtractor:
+    """Per-frame EAR using FaceMesh with ROI tracking and lighting correction, as in the live loop."""
+    def __init__(self, lighting_mode='equalize', roi_tracking=True):
+        import mediapipe as mp
+        from face_roi import FaceRoiTracker
+        from lighting import LightingNormalizer
+        self.face_mesh = mp.solutions.face_mesh.FaceMesh(
+            max_num_faces=1,
+            refine_landmarks=True,
+            min_detection_confidence=0.7,
+            min_tracking_confidence=0.7
+        )
+        self.tracker = FaceRoiTracker() if roi_tracking else None
+        self.normalizer = LightingNormalizer(lighting_mode)
+
+    def __call__(self, frame):
+        return frame_ear(self.face_mesh, frame, self.normalizer, self.tracker)
+
+    def close(self):
+        self.face_mesh.close()
+
+
+def video_info(path):
+    """(frame_count, fps) of a video file, as reported by the container (the count may be 0 or wrong)."""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video: {path}")
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    cap.release()
+    return frame_count, fps
+
+
+def plan_chunks(frame_count, fps, chunk_seconds):
+    """Split [0, frame_count) into (start, end) frame ranges of about `chunk_seconds` each."""
+    step = max(1, int(round(chunk_seconds * fps)))
+    return [(start, min(start + step, frame_count)) for start in range(0, frame_count, step)]
+
+
+def seek(cap, path, frame_idx):
+    """
+    Position `cap` so that the next read() returns frame `frame_idx`; False if the video is shorter.
+    Seeking in inter-coded video may land on an earlier keyframe (then the rest is decoded
+    forward) or past the target (then the file is reopened and decoded from the start).
+    """
+    pos = 0
+    if frame_idx and cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx):
+        pos = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+        if not 0 <= pos <= frame_idx:
+            cap.open(path)
+            pos = 0
+    for _ in range(frame_idx - pos):
+        if not cap.grab():
+            return False
+    return True
+
+
+def process_chunk(path, start, end, extractor_factory=FaceMeshEarExtractor):
+    """
+    EAR for frames [start, end) of `path` (`end=None`: up to the end of the video); NaN where no
+    face was found. The trace is cut short if the video ends early. Runs in a worker process.
+    """
+    # One OpenCV thread per worker: parallelism comes from the process pool
+    cv2.setNumThreads(1)
+    ears = []
+    cap = cv2.VideoCapture(path)
+    extractor = extractor_factory()
+    try:
+        if seek(cap, path, start):
+            while end is None or start + len(ears) < end:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                ear = extractor(frame)
+                ears.append(np.nan if ear is None else ear)
+    finally:
+        if hasattr(extractor, 'close'):
+            extractor.close()
+        cap.release()
+    return start, np.array(ears, dtype=np.float32)
+
+
+def extract_ears(path, workers=None, chunk_seconds=120, extractor_factory=FaceMeshEarExtractor):
+    """Per-frame EAR trace for a whole video, computed chunk-parallel. Returns (ears, fps)."""
+    frame_count, fps = video_info(path)
+    if frame_count <= 0:
+        # No usable frame count: the only safe plan is one sequential pass
+        return process_chunk(path, 0, None, extractor_factory)[1], fps
+    chunks = plan_chunks(frame_count, fps, chunk_seconds)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) == 1:
+        results = [process_chunk(path, start, end, extractor_factory) for start, end in chunks]
+    else:
+        # spawn: FaceMesh and OpenCV thread pools do not survive fork() reliably
+        ctx = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), mp_context=ctx) as pool:
+            futures = [pool.submit(process_chunk, path, start, end, extractor_factory) for start, end in chunks]
+            results = [f.result() for f in futures]
+    results.sort(key=lambda r: r[0])
+    if any(len(ears) < end - start for (start, end), (_, ears) in zip(chunks[:-1], results[:-1])):
+        # The video ended inside an earlier chunk: the frame count was too high, so the chunk
+        # offsets cannot be trusted either
+        return process_chunk(path, 0, None, extractor_factory)[1], fps
+    if len(results[-1][1]) == chunks[-1][1] - chunks[-1][0]:
+        # The count may also be too low: decode whatever follows the last planned frame
+        results.append(process_chunk(path, frame_count, None, extractor_factory))
+    ears = np.concatenate([r[1] for r in results])
+    return ears, fps
+
+
+def estimate_threshold(ears):
+    """Blink threshold from the trace itself, mirroring calibrate_ear's (closed + open) / 2.2."""
+    valid = ears[~np.isnan(ears)]
+    if not len(valid):
+        return 0.22
+    closed = np.percentile(valid, 3)
+    open_ = np.median(valid)
+    return float((closed + open_) / 2.2)
+
+
+def analyze_video(path, workers=None, chunk_seconds=120, threshold=None, extractor_factory=FaceMeshEarExtractor):
+    """
+    Full offline pipeline for one recording.
+    Returns a dict with the EAR trace, fps, threshold used and the frame indices of detected blinks.
+    """
+    ears, fps = extract_ears(path, workers, chunk_seconds, extractor_factory)
+    if threshold is None:
+        threshold = estimate_threshold(ears)
+    blink_frames = detect_blinks(ears, threshold)
+    return {'ears': ears, 'fps': fps, 'threshold': threshold, 'blink_frames': blink_frames}
+
+
+def write_blink_log(blink_frames, fps, out_path, start_time):
+    """Write blinks in the standard per-movie log format (real_time_12h, elapsed_hms, blink_count)."""
+    # Offline results are regenerated, not appended to a previous run
+    if os.path.exists(out_path):
+        os.remove(out_path)
+    with BlinkLogWriter(out_path, flush_every=1024) as writer:
+        for count, frame_idx in enumerate(blink_frames, start=1):
+            elapsed = frame_idx / fps
+            real_time_12h = (start_time + timedelta(seconds=elapsed)).strftime('%I:%M:%S %p')
+            writer.append([real_time_12h, str(timedelta(seconds=int(elapsed))), count])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline blink analysis for recorded webcam videos")
+    parser.add_argument('videos', nargs='+')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-seconds', type=float, default=120.0)
+    parser.add_argument('--threshold', type=float, default=None)
+    parser.add_argument('--out', default=None, help="output CSV (single video only); default csv/offline/<video name>.csv")
+    args = parser.parse_args()
+    if args.out and len(args.videos) > 1:
+        parser.error("--out can only be used with a single video")
+    for path in args.videos:
+        result = analyze_video(path, args.workers, args.chunk_seconds, args.threshold)
+        frame_count = len(result['ears'])
+        # Recording started one video-duration before the file was last written
+        start_time = datetime.fromtimestamp(os.path.getmtime(path)) - timedelta(seconds=frame_count / result['fps'])
+        out_path = args.out or os.path.join('csv', 'offline', os.path.splitext(os.path.basename(path))[0] + '.csv')
+        write_blink_log(result['blink_frames'], result['fps'], out_path, start_time)
+        print(f"{path}: {len(result['blink_frames'])} blinks over {frame_count} frames "
+              f"(threshold {result['threshold']:.3f}) -> {out_path}")
+
+
+if __name__ == '__main__':
+    main()
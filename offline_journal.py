@@ -0,0 +1,169 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+JOURNAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    collection_name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS offsets (
+    name TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL
+);
+"""
+
+
+class OfflineJournal:
+    """
+    Append-only SQLite journal (WAL mode) of viewer-log payloads waiting to be uploaded.
+
+    Events get increasing sequence numbers. Uploading is tracked by a durable acknowledgement
+    offset: everything at or below it has been committed remotely, everything above it is
+    pending. `replay(send_batch)` reads pending events in order, hands them to `send_batch`
+    in bulk and advances the offset after each successful batch, so an interrupted replay
+    resumes where it stopped (at most the batch in flight is sent twice). Acknowledged rows
+    are deleted in bulk by `compact()`, which replay also runs every `compact_every` events.
+
+    A single connection is shared behind a lock, so the journal can be written by the upload
+    worker and replayed from another thread.
+    """
+    def __init__(self, path, compact_every=10000):
+        self.path = path
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        # Must precede table creation; lets compact() hand freed pages back to the filesystem
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL survives application crashes; only an OS crash can lose the last commits
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(JOURNAL_SCHEMA)
+        self._conn.execute("INSERT OR IGNORE INTO offsets (name, seq) VALUES ('acked', 0)")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def append(self, payload):
+        """Journal one {"collection_name", "data"} payload; returns its sequence number."""
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO events (collection_name, data, created) VALUES (?, ?, ?)",
+                (payload["collection_name"], json.dumps(payload["data"]), time.time()))
+            return cur.lastrowid
+
+    def append_many(self, payloads):
+        """Journal several payloads in one transaction."""
+        now = time.time()
+        rows = [(p["collection_name"], json.dumps(p["data"]), now) for p in payloads]
+        with self._lock:
+            with self._transaction():
+                self._conn.executemany(
+                    "INSERT INTO events (collection_name, data, created) VALUES (?, ?, ?)", rows)
+        return len(rows)
+
+    @property
+    def acked(self):
+        with self._lock:
+            return self._acked()
+
+    def _acked(self):
+        return self._conn.execute("SELECT seq FROM offsets WHERE name = 'acked'").fetchone()[0]
+
+    def pending_count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM events WHERE seq > ?", (self._acked(),)).fetchone()[0]
+
+    def read_batch(self, limit=500):
+        """Oldest pending events as a list of (seq, payload), at most `limit` of them."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, collection_name, data FROM events WHERE seq > ? ORDER BY seq LIMIT ?",
+                (self._acked(), limit)).fetchall()
+        return [(seq, {"collection_name": name, "data": json.loads(data)}) for seq, name, data in rows]
+
+    def ack(self, seq):
+        """Mark every event up to and including `seq` as uploaded."""
+        with self._lock:
+            self._conn.execute("UPDATE offsets SET seq = MAX(seq, ?) WHERE name = 'acked'", (seq,))
+
+    def compact(self):
+        """Delete acknowledged events and shrink the file and WAL; returns the number of rows removed."""
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM events WHERE seq <= ?", (self._acked(),)).rowcount
+            # execute() steps the pragma once (one page); executescript runs it to completion
+            self._conn.executescript("PRAGMA incremental_vacuum;")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            return removed
+
+    def replay(self, send_batch, batch_size=500, max_events=None, compact=True):
+        """
+        Upload pending events in order with `send_batch(payloads)`, acknowledging each batch.
+        Stops at the first batch that raises (the exception propagates) or after `max_events`.
+        Returns the number of events acknowledged. With `compact=False` the caller compacts
+        (e.g. a drain that replays a batch at a time).
+        """
+        sent = 0
+        since_compact = 0
+        try:
+            while max_events is None or sent < max_events:
+                limit = batch_size if max_events is None else min(batch_size, max_events - sent)
+                batch = self.read_batch(limit)
+                if not batch:
+                    break
+                send_batch([payload for _, payload in batch])
+                self.ack(batch[-1][0])
+                sent += len(batch)
+                since_compact += len(batch)
+                if compact and since_compact >= self.compact_every:
+                    self.compact()
+                    since_compact = 0
+        finally:
+            if compact and since_compact:
+                self.compact()
+        return sent
+
+    def migrate_json_dir(self, directory, prefix='offline_'):
+        """Move legacy one-file-per-event pending uploads into the journal; returns how many."""
+        payloads, paths = [], []
+        for fname in sorted(os.listdir(directory)):
+            if not (fname.startswith(prefix) and fname.endswith('.json')):
+                continue
+            fpath = os.path.join(directory, fname)
+            try:
+                with open(fpath, 'r', encoding='utf-8') as f:
+                    payloads.append(json.load(f))
+                paths.append(fpath)
+            except Exception as e:
+                print(f"Skipping unreadable pending log {fname}: {e}")
+        if payloads:
+            self.append_many(payloads)
+            # Only delete once the journal transaction has committed
+            for fpath in paths:
+                os.remove(fpath)
+        return len(payloads)
+
+    def _transaction(self):
+        return _Transaction(self._conn)
+
+
+class _Transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN")
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
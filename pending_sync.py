@@ -0,0 +1,106 @@
+import time
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class PendingDrainer:
+    """
+    Rate-limited replay of an OfflineJournal.
+
+    Pending events are sent `batch_size` at a time through `send_batch(payloads)`, with no more
+    than `max_rate` events per second so a large backlog does not saturate the connection
+    while a movie is playing. Each batch is acknowledged in the journal as soon as it is
+    committed, so a drain interrupted by a crash, a stop request or a lost connection resumes
+    from the last acknowledged event next time. Acknowledged events are compacted every
+    `journal.compact_every` events and once when the drain ends, not after every batch.
+    """
+    def __init__(self, journal, send_batch, batch_size=100, max_rate=200.0, is_online=None,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.journal = journal
+        self.send_batch = send_batch
+        self.batch_size = batch_size
+        self.max_rate = max_rate
+        self.is_online = is_online
+        self.clock = clock
+        self.sleep = sleep
+
+    def drain(self, should_stop=None, on_progress=None):
+        """
+        Upload until the journal is empty, the connection drops or `should_stop()` is true.
+        `on_progress(uploaded, remaining)` is called after every batch. Returns the number uploaded.
+        Exceptions from `send_batch` propagate; everything acknowledged before them stays acknowledged.
+        """
+        journal = self.journal
+        uploaded = 0
+        since_compact = 0
+        remaining = journal.pending_count()
+        try:
+            while remaining:
+                if should_stop and should_stop():
+                    break
+                if self.is_online and not self.is_online():
+                    break
+                start = self.clock()
+                sent = journal.replay(self.send_batch, batch_size=self.batch_size, max_events=self.batch_size,
+                                      compact=False)
+                if not sent:
+                    break
+                uploaded += sent
+                since_compact += sent
+                if since_compact >= journal.compact_every:
+                    journal.compact()
+                    since_compact = 0
+                remaining = journal.pending_count()
+                if on_progress:
+                    on_progress(uploaded, remaining)
+                if self.max_rate and remaining:
+                    pause = sent / self.max_rate - (self.clock() - start)
+                    if pause > 0:
+                        self.sleep(pause)
+        finally:
+            if since_compact:
+                journal.compact()
+        return uploaded
+
+
+class PendingSyncThread(QThread):
+    """
+    Drains pending offline uploads in the background for the lifetime of the player and
+    reports progress to the UI. `drain(should_stop, on_progress)` is any callable with
+    PendingDrainer.drain's signature, e.g. firebase_upload.drain_pending_logs.
+    `wait_online(timeout)` blocks until the connection is up (or the timeout passes); after
+    each drain the journal is checked again every `poll_interval` seconds.
+    """
+    sync_progress = pyqtSignal(int, int)  # uploaded so far, still pending
+    sync_finished = pyqtSignal(int)       # uploaded by the last drain
+    sync_failed = pyqtSignal(str)
+
+    def __init__(self, drain, wait_online=None, poll_interval=5.0, parent=None):
+        super().__init__(parent)
+        self._drain = drain
+        self._wait_online = wait_online
+        self.poll_interval = poll_interval
+        self._running = True
+
+    def stop(self):
+        self._running = False
+        self.wait(5000)
+
+    def _idle(self, seconds):
+        # Sleep in small steps so stop() is honoured quickly
+        deadline = time.monotonic() + seconds
+        while self._running and time.monotonic() < deadline:
+            self.msleep(100)
+
+    def run(self):
+        while self._running:
+            if self._wait_online and not self._wait_online(1.0):
+                continue
+            try:
+                uploaded = self._drain(should_stop=lambda: not self._running, on_progress=self.sync_progress.emit)
+            except Exception as e:
+                self.sync_failed.emit(str(e))
+            else:
+                if uploaded:
+                    self.sync_finished.emit(uploaded)
+            self._idle(self.poll_interval)
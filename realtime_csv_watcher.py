@@ -1,9 +1,10 @@
 import os
 import time
-import csv
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from dotenv import load_dotenv
+from csv_tailer import CsvTailer
+from row_forwarder import RowForwarder
 
 # Load environment variables
 load_dotenv()
@@ -11,47 +12,61 @@ load_dotenv()
 CSV_PATH = os.path.join("csv", "realtime", "realtime_log.csv")  # Change this to your real-time CSV filename
 MOVIE_NAME = "Your Movie Name"  # Optionally set dynamically
 TABLE_NAME = "viewer_logs"  # Update if your table name is different
+# Filesystem events closer together than this are coalesced into one read (seconds)
+DEBOUNCE_SECONDS = float(os.getenv("WATCHER_DEBOUNCE_SECONDS", "0.25"))
+# Forward at least this often while the file keeps changing (seconds)
+MAX_FORWARD_DELAY = float(os.getenv("WATCHER_MAX_DELAY_SECONDS", "1.0"))
+# How often the watcher prints its throughput and lag metrics (seconds, 0 = never)
+METRICS_INTERVAL = float(os.getenv("WATCHER_METRICS_INTERVAL", "30"))
 
-last_line = 0
+# Reads only the bytes appended since the previous event, and follows truncation/rotation
+tailer = CsvTailer(CSV_PATH)
 
 def get_new_rows():
-    global last_line
-    with open(CSV_PATH, newline='', encoding='utf-8') as f:
-        reader = list(csv.DictReader(f))
-        new_rows = reader[last_line:]
-        last_line = len(reader)
-        return new_rows
+    return tailer.read_new_rows()
+
+def forward_rows(rows):
+    """Hand a batch of new rows to the batched background uploader."""
+    from firebase_upload import enqueue_viewer_log
+    for row in rows:
+        try:
+            enqueue_viewer_log(int(row["blink_count"]), row["elapsed_time"], row["real_time"], MOVIE_NAME)
+        except Exception as e:
+            print("Error:", e)
+
+forwarder = RowForwarder(get_new_rows, forward_rows, debounce=DEBOUNCE_SECONDS,
+                         max_delay=MAX_FORWARD_DELAY, lag_bytes=tailer.lag_bytes)
 
 class CSVHandler(FileSystemEventHandler):
     def on_modified(self, event):
+        # Runs on the watchdog thread: only record the event, the forwarder does the work
         if event.src_path.endswith(".csv"):
-            new_rows = get_new_rows()
-            for row in new_rows:
-                data = {
-                    "blink_count": int(row["blink_count"]),
-                    "elapsed_time": row["elapsed_time"],
-                    "real_time": row["real_time"],
-                    "movie_name": MOVIE_NAME
-                }
-                try:
-                    from firebase_upload import upload_viewer_log
-                    upload_viewer_log(data["blink_count"], data["elapsed_time"], data["real_time"], data["movie_name"])
-                except Exception as e:
-                    print("Error:", e)
+            forwarder.notify()
+
+    def on_created(self, event):
+        # A rotated log is recreated: its first rows may land before any modify event
+        self.on_modified(event)
 
 if __name__ == "__main__":
-    # Initialize last_line to skip existing rows
-    if os.path.exists(CSV_PATH):
-        with open(CSV_PATH, newline='', encoding='utf-8') as f:
-            last_line = sum(1 for _ in f) - 1  # -1 for header
+    # Skip rows that were already in the file before we started watching
+    tailer.seek_to_end()
     event_handler = CSVHandler()
     observer = Observer()
     observer.schedule(event_handler, path=os.path.dirname(CSV_PATH), recursive=False)
+    forwarder.start()
     observer.start()
     print(f"Watching {CSV_PATH} for real-time updates...")
+    last_report = time.monotonic()
     try:
         while True:
             time.sleep(1)
+            if METRICS_INTERVAL and time.monotonic() - last_report >= METRICS_INTERVAL:
+                last_report = time.monotonic()
+                stats = forwarder.stats()
+                print(f"[watcher] {stats['events_per_second']:.1f} events/s, {stats['rows_per_second']:.1f} rows/s, "
+                      f"{stats['events_coalesced']} events coalesced, lag {stats['lag_bytes']} bytes / "
+                      f"{stats['lag_seconds']:.2f}s (last batch {stats['last_batch_lag_seconds']:.2f}s)")
     except KeyboardInterrupt:
         observer.stop()
     observer.join()
+    forwarder.stop()
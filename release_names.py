@@ -0,0 +1,40 @@
+"""
+Sample release file names, shared by the title parser tests and bench_title_parser.py.
+"""
+import random
+
+# File names covering the extraction edge cases
+SAMPLE_FILE_NAMES = [
+    'Pravinkoodu.Shappu.2025.DS4K.1080p.SONYLIV.WEBRip.DD.mkv',
+    'The.Godfather.Part.II.1974.1080p.BluRay.x264.YIFY.mp4',
+    'Inception_2010_720p_WEB-DL.mkv',
+    'Friends.S05E14.The.One.Where.Everybody.Finds.Out.720p.HDTV.x264.mkv',
+    '12.Angry.Men.1957.1080p.BluRay.x265.HEVC.AAC-SARTRE.mkv',
+    'Chernobyl.S01E05.Vichnaya.Pamyat.2019.1080p.WEBRip.HEVC.x265.mkv',
+    'Movie.without.tags.mkv',
+    'S01E01.mkv',
+    'pr.mkv',
+    'Avatar.2009.2160p.UHD.BluRay.x265.mkv',
+    'Some.Movie.2022.mp4',
+    'Old_Movie.1939.avi',
+    'Show.Name.S2E3.720p.mkv',
+    'Edge_Case_OnlyYear.2020.mkv',
+    'Strange-File-Name-__.mkv',
+]
+
+TITLE_WORDS = ['the', 'dark', 'river', 'of', 'night', 'angry', 'men', 'blue', 'city', 'last', 'train', 'o\'brien', 'amélie']
+TAGS = ['1080p', '720p', '2160p', 'BluRay', 'WEBRip', 'x264', 'x265', 'HEVC', 'AAC', 'HDTV', 'YIFY', 'WEB-DL', 'NETFLIX']
+EXTENSIONS = ['mkv', 'mp4', 'avi', 'mov']
+
+
+def random_release_names(n, seed=0):
+    """(file name, title words, year, episode) in the usual release naming styles."""
+    rng = random.Random(seed)
+    for _ in range(n):
+        words = [rng.choice(TITLE_WORDS) for _ in range(rng.randint(2, 4))]
+        year = rng.choice([None, rng.randint(1920, 2029)])
+        episode = f"S{rng.randint(1, 12):02d}E{rng.randint(1, 24):02d}" if rng.random() < 0.3 else None
+        sep = rng.choice(['.', '_', ' '])
+        parts = words + ([episode] if episode else []) + ([str(year)] if year else [])
+        parts += rng.sample(TAGS, rng.randint(1, 4))
+        yield sep.join(parts) + '.' + rng.choice(EXTENSIONS), words, year, episode
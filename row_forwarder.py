@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import deque
+
+
+class RowForwarder(threading.Thread):
+    """
+    Coalesces file-change notifications and forwards new rows in batches, off the caller's thread.
+
+    `notify()` is all the filesystem observer thread does per event: it records the event and
+    returns. This thread waits until no further event has arrived for `debounce` seconds (or the
+    first pending event is `max_delay` seconds old, so a steady stream of writes cannot postpone
+    forwarding forever), then calls `read_rows()` once and hands everything it returned to
+    `forward_batch(rows)`.
+
+    `stats()` reports filesystem events and rows processed per second over the last
+    `rate_window` seconds, how many events were coalesced, and the lag behind the file head:
+    `lag_bytes()` (if given) for unread bytes and the age of the oldest event still pending.
+    """
+    def __init__(self, read_rows, forward_batch, debounce=0.25, max_delay=1.0, lag_bytes=None,
+                 rate_window=10.0, clock=time.monotonic):
+        super().__init__(daemon=True, name="RowForwarder")
+        self.read_rows = read_rows
+        self.forward_batch = forward_batch
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.lag_bytes = lag_bytes
+        self.rate_window = rate_window
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._first_pending = None
+        self._last_event = None
+        self._stopped = False
+        self._events = 0
+        self._rows = 0
+        self._batches = 0
+        self._errors = 0
+        self._last_lag = 0.0
+        self._recent_events = deque()
+        self._recent_rows = deque()
+
+    def notify(self):
+        """Record one filesystem event. Cheap and non-blocking; safe from any thread."""
+        now = self.clock()
+        with self._cond:
+            self._events += 1
+            self._recent_events.append((now, 1))
+            if self._first_pending is None:
+                self._first_pending = now
+            self._last_event = now
+            self._cond.notify()
+
+    def stop(self, timeout=5.0):
+        """Forward whatever is pending and stop the thread."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self.join(timeout)
+
+    def _prune(self, recent, now):
+        while recent and recent[0][0] < now - self.rate_window:
+            recent.popleft()
+        return sum(n for _, n in recent) / self.rate_window
+
+    def stats(self):
+        now = self.clock()
+        with self._cond:
+            pending_age = now - self._first_pending if self._first_pending is not None else 0.0
+            return {
+                'events': self._events,
+                'rows_forwarded': self._rows,
+                'batches': self._batches,
+                'errors': self._errors,
+                'events_coalesced': self._events - self._batches,
+                'events_per_second': self._prune(self._recent_events, now),
+                'rows_per_second': self._prune(self._recent_rows, now),
+                'lag_seconds': pending_age,
+                'last_batch_lag_seconds': self._last_lag,
+                'lag_bytes': self.lag_bytes() if self.lag_bytes else None,
+            }
+
+    def _wait_for_quiet(self):
+        """Block until a batch is due; returns False once stopped with nothing pending."""
+        with self._cond:
+            while True:
+                if self._first_pending is not None:
+                    now = self.clock()
+                    due = min(self._last_event + self.debounce, self._first_pending + self.max_delay)
+                    if self._stopped or now >= due:
+                        return True
+                    self._cond.wait(due - now)
+                elif self._stopped:
+                    return False
+                else:
+                    self._cond.wait()
+
+    def run(self):
+        while self._wait_for_quiet():
+            with self._cond:
+                first = self._first_pending
+                self._first_pending = None
+            try:
+                rows = self.read_rows()
+                if rows:
+                    self.forward_batch(rows)
+            except Exception as e:
+                with self._cond:
+                    self._errors += 1
+                print(f"[WARNING] Forwarding rows failed: {e}")
+                continue
+            now = self.clock()
+            with self._cond:
+                self._batches += 1
+                self._rows += len(rows)
+                self._recent_rows.append((now, len(rows)))
+                self._last_lag = now - first
@@ -0,0 +1,350 @@
+"""
+Columnar binary store for viewing sessions.
+
+A session is a directory holding one .npy file per column plus a meta.json header:
+
+    t_ms               int64    epoch milliseconds of the sample
+    media_position_ms  int64    playback position, -1 when unknown
+    ear                float32  eye aspect ratio, NaN when no face was found / not recorded
+    blink              bool     True on the sample that completed a blink
+
+Columns are written as the session is recorded (see SessionWriter) and loaded as memory-mapped
+arrays, so opening a full-length session costs a few page-table entries instead of parsing text. Existing CSV logs can be converted:
+
+    python session_store.py csv/*.csv csv/events/*.csv csv/realtime/realtime_log.csv [--out csv/sessions]
+"""
+import argparse
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+SESSIONS_DIR = os.path.join('csv', 'sessions')
+SESSION_FORMAT_VERSION = 1
+SESSION_FIELDS = {
+    't_ms': np.int64,
+    'media_position_ms': np.int64,
+    'ear': np.float32,
+    'blink': np.bool_,
+}
+META_FILE = 'meta.json'
+# Header of csv/realtime/realtime_log.csv, written by BlinkCounterThread
+REALTIME_LOG_HEADER = ['real_time', 'elapsed_time', 'blink_count', 'movie_name']
+# Every column file starts with a fixed-size .npy header, so the row count in it can be
+# rewritten in place each time the column grows
+NPY_HEADER_SIZE = 128
+# meta.json keys maintained by the writer; everything else is caller-supplied metadata
+_HEADER_KEYS = ('format_version', 'rows', 'blinks', 'start_ms', 'end_ms', 'segments', 'fields')
+
+
+class Session:
+    """A loaded session: `meta` (dict) plus one array attribute per field in SESSION_FIELDS."""
+    def __init__(self, path, meta, arrays):
+        self.path = path
+        self.meta = meta
+        for name, array in arrays.items():
+            setattr(self, name, array)
+
+    def __len__(self):
+        return self.meta['rows']
+
+    def blink_times(self):
+        """Epoch-ms timestamps of the blinks."""
+        return self.t_ms[self.blink]
+
+
+def _npy_header(dtype, rows):
+    text = repr({'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)), 'fortran_order': False, 'shape': (rows,)})
+    text = text.ljust(NPY_HEADER_SIZE - 11) + '\n'
+    return np.lib.format.magic(1, 0) + len(text).to_bytes(2, 'little') + text.encode('latin1')
+
+
+def _read_meta(path):
+    with open(os.path.join(path, META_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class SessionWriter:
+    """
+    Records a session sample by sample. Samples are buffered in a fixed-size NumPy chunk; each
+    full chunk is appended to the column files and meta.json is refreshed, so memory use stays
+    flat however long the session runs and a crash loses at most the last chunk.
+
+    Opening a writer on a directory that already holds a session continues it (e.g. when
+    playback resumes after a pause): rows are appended, and the row at which each writer started
+    is listed in meta['segments']. `append=False` starts over instead.
+    """
+    def __init__(self, path, chunk_size=4096, append=True, **meta):
+        self.path = path
+        self.chunk_size = chunk_size
+        os.makedirs(path, exist_ok=True)
+        previous = _read_meta(path) if append and os.path.exists(os.path.join(path, META_FILE)) else {}
+        self.rows = previous.get('rows', 0)
+        self.blinks = previous.get('blinks', 0)
+        self.start_ms = previous.get('start_ms')
+        self.end_ms = previous.get('end_ms')
+        self.segments = previous.get('segments', [0] if self.rows else []) + [self.rows]
+        self.meta = {key: value for key, value in previous.items() if key not in _HEADER_KEYS}
+        self.meta.update(meta)
+        self._files = {name: self._open_column(name, dtype) for name, dtype in SESSION_FIELDS.items()}
+        self._new_chunk()
+        self.closed = False
+
+    def _open_column(self, name, dtype):
+        column_path = os.path.join(self.path, f'{name}.npy')
+        existing = None
+        if self.rows:
+            with open(column_path, 'rb') as f:
+                if np.lib.format.read_magic(f) == (1, 0):
+                    np.lib.format.read_array_header_1_0(f)
+                else:
+                    np.lib.format.read_array_header_2_0(f)
+                if f.tell() != NPY_HEADER_SIZE:
+                    # Written by np.save (e.g. write_session before incremental writes): re-lay it out
+                    existing = np.load(column_path)[:self.rows]
+        if not self.rows or existing is not None:
+            f = open(column_path, 'w+b')
+            f.write(_npy_header(dtype, self.rows))
+            if existing is not None:
+                f.write(np.ascontiguousarray(existing, dtype).tobytes())
+            return f
+        f = open(column_path, 'r+b')
+        # Drop anything appended after the last meta.json update (a crash mid-chunk)
+        f.truncate(NPY_HEADER_SIZE + self.rows * np.dtype(dtype).itemsize)
+        f.seek(0, os.SEEK_END)
+        return f
+
+    def _new_chunk(self):
+        self._chunk = {name: np.empty(self.chunk_size, dtype) for name, dtype in SESSION_FIELDS.items()}
+        self._fill = 0
+
+    def append(self, t_ms, media_position_ms=None, ear=None, blink=False):
+        i = self._fill
+        chunk = self._chunk
+        chunk['t_ms'][i] = t_ms
+        chunk['media_position_ms'][i] = -1 if media_position_ms is None else media_position_ms
+        chunk['ear'][i] = np.nan if ear is None else ear
+        chunk['blink'][i] = blink
+        self._fill = i + 1
+        if self._fill == self.chunk_size:
+            self._write(chunk)
+            self._fill = 0
+
+    def extend(self, t_ms, media_position_ms, ear, blink):
+        """Append whole columns at once (used by the CSV converters)."""
+        columns = {
+            't_ms': np.asarray(t_ms, np.int64),
+            'media_position_ms': np.asarray(media_position_ms, np.int64),
+            'ear': np.asarray(ear, np.float32),
+            'blink': np.asarray(blink, np.bool_),
+        }
+        rows = len(columns['t_ms'])
+        for name, column in columns.items():
+            if len(column) != rows:
+                raise ValueError(f"Column {name!r} has {len(column)} rows, expected {rows}")
+        self._write(self._trimmed())
+        self._fill = 0
+        self._write(columns)
+
+    def _trimmed(self):
+        return {name: column[:self._fill] for name, column in self._chunk.items()}
+
+    def _write(self, columns):
+        """Append `columns` to the column files, then record the new row count."""
+        rows = len(columns['t_ms'])
+        if not rows:
+            return
+        for name, f in self._files.items():
+            f.write(np.ascontiguousarray(columns[name]).tobytes())
+        if self.start_ms is None:
+            self.start_ms = int(columns['t_ms'][0])
+        self.end_ms = int(columns['t_ms'][-1])
+        self.blinks += int(np.count_nonzero(columns['blink']))
+        self.rows += rows
+        for name, f in self._files.items():
+            f.seek(0)
+            f.write(_npy_header(SESSION_FIELDS[name], self.rows))
+            f.seek(0, os.SEEK_END)
+            f.flush()
+        self._write_meta()
+
+    def _write_meta(self):
+        header = {
+            'format_version': SESSION_FORMAT_VERSION,
+            'rows': self.rows,
+            'blinks': self.blinks,
+            'start_ms': self.start_ms,
+            'end_ms': self.end_ms,
+            'segments': self.segments,
+            'fields': {name: np.dtype(dtype).str for name, dtype in SESSION_FIELDS.items()},
+        }
+        header.update(self.meta)
+        # Written after the column data and atomically: its row count marks what is complete
+        tmp_path = os.path.join(self.path, META_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(header, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.path, META_FILE))
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._write(self._trimmed())
+        self._fill = 0
+        # Metadata set after the last chunk (e.g. the final threshold) still has to be saved
+        self._write_meta()
+        for f in self._files.values():
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def write_session(path, arrays, **meta):
+    """Write a session directory from full columns, replacing any session there; extra keyword arguments go into meta.json."""
+    with SessionWriter(path, append=False, **meta) as writer:
+        writer.extend(*(arrays[name] for name in SESSION_FIELDS))
+
+
+def _read_column(path, dtype, rows):
+    # meta.json already gives dtype and length, so skip np.load's header parsing and read the
+    # data straight after the .npy preamble; much faster when loading thousands of small sessions
+    with open(path, 'rb') as f:
+        preamble = f.read(12)
+        if preamble[6] == 1:
+            offset = 10 + int.from_bytes(preamble[8:10], 'little')
+        else:
+            offset = 12 + int.from_bytes(preamble[8:12], 'little')
+        f.seek(offset)
+        return np.fromfile(f, dtype=dtype, count=rows)
+
+
+def load_session(path, mmap=True, fields=None):
+    """
+    Open a session directory. Columns are read-only memory maps unless `mmap` is False, in which
+    case they are read into memory directly. `fields` limits which columns are loaded. Only the
+    rows recorded in meta.json are returned, so a session still being written (or cut short by a
+    crash) loads up to its last completed chunk.
+    """
+    meta = _read_meta(path)
+    if meta.get('format_version', 0) > SESSION_FORMAT_VERSION:
+        raise ValueError(f"{path}: session format {meta['format_version']} is newer than supported")
+    rows = meta['rows']
+    arrays = {}
+    for name in fields or SESSION_FIELDS:
+        column_path = os.path.join(path, f'{name}.npy')
+        if mmap:
+            arrays[name] = np.load(column_path, mmap_mode='r')[:rows]
+        else:
+            arrays[name] = _read_column(column_path, np.dtype(meta['fields'][name]), rows)
+    return Session(path, meta, arrays)
+
+
+def list_sessions(root=SESSIONS_DIR):
+    """Paths of the complete sessions under `root`, sorted by name."""
+    if not os.path.isdir(root):
+        return []
+    return sorted(os.path.join(root, name) for name in os.listdir(root)
+                  if os.path.exists(os.path.join(root, name, META_FILE)))
+
+
+def _epoch_ms(dt):
+    return int(dt.timestamp() * 1000)
+
+
+def convert_blink_log(csv_path, out_path, date=None):
+    """
+    Convert a per-movie blink log (real_time_12h, elapsed_hms, blink_count) into a session.
+    The log has no date, so `date` (default: the file's modification date) is combined with the
+    12-hour times; rows are per second, so several blinks in a second share a timestamp.
+    """
+    from blink_log_writer import read_blink_log
+    _, rows = read_blink_log(csv_path)
+    if date is None:
+        date = datetime.fromtimestamp(os.path.getmtime(csv_path)).date()
+    t_ms, previous = [], 0
+    for row in rows:
+        count = int(row[2])
+        stamp = _epoch_ms(datetime.combine(date, datetime.strptime(row[0], '%I:%M:%S %p').time()))
+        t_ms.extend([stamp] * max(0, count - previous))
+        previous = count
+    n = len(t_ms)
+    write_session(out_path, {'t_ms': t_ms, 'media_position_ms': np.full(n, -1), 'ear': np.full(n, np.nan),
+                             'blink': np.ones(n, bool)},
+                  source=os.path.basename(csv_path), movie_name=os.path.splitext(os.path.basename(csv_path))[0])
+    return out_path
+
+
+def convert_event_log(csv_path, out_path):
+    """Convert a raw event log (csv/events/<movie>.csv, see telemetry_aggregator) into a session."""
+    import csv
+    t_ms, media, ear = [], [], []
+    with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            t_ms.append(_epoch_ms(datetime.strptime(row['real_time'], '%Y-%m-%d %H:%M:%S.%f')))
+            media.append(int(row['media_position_ms']) if row['media_position_ms'] else -1)
+            ear.append(float(row['ear']) if row['ear'] else np.nan)
+    write_session(out_path, {'t_ms': t_ms, 'media_position_ms': media, 'ear': ear, 'blink': np.ones(len(t_ms), bool)},
+                  source=os.path.basename(csv_path), movie_name=os.path.splitext(os.path.basename(csv_path))[0])
+    return out_path
+
+
+def convert_realtime_log(csv_path, out_path):
+    """
+    Convert the shared realtime log (real_time, elapsed_time, blink_count, movie_name) into a
+    session. The count restarts with every detection run, so a count that does not go up starts over.
+    """
+    import csv
+    t_ms, movies, previous = [], set(), 0
+    with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            count = int(row['blink_count'])
+            new = count - previous if count > previous else count
+            t_ms.extend([_epoch_ms(datetime.strptime(row['real_time'], '%Y-%m-%d %H:%M:%S'))] * new)
+            previous = count
+            movies.add(row['movie_name'])
+    n = len(t_ms)
+    meta = {'movie_name': movies.pop()} if len(movies) == 1 else {}
+    write_session(out_path, {'t_ms': t_ms, 'media_position_ms': np.full(n, -1), 'ear': np.full(n, np.nan),
+                             'blink': np.ones(n, bool)},
+                  source=os.path.basename(csv_path), **meta)
+    return out_path
+
+
+def convert_csv(csv_path, out_root=SESSIONS_DIR):
+    """Convert any of the CSV logs, picking the format from its header; ValueError for anything else."""
+    from blink_log_writer import LOG_HEADER
+    from telemetry_aggregator import EVENT_LOG_HEADER
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        header = f.readline().strip().split(',')
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    if header == EVENT_LOG_HEADER:
+        return convert_event_log(csv_path, os.path.join(out_root, name + '.events'))
+    if header == LOG_HEADER:
+        return convert_blink_log(csv_path, os.path.join(out_root, name))
+    if header == REALTIME_LOG_HEADER:
+        return convert_realtime_log(csv_path, os.path.join(out_root, name))
+    raise ValueError(f"{csv_path}: not a blink, event or realtime log (header {','.join(header)[:60]!r})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert CSV blink logs into binary sessions")
+    parser.add_argument('logs', nargs='+')
+    parser.add_argument('--out', default=SESSIONS_DIR)
+    args = parser.parse_args()
+    for path in args.logs:
+        try:
+            out = convert_csv(path, args.out)
+        except ValueError as e:
+            print(f"Skipped {e}")
+            continue
+        session = load_session(out)
+        print(f"{path} -> {out} ({len(session)} rows, {session.meta['blinks']} blinks)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+import json
+import random
+from abc import ABC, abstractmethod
+import threading
+import time
+
+# Firestore rejects batched writes with more than 500 operations
+FIRESTORE_MAX_BATCH = 500
+
+
+class BackendError(ConnectionError):
+    """Raised by FakeBackend for an injected failure."""
+
+
+class StorageBackend(ABC):
+    """
+    Where viewer logs end up. Payloads are {"collection_name": str, "data": dict}.
+    `add` writes one document; `commit_batch` writes many in as few round trips as possible.
+    Both raise on failure, leaving retries to the caller.
+    """
+    @abstractmethod
+    def add(self, collection_name, data):
+        """Write one document."""
+
+    @abstractmethod
+    def commit_batch(self, payloads):
+        """Write all `payloads`, in as few round trips as the backend allows."""
+
+
+class FirestoreBackend(StorageBackend):
+    """
+    Cloud Firestore. `client` is a firestore.Client, or a zero-argument callable returning
+    one so the client is only created on first use.
+    """
+    def __init__(self, client):
+        self._client = client
+
+    @property
+    def client(self):
+        return self._client() if callable(self._client) else self._client
+
+    def add(self, collection_name, data):
+        self.client.collection(collection_name).add(data)
+
+    def commit_batch(self, payloads):
+        client = self.client
+        for start in range(0, len(payloads), FIRESTORE_MAX_BATCH):
+            write_batch = client.batch()
+            for payload in payloads[start:start + FIRESTORE_MAX_BATCH]:
+                doc_ref = client.collection(payload["collection_name"]).document()
+                write_batch.set(doc_ref, payload["data"])
+            write_batch.commit()
+
+
+class FakeBackend(StorageBackend):
+    """
+    Local stand-in for Firestore for tests and benchmarks.
+
+    Every `add` or `commit_batch` call is one simulated round trip of `latency` seconds plus up
+    to `jitter` seconds of uniform noise. A round trip fails with BackendError with probability
+    `failure_rate`, or unconditionally while `fail_next(n)` failures are outstanding; a failed
+    round trip stores nothing. Committed documents are kept in memory (`docs`, with their commit
+    times in `committed_at`) and, if `path` is given, appended to that file as JSON lines.
+    """
+    def __init__(self, latency=0.0, jitter=0.0, failure_rate=0.0, path=None, keep_docs=True,
+                 seed=None, clock=time.perf_counter, sleep=time.sleep):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.path = path
+        self.keep_docs = keep_docs
+        self.clock = clock
+        self.sleep = sleep
+        self.docs = []
+        self.committed_at = []
+        self.round_trips = 0
+        self.failures = 0
+        self.committed = 0
+        self._forced_failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def fail_next(self, count=1):
+        """Make the next `count` round trips fail."""
+        with self._lock:
+            self._forced_failures += count
+
+    def add(self, collection_name, data):
+        self._round_trip([(collection_name, data)])
+
+    def commit_batch(self, payloads):
+        for start in range(0, len(payloads), FIRESTORE_MAX_BATCH):
+            chunk = payloads[start:start + FIRESTORE_MAX_BATCH]
+            self._round_trip([(p["collection_name"], p["data"]) for p in chunk])
+
+    def _round_trip(self, docs):
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            self.sleep(delay)
+        with self._lock:
+            self.round_trips += 1
+            if self._forced_failures or (self.failure_rate and self._random.random() < self.failure_rate):
+                self._forced_failures = max(0, self._forced_failures - 1)
+                self.failures += 1
+                raise BackendError("injected failure")
+            now = self.clock()
+            self.committed += len(docs)
+            if self.keep_docs:
+                self.docs.extend(docs)
+                self.committed_at.extend([now] * len(docs))
+            if self.path:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.writelines(json.dumps({"collection_name": name, "data": data}) + "\n" for name, data in docs)
+
+
+def as_backend(client):
+    """Wrap a raw Firestore-style client in a FirestoreBackend; backends pass through unchanged."""
+    return client if isinstance(client, StorageBackend) else FirestoreBackend(client)
@@ -0,0 +1,214 @@
+"""
+Windowed aggregation of blink telemetry.
+
+Instead of one cloud document per blink, detections are summarised per window:
+
+    blink  one summary per blink (the legacy behaviour)
+    10s    fixed 10-second windows of session time
+    60s    fixed 60-second windows of session time
+    scene  one window per scene, from scene boundaries given as media positions (ms)
+
+Each summary holds the blink count, the blink timestamps (ms since session start), the mean EAR
+of the samples seen in the window and the media position range it covers. The live blink thread
+feeds the aggregator every frame with a face. Stored data can be run through the same code:
+
+- `aggregate_session` replays a recorded session (see session_store), which has every frame,
+  and gives the same windows as the live run (EAR is stored as float32, so mean_ear agrees to
+  about 1e-7).
+- `aggregate_event_log` and `aggregate_blink_log` only see the blinks: blink counts and
+  timestamps are reproduced, but windows without blinks are missing and mean_ear (event logs
+  only) is the mean over the blink frames.
+
+    python telemetry_aggregator.py csv/sessions/<session> csv/events/<movie>.csv [--mode 60s]
+"""
+import argparse
+import csv
+import json
+import os
+from bisect import bisect_right
+
+import numpy as np
+
+TELEMETRY_MODES = ('blink', '10s', '60s', 'scene')
+WINDOW_MS = {'10s': 10000, '60s': 60000}
+
+# Raw per-blink events kept locally at full fidelity (csv/events/<movie>.csv)
+EVENT_LOG_HEADER = ['t_ms', 'real_time', 'blink_count', 'ear', 'media_position_ms']
+
+
+class TelemetryAggregator:
+    """
+    Streaming window aggregator. Call `update` for every sample (a camera frame with a face, or a
+    logged blink when replaying) and `flush` at the end of the session; both return the list of
+    windows that closed. Windows with no samples (e.g. while paused) are never emitted.
+
+    For 'scene' mode, `scene_bounds` is a sorted list of media positions (ms) where scenes start;
+    without it the whole session is one scene.
+    """
+    def __init__(self, mode='10s', scene_bounds=None):
+        if mode not in TELEMETRY_MODES:
+            raise ValueError(f"Unknown telemetry mode {mode!r}, expected one of {TELEMETRY_MODES}")
+        self.mode = mode
+        self.scene_bounds = sorted(scene_bounds or [])
+        self._key = None
+        self._reset_window()
+
+    def _reset_window(self):
+        self._start_ms = None
+        self._end_ms = None
+        self._blinks = []
+        self._ear_sum = 0.0
+        self._ear_count = 0
+        self._media_start = None
+        self._media_end = None
+
+    def _window_key(self, t_ms, media_position_ms):
+        if self.mode == 'scene':
+            return bisect_right(self.scene_bounds, media_position_ms or 0)
+        return t_ms // WINDOW_MS[self.mode]
+
+    def update(self, t_ms, ear=None, media_position_ms=None, blinks=0):
+        """
+        Add one sample at `t_ms` (ms since session start) with `blinks` blinks completed on it.
+        Returns the windows closed by this sample.
+        """
+        closed = []
+        if self.mode != 'blink':
+            key = self._window_key(t_ms, media_position_ms)
+            if key != self._key:
+                closed = self.flush()
+                self._key = key
+        if self._start_ms is None:
+            self._start_ms = t_ms
+        self._end_ms = t_ms
+        if ear is not None:
+            self._ear_sum += ear
+            self._ear_count += 1
+        if media_position_ms is not None:
+            if self._media_start is None:
+                self._media_start = media_position_ms
+            self._media_end = media_position_ms
+        if blinks:
+            self._blinks.extend([t_ms] * blinks)
+            if self.mode == 'blink':
+                closed.extend(self.flush())
+        return closed
+
+    def flush(self):
+        """Close the current window; returns it as a one-element list, or [] if it was empty."""
+        if self._start_ms is None or (self.mode == 'blink' and not self._blinks):
+            return []
+        summary = {
+            'mode': self.mode,
+            'window_start_ms': self._start_ms,
+            'window_end_ms': self._end_ms,
+            'count': len(self._blinks),
+            'timestamps_ms': list(self._blinks),
+            'mean_ear': self._ear_sum / self._ear_count if self._ear_count else None,
+            'media_start_ms': self._media_start,
+            'media_end_ms': self._media_end,
+        }
+        if self.mode == 'scene':
+            summary['scene'] = self._key
+        elif self.mode != 'blink':
+            size = WINDOW_MS[self.mode]
+            # Report the nominal window, not just the span of the samples in it
+            summary['window_start_ms'] = self._key * size
+            summary['window_end_ms'] = (self._key + 1) * size
+        self._reset_window()
+        return [summary]
+
+
+def aggregate(samples, mode='10s', scene_bounds=None):
+    """Aggregate an iterable of (t_ms, ear, media_position_ms, blinks) tuples; returns all windows."""
+    aggregator = TelemetryAggregator(mode, scene_bounds)
+    windows = []
+    for t_ms, ear, media_position_ms, blinks in samples:
+        windows.extend(aggregator.update(t_ms, ear, media_position_ms, blinks))
+    windows.extend(aggregator.flush())
+    return windows
+
+
+def _optional(value, kind):
+    return kind(value) if value not in ('', None) else None
+
+
+def read_event_log(path):
+    """Yield (t_ms, ear, media_position_ms, blinks) samples from a raw event log, one per blink."""
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield int(row['t_ms']), _optional(row['ear'], float), _optional(row['media_position_ms'], int), 1
+
+
+def aggregate_event_log(path, mode='10s', scene_bounds=None):
+    """Re-aggregate a raw event log (csv/events/<movie>.csv) offline; blink windows only (see above)."""
+    return aggregate(read_event_log(path), mode, scene_bounds)
+
+
+def read_session(path):
+    """
+    Yield one list of (t_ms, ear, media_position_ms, blinks) samples per recorded segment (one per
+    resume) of a session, skipping frames without a face as the live loop does. t_ms counts from
+    the session's `session_start_ms`.
+    """
+    from session_store import load_session
+    session = load_session(path)
+    start_ms = session.meta.get('session_start_ms', session.meta['start_ms'])
+    bounds = list(session.meta.get('segments') or [0]) + [len(session)]
+    for begin, end in zip(bounds[:-1], bounds[1:]):
+        ear = session.ear[begin:end]
+        face = np.flatnonzero(np.isfinite(ear))
+        t_ms = (session.t_ms[begin:end][face] - start_ms).tolist()
+        media = session.media_position_ms[begin:end][face].tolist()
+        blinks = session.blink[begin:end][face].astype(int).tolist()
+        yield [(t, e, (None if m < 0 else m), b) for t, e, m, b in zip(t_ms, ear[face].tolist(), media, blinks)]
+
+
+def aggregate_session(path, mode='10s', scene_bounds=None):
+    """
+    Re-aggregate a recorded session (csv/sessions/<session>) offline, exactly as the live run did:
+    the live aggregator is flushed whenever playback pauses, so each segment is aggregated on its own.
+    """
+    windows = []
+    for samples in read_session(path):
+        windows.extend(aggregate(samples, mode, scene_bounds))
+    return windows
+
+
+def aggregate_blink_log(path, mode='10s'):
+    """
+    Aggregate a per-movie blink log (real_time_12h, elapsed_hms, blink_count). These logs only
+    have one-second resolution and no EAR or media position, so neither appears in the summaries.
+    """
+    from blink_log_writer import read_blink_log
+    _, rows = read_blink_log(path)
+
+    def samples():
+        previous = 0
+        for row in rows:
+            h, m, s = (int(part) for part in row[1].split(':'))
+            count = int(row[2])
+            yield ((h * 60 + m) * 60 + s) * 1000, None, None, max(0, count - previous)
+            previous = count
+    return aggregate(samples(), mode)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate stored blink logs into telemetry windows")
+    parser.add_argument('logs', nargs='+', help="sessions (csv/sessions/*), raw event logs (csv/events/*.csv) "
+                                                "or per-movie blink logs (csv/*.csv)")
+    parser.add_argument('--mode', default='10s', choices=[m for m in TELEMETRY_MODES if m != 'scene'])
+    args = parser.parse_args()
+    for path in args.logs:
+        if os.path.isdir(path):
+            windows = aggregate_session(path, args.mode)
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                is_event_log = f.readline().strip().split(',') == EVENT_LOG_HEADER
+            windows = aggregate_event_log(path, args.mode) if is_event_log else aggregate_blink_log(path, args.mode)
+        for summary in windows:
+            print(json.dumps(dict(summary, log=path)))
+
+
+if __name__ == '__main__':
+    main()
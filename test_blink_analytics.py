@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+
+from blink_analytics import _curve_cache, blink_rate_curves
+from session_store import SessionWriter, write_session
+
+
+def _session(root, name, media_ms, blink_ms):
+    media_ms = np.asarray(media_ms)
+    path = os.path.join(str(root), name)
+    write_session(path, {'t_ms': 1_700_000_000_000 + media_ms, 'media_position_ms': media_ms,
+                         'ear': np.full(len(media_ms), 0.3), 'blink': np.isin(media_ms, blink_ms)})
+    return path
+
+
+def test_curves_skip_unwatched_bins(tmp_path):
+    _curve_cache.clear()
+    frames = np.arange(0, 180000, 1000)
+    full = _session(tmp_path, "full", frames, [1000, 2000, 61000, 62000, 63000, 121000])
+    # Second viewer only watched the first minute
+    partial = _session(tmp_path, "partial", frames[:60], [5000, 6000, 7000, 8000])
+    curves = blink_rate_curves([full, partial], bin_seconds=60, percentiles=(50,))
+    assert list(curves.viewers) == [2, 1, 1]
+    assert list(curves.mean) == [3.0, 3.0, 1.0]
+    assert list(curves.percentiles[50.0]) == [3.0, 3.0, 1.0]
+    assert curves.sessions == 2
+
+
+def test_cache_hits_and_invalidates_on_rewrite(tmp_path):
+    _curve_cache.clear()
+    path = _session(tmp_path, "one", np.arange(0, 60000, 1000), [1000])
+    # Backdate so the rewrite below is guaranteed a different mtime
+    os.utime(os.path.join(path, "meta.json"), ns=(0, 0))
+    first = blink_rate_curves([path], cache_dir=str(tmp_path / "cache"))
+    assert blink_rate_curves([path]) is first
+    _curve_cache.clear()
+    from_disk = blink_rate_curves([path], cache_dir=str(tmp_path / "cache"))
+    assert from_disk is not first and list(from_disk.mean) == list(first.mean)
+
+    _session(tmp_path, "one", np.arange(0, 60000, 1000), [1000, 2000])
+    assert list(blink_rate_curves([path]).mean) == [2.0]
+
+
+def test_paused_and_resumed_viewing_counts_once(tmp_path):
+    _curve_cache.clear()
+    start = 1_700_000_000_000
+    # Watched 0-60 s, paused for ten minutes, then 60-120 s; an older player wrote one session per resume
+    first = np.arange(0, 60000, 1000)
+    second = np.arange(60000, 120000, 1000)
+    paths = []
+    resumes = (("a_1", first, [1000, 2000], start), ("a_2", second, [61000], start + 660000))
+    for name, media_ms, blink_ms, wall_start in resumes:
+        path = os.path.join(str(tmp_path), name)
+        write_session(path, {'t_ms': wall_start + media_ms - media_ms[0], 'media_position_ms': media_ms,
+                             'ear': np.full(len(media_ms), 0.3), 'blink': np.isin(media_ms, blink_ms)},
+                      user_name="viewer", movie_name="movie", session_start_ms=start)
+        paths.append(path)
+    # The same viewing recorded by the current player: one session, two segments
+    resumed = os.path.join(str(tmp_path), "b")
+    with SessionWriter(resumed, user_name="other", movie_name="movie", session_start_ms=start) as writer:
+        for t in first:
+            writer.append(start + t, t, 0.3, t in (1000, 2000, 3000))
+    with SessionWriter(resumed) as writer:
+        for t in second:
+            writer.append(start + 660000 + t - 60000, t, 0.3, t == 61000)
+
+    for timeline in ('media', 'elapsed'):
+        curves = blink_rate_curves(paths + [resumed], bin_seconds=60, percentiles=(), timeline=timeline)
+        # Two viewers, and the pause neither restarts nor stretches the elapsed timeline
+        assert curves.sessions == 2, timeline
+        assert list(curves.viewers) == [2, 2], timeline
+        assert list(curves.mean) == [2.5, 1.0], timeline
+
+
+def test_separate_viewings_on_one_day_are_not_merged(tmp_path):
+    _curve_cache.clear()
+    start = 1_700_000_000_000
+    media_ms = np.arange(0, 60000, 1000)
+    paths = []
+    # Same viewer and film, watched again two hours later
+    for name, session_start, blink_ms in (("morning", start, [1000, 2000]), ("later", start + 7_200_000, [5000])):
+        path = os.path.join(str(tmp_path), name)
+        write_session(path, {'t_ms': session_start + media_ms, 'media_position_ms': media_ms,
+                             'ear': np.full(len(media_ms), 0.3), 'blink': np.isin(media_ms, blink_ms)},
+                      user_name="viewer", movie_name="movie", session_start_ms=session_start)
+        paths.append(path)
+    curves = blink_rate_curves(paths, bin_seconds=60, percentiles=())
+    assert curves.sessions == 2 and list(curves.viewers) == [2]
+    assert list(curves.mean) == [1.5]
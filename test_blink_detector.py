@@ -0,0 +1,59 @@
+import numpy as np
+
+from blink_detector import BlinkDetector, detect_blinks, smooth_ears
+
+
+def synthetic_ears(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    ears = 0.3 + 0.03 * rng.standard_normal(n)
+    for start in rng.integers(0, n, n // 40):
+        ears[start:start + rng.integers(1, 6)] = 0.12
+    ears[rng.integers(0, n, n // 50)] = np.nan
+    return ears
+
+
+def stream(ears, **kwargs):
+    detector = BlinkDetector(**kwargs)
+    return [i for i, ear in enumerate(ears) if not np.isnan(ear) and detector.update(ear)]
+
+
+def test_batch_matches_streaming():
+    ears = synthetic_ears()
+    for kwargs in ({}, {'window': 4}, {'window': 1}, {'smoothing': 'ema', 'alpha': 0.4}, {'consecutive_frames': 3}):
+        kwargs = dict(threshold=0.22, **kwargs)
+        assert list(detect_blinks(ears, **kwargs)) == stream(ears, **kwargs), kwargs
+
+
+def test_blink_fires_on_first_open_frame():
+    ears = [0.3, 0.3, 0.1, 0.1, 0.1, 0.1, 0.3, 0.3, 0.3, 0.3]
+    # Running median drops below the threshold at index 3 and recovers at index 8
+    assert list(detect_blinks(ears, 0.22)) == [8]
+    assert stream(ears, threshold=0.22) == [8]
+
+
+def test_short_closure_and_trailing_closure_are_not_blinks():
+    ears = [0.3, 0.1, 0.3, 0.3] + [0.1] * 6
+    assert len(detect_blinks(ears, 0.22, window=1)) == 0
+
+
+def test_ema_matches_streaming_smoothing():
+    ears = synthetic_ears(20000)
+    ears = ears[~np.isnan(ears)]
+    for alpha in (0.01, 0.4, 0.9, 1.0):
+        detector = BlinkDetector(smoothing='ema', alpha=alpha)
+        expected = []
+        for ear in ears:
+            detector.update(ear)
+            expected.append(detector.smooth_ear)
+        assert np.allclose(smooth_ears(ears, smoothing='ema', alpha=alpha), expected, rtol=0, atol=1e-12), alpha
+
+
+def test_non_finite_samples_are_ignored():
+    ears = [0.3, 0.3, 0.1, np.nan, 0.1, 0.1, np.inf, 0.1, 0.3, 0.3, 0.3, 0.3]
+    detector = BlinkDetector(threshold=0.22)
+    blinks = [i for i, ear in enumerate(ears) if detector.update(ear)]
+    assert blinks == list(detect_blinks(ears, 0.22))
+    # The same as if the non-finite frames had never been seen
+    finite = [ear for ear in ears if np.isfinite(ear)]
+    assert len(blinks) == len(stream(finite, threshold=0.22)) == 1
+    assert all(np.isfinite(v) for v in detector._sorted)
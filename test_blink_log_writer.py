@@ -0,0 +1,48 @@
+from blink_log_writer import LOG_HEADER, BlinkLogWriter, read_blink_log
+
+
+def _on_disk(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+def test_rows_are_buffered_until_flush_every(tmp_path):
+    path = str(tmp_path / "csv" / "movie.csv")
+    writer = BlinkLogWriter(path, flush_every=3, flush_interval=3600)
+    assert _on_disk(path) == [','.join(LOG_HEADER)]
+    writer.append(['08:00:01 PM', '0:00:01', 1])
+    writer.append(['08:00:02 PM', '0:00:02', 2])
+    assert len(_on_disk(path)) == 1
+    writer.append(['08:00:03 PM', '0:00:03', 3])
+    assert len(_on_disk(path)) == 4
+    writer.close()
+
+
+def test_time_budget_and_close_flush(tmp_path):
+    path = str(tmp_path / "movie.csv")
+    writer = BlinkLogWriter(path, flush_every=100, flush_interval=0)
+    writer.append(['08:00:01 PM', '0:00:01', 1])
+    assert len(_on_disk(path)) == 2
+    writer.flush_interval = 3600
+    writer.append(['08:00:02 PM', '0:00:02', 2])
+    assert len(_on_disk(path)) == 2
+    writer.close()
+    writer.close()
+    assert len(_on_disk(path)) == 3
+    # Reopening an existing log appends without a second header
+    with BlinkLogWriter(path) as again:
+        again.append(['08:00:03 PM', '0:00:03', 3])
+    assert _on_disk(path).count(','.join(LOG_HEADER)) == 1 and len(_on_disk(path)) == 4
+
+
+def test_read_blink_log_rolls_up_per_second(tmp_path):
+    path = str(tmp_path / "movie.csv")
+    assert read_blink_log(path) == (LOG_HEADER, [])
+    with BlinkLogWriter(path) as writer:
+        for row in (['08:00:01 PM', '0:00:01', 1], ['08:00:01 PM', '0:00:01', 2],
+                    ['08:00:05 PM', '0:00:05', 3], ['08:00:01 PM', '0:00:01', 4]):
+            writer.append(row)
+    header, rows = read_blink_log(path)
+    assert header == LOG_HEADER
+    # Last row per second wins, at the position of the first one
+    assert rows == [['08:00:01 PM', '0:00:01', '4'], ['08:00:05 PM', '0:00:05', '3']]
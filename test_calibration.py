@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+import user_config
+from blink_counter_thread import BlinkCounterThread
+from blink_detector import OnlineThresholdAdapter
+
+
+@pytest.fixture
+def profiles_path(tmp_path, monkeypatch):
+    path = tmp_path / "calibration_profiles.json"
+    monkeypatch.setattr(user_config, "CALIBRATION_PATH", str(path))
+    return path
+
+
+def viewer_ears(n, open_level=0.25, closed_level=0.08, seed=0):
+    """Open-eye EAR with noise and a 3-frame blink every 60 frames."""
+    rng = np.random.default_rng(seed)
+    ears = open_level + 0.01 * rng.standard_normal(n)
+    for start in range(30, n, 60):
+        ears[start:start + 3] = closed_level
+    return ears
+
+
+def test_adapter_follows_the_viewer():
+    adapter = OnlineThresholdAdapter(open_ear=0.3, closed_ear=0.18)
+    for ear in viewer_ears(20000):
+        adapter.update(ear)
+    assert adapter.open_ear == pytest.approx(0.25, abs=0.01)
+    # The 2 % quantile sits inside the blinks, well below the open level
+    assert adapter.closed_ear < 0.16
+    assert adapter.threshold == pytest.approx((adapter.closed_ear + adapter.open_ear) / 2.2)
+    assert adapter.samples == 20000 and adapter.calibrated
+
+
+def test_adapter_needs_open_and_closed_samples():
+    adapter = OnlineThresholdAdapter(min_open=50, min_closed=5)
+    assert not adapter.calibrated
+    for _ in range(100):
+        adapter.update(0.3)
+    assert adapter.open_samples == 100 and not adapter.calibrated
+    for _ in range(5):
+        adapter.update(0.05)
+    assert adapter.closed_samples == 5 and adapter.calibrated
+
+
+def test_threshold_is_clamped():
+    adapter = OnlineThresholdAdapter(open_ear=0.9, closed_ear=0.9, max_threshold=0.35)
+    assert adapter.threshold == 0.35
+    adapter = OnlineThresholdAdapter(open_ear=0.01, closed_ear=0.01, min_threshold=0.1)
+    assert adapter.threshold == 0.1
+
+
+def test_calibration_round_trip(profiles_path):
+    assert user_config.load_calibration("BlueFox42") is None
+    user_config.save_calibration("BlueFox42", 0.2, 0.28, 0.16)
+    user_config.save_calibration("BlueFox42", np.float64(0.21), 0.29, 0.17)
+    user_config.save_calibration(None, 0.19, 0.27, 0.15)
+    profile = user_config.load_calibration("BlueFox42")
+    assert (profile["threshold"], profile["open_ear"], profile["closed_ear"]) == (0.21, 0.29, 0.17)
+    assert profile["sessions"] == 2
+    assert user_config.load_calibration(None)["threshold"] == 0.19
+    # A corrupt file is treated as no profiles
+    profiles_path.write_text("{", encoding="utf-8")
+    assert user_config.load_calibration("BlueFox42") is None
+
+
+def test_empty_calibration_is_not_saved(profiles_path):
+    thread = BlinkCounterThread(user_name="BlueFox42")
+    # No face seen at all: the adapter still holds the 0.3 / 0.18 defaults
+    assert not thread._save_calibration(OnlineThresholdAdapter())
+    adapter = OnlineThresholdAdapter()
+    for _ in range(1000):
+        adapter.update(0.3)
+    assert not thread._save_calibration(adapter)
+    assert not profiles_path.exists()
+    for ear in viewer_ears(5000):
+        adapter.update(ear)
+    assert thread._save_calibration(adapter)
+    assert user_config.load_calibration("BlueFox42")["threshold"] == pytest.approx(adapter.threshold)
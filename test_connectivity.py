@@ -0,0 +1,79 @@
+import threading
+
+from connectivity import ConnectivityMonitor
+
+
+class FlappingProbe:
+    """Replays a fixed up/down pattern, then stays on its last state."""
+    def __init__(self, pattern):
+        self.pattern = list(pattern)
+        self.calls = 0
+
+    def __call__(self):
+        state = self.pattern[min(self.calls, len(self.pattern) - 1)]
+        self.calls += 1
+        if state is None:
+            raise OSError("network unreachable")
+        return state
+
+
+def test_backoff_and_transitions():
+    probe = FlappingProbe([False, False, False, None, True, True, False])
+    monitor = ConnectivityMonitor(probe, interval=10.0, min_backoff=1.0, max_backoff=5.0, initial=False)
+    changes = []
+    monitor.add_listener(changes.append)
+    delays = [monitor.check() for _ in range(7)]
+    # Offline probes back off 1, 2, 4, 5 (capped); a success resets it; a failing probe counts as offline
+    assert delays == [1.0, 2.0, 4.0, 5.0, 10.0, 10.0, 1.0]
+    assert changes == [True, False]
+    assert monitor.stats()['transitions'] == 2
+    assert not monitor.is_online()
+
+
+def test_flapping_network_in_background():
+    pattern = [True, False, True, False, True]
+    probe = FlappingProbe(pattern)
+    monitor = ConnectivityMonitor(probe, interval=0.01, min_backoff=0.01, max_backoff=0.02)
+    changes = []
+    done = threading.Event()
+
+    def listener(online):
+        changes.append(online)
+        if len(changes) == len(pattern):
+            done.set()
+
+    monitor.add_listener(listener)
+    monitor.start()
+    try:
+        assert done.wait(5.0)
+        assert monitor.wait_for(True, timeout=1.0)
+    finally:
+        monitor.stop()
+    assert changes == pattern
+    assert not monitor.is_alive()
+
+
+def test_recheck_wakes_a_sleeping_monitor():
+    probe = FlappingProbe([False, True])
+    monitor = ConnectivityMonitor(probe, min_backoff=60.0)
+    monitor.start()
+    try:
+        # Without recheck() the second probe would only run after a minute
+        monitor.recheck()
+        assert monitor.wait_for(True, timeout=5.0)
+    finally:
+        monitor.stop()
+
+
+def test_unknown_state_counts_as_online_until_the_first_probe():
+    probe = FlappingProbe([False, True])
+    monitor = ConnectivityMonitor(probe)
+    changes = []
+    monitor.add_listener(changes.append)
+    assert monitor.online is None and monitor.is_online()
+    assert not monitor.wait_for(True, timeout=0.01)
+    monitor.check()
+    assert monitor.online is False and not monitor.is_online()
+    monitor.check()
+    assert monitor.is_online()
+    assert changes == [False, True]
@@ -0,0 +1,64 @@
+import os
+
+from csv_tailer import CsvTailer
+
+HEADER = "real_time,elapsed_time,blink_count,movie_name\n"
+
+
+def row(i):
+    return f"2025-01-01 00:00:{i:02d},0:00:{i:02d},{i},Movie\n"
+
+
+def append(path, text):
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        f.write(text)
+
+
+def counts(rows):
+    return [int(r["blink_count"]) for r in rows]
+
+
+def test_reads_only_appended_rows_and_waits_for_complete_lines(tmp_path):
+    path = str(tmp_path / "realtime_log.csv")
+    tailer = CsvTailer(path)
+    assert tailer.read_new_rows() == []
+    append(path, HEADER + row(1) + row(2))
+    assert counts(tailer.read_new_rows()) == [1, 2]
+    # A row written in two pieces is returned once, when its newline arrives
+    text = row(3)
+    append(path, text[:10])
+    assert tailer.read_new_rows() == []
+    append(path, text[10:] + row(4)[:5])
+    assert counts(tailer.read_new_rows()) == [3]
+    append(path, row(4)[5:])
+    assert tailer.read_new_rows()[0]["movie_name"] == "Movie"
+    assert tailer.offset == os.path.getsize(path)
+
+
+def test_seek_to_end_skips_existing_rows(tmp_path):
+    path = str(tmp_path / "realtime_log.csv")
+    append(path, HEADER + row(1) + row(2) + row(3)[:7])
+    tailer = CsvTailer(path)
+    tailer.seek_to_end()
+    append(path, row(3)[7:] + row(4))
+    assert counts(tailer.read_new_rows()) == [3, 4]
+
+
+def test_truncation_and_rotation_restart_from_the_top(tmp_path):
+    path = str(tmp_path / "realtime_log.csv")
+    tailer = CsvTailer(path)
+    append(path, HEADER + row(1) + row(2))
+    assert counts(tailer.read_new_rows()) == [1, 2]
+
+    # Truncated and rewritten shorter
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(HEADER + row(5))
+    assert counts(tailer.read_new_rows()) == [5]
+
+    # Rotated: moved into the archive and recreated with a different column order
+    os.makedirs(tmp_path / "archive")
+    os.replace(path, tmp_path / "archive" / "realtime_log.csv")
+    assert tailer.read_new_rows() == []
+    append(path, "blink_count,real_time,elapsed_time,movie_name\n7,2025-01-01 00:01:00,0:01:00,Other\n")
+    [rotated] = tailer.read_new_rows()
+    assert rotated["blink_count"] == "7" and rotated["movie_name"] == "Other"
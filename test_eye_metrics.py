@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from eye_metrics import (EYE_INDICES, LEFT_EYE, RIGHT_EYE, batch_ear, calculate_ear, eye_points,
+                         eye_points_from_array)
+
+
+def random_eyes(rng, frames=None):
+    shape = (2, 6, 2) if frames is None else (frames, 2, 6, 2)
+    return rng.integers(0, 640, size=shape)
+
+
+def reference_ear(points):
+    return (calculate_ear(points[0]) + calculate_ear(points[1])) / 2.0
+
+
+def test_batch_ear_matches_per_eye_reference():
+    rng = np.random.default_rng(0)
+    points = random_eyes(rng)
+    ear = batch_ear(points)
+    assert ear.shape == ()
+    assert np.isclose(ear, reference_ear(points.astype(np.float64)))
+
+
+def test_batch_ear_over_frames():
+    rng = np.random.default_rng(1)
+    frames = random_eyes(rng, frames=50)
+    ears = batch_ear(frames)
+    assert ears.shape == (50,)
+    expected = [reference_ear(f.astype(np.float64)) for f in frames]
+    assert np.allclose(ears, expected)
+
+
+def test_open_and_closed_eye_values():
+    # Corners 40 px apart; lids 12 px apart when open, 2 px when closed
+    def eye(gap):
+        return [(0, 0), (13, -gap / 2), (27, -gap / 2), (40, 0), (27, gap / 2), (13, gap / 2)]
+    assert np.isclose(batch_ear([eye(12), eye(12)]), 0.3)
+    assert np.isclose(batch_ear([eye(2), eye(2)]), 0.05)
+    # The mean of both eyes, e.g. while winking
+    assert np.isclose(batch_ear([eye(12), eye(2)]), 0.175)
+
+
+def test_eye_points_sources_agree():
+    rng = np.random.default_rng(2)
+    landmarks = rng.random((468, 2))
+    face = SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y) for x, y in landmarks])
+    points = eye_points(face, 640, 480)
+    assert points.shape == (2, 6, 2) and points.dtype == np.int32
+    assert np.array_equal(points[0], (landmarks[LEFT_EYE] * (640, 480)).astype(np.int32))
+    assert np.array_equal(points[1], (landmarks[RIGHT_EYE] * (640, 480)).astype(np.int32))
+    pixels = landmarks * (640, 480)
+    assert np.array_equal(eye_points_from_array(pixels), pixels[EYE_INDICES])
+    assert eye_points_from_array(np.stack([pixels, pixels])).shape == (2, 2, 6, 2)
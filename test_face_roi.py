@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from eye_metrics import LEFT_EYE, RIGHT_EYE
+from face_roi import FACE_BOUNDS, FaceRoiTracker
+
+FRAME_W, FRAME_H = 640, 480
+
+
+def face_pixels(cx=320.0, cy=240.0, size=120.0, seed=0):
+    """Full-frame pixel positions for 468 landmarks of a face of `size` px centred on (cx, cy)."""
+    rng = np.random.default_rng(seed)
+    pixels = np.empty((468, 2))
+    pixels[:] = (cx, cy) + rng.uniform(-size / 4, size / 4, size=(468, 2))
+    pixels[FACE_BOUNDS] = [(cx, cy - size / 2), (cx, cy + size / 2), (cx - size / 2, cy), (cx + size / 2, cy)]
+    return pixels
+
+
+def landmarks_in(pixels, roi):
+    """What FaceMesh would report for `pixels` when run on the image cropped to `roi`."""
+    x, y, w, h = roi
+    return SimpleNamespace(landmark=[SimpleNamespace(x=(px - x) / w, y=(py - y) / h) for px, py in pixels])
+
+
+def frame():
+    return np.zeros((FRAME_H, FRAME_W, 3), dtype=np.uint8)
+
+
+def test_first_frame_is_searched_in_full():
+    tracker = FaceRoiTracker()
+    image, roi = tracker.crop(frame())
+    assert image.shape == (FRAME_H, FRAME_W, 3)
+    assert roi == (0, 0, FRAME_W, FRAME_H) and not tracker.tracking
+
+
+def test_roi_landmarks_map_back_to_frame_pixels():
+    tracker = FaceRoiTracker(max_side=None)
+    pixels = face_pixels()
+    _, roi = tracker.crop(frame())
+    tracker.eye_points(landmarks_in(pixels, roi), roi)
+    assert tracker.tracking
+    image, roi = tracker.crop(frame())
+    x, y, w, h = roi
+    assert image.shape[:2] == (h, w)
+    # 120 px face plus a 35 % margin on each side, centred on the face
+    assert (w, h) == (204, 204) and (x, y) == (218, 138)
+    points = tracker.eye_points(landmarks_in(pixels, roi), roi)
+    expected = np.stack([pixels[LEFT_EYE], pixels[RIGHT_EYE]])
+    # Landmarks are truncated to whole pixels inside the ROI
+    assert np.all(np.abs(points - expected) <= 1)
+
+
+def test_downscaled_crop_and_eye_region():
+    tracker = FaceRoiTracker(max_side=102)
+    pixels = face_pixels()
+    _, roi = tracker.crop(frame())
+    tracker.eye_points(landmarks_in(pixels, roi), roi)
+    image, roi = tracker.crop(frame())
+    assert roi[2:] == (204, 204) and image.shape[:2] == (102, 102)
+    # Landmarks are normalised, so the downscale does not change the frame coordinates
+    points = tracker.eye_points(landmarks_in(pixels, roi), roi)
+    assert np.all(np.abs(points - np.stack([pixels[LEFT_EYE], pixels[RIGHT_EYE]])) <= 1)
+    ex, ey, ew, eh = tracker.eye_region(roi, image.shape)
+    x0, y0, x1, y1 = tracker.eye_box
+    # Half-size image: the eye box is halved relative to the ROI origin
+    assert abs(ex - (x0 - roi[0]) / 2) <= 1 and abs(ey - max(0, y0 - roi[1]) / 2) <= 1
+    assert 0 < ew <= 102 and 0 < eh <= 102
+
+
+def test_box_holds_for_small_drift_and_follows_large_moves():
+    tracker = FaceRoiTracker(max_side=None)
+    _, roi = tracker.crop(frame())
+    tracker.eye_points(landmarks_in(face_pixels(), roi), roi)
+    first = tracker.roi
+    tracker.eye_points(landmarks_in(face_pixels(cx=325, cy=243), first), first)
+    assert tracker.roi == first
+    tracker.eye_points(landmarks_in(face_pixels(cx=400, cy=260), first), first)
+    assert tracker.roi != first and tracker.roi[0] > first[0]
+
+
+def test_resolution_change_resets_tracking():
+    tracker = FaceRoiTracker()
+    _, roi = tracker.crop(frame())
+    tracker.eye_points(landmarks_in(face_pixels(), roi), roi)
+    image, roi = tracker.crop(np.zeros((720, 1280, 3), dtype=np.uint8))
+    assert roi == (0, 0, 1280, 720) and not tracker.tracking and tracker.eye_box is None
@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+import firebase_upload
+from offline_journal import OfflineJournal
+from pending_sync import PendingDrainer
+from storage_backend import FakeBackend
+
+
+@pytest.fixture
+def uploads(tmp_path, monkeypatch):
+    """firebase_upload wired to a FakeBackend, a temporary journal and an always-up connection."""
+    backend = FakeBackend()
+    journal = OfflineJournal(str(tmp_path / "journal.sqlite3"))
+    monkeypatch.setattr(firebase_upload, "_backend", backend)
+    monkeypatch.setattr(firebase_upload, "_journal", journal)
+    monkeypatch.setattr(firebase_upload, "_worker", None)
+    monkeypatch.setattr(firebase_upload, "UPLOAD_MAX_LATENCY", 0.01)
+    monkeypatch.setattr(firebase_upload, "is_connected", lambda: True)
+    yield backend, journal
+    worker = firebase_upload._worker
+    if worker is not None:
+        worker.stop()
+    journal.close()
+
+
+def payload(i):
+    return {"collection_name": "viewer_movie", "data": {"blink_count": i}}
+
+
+def test_reconnect_drain_is_rate_limited(uploads, monkeypatch):
+    backend, journal = uploads
+    journal.append_many([payload(i) for i in range(250)])
+    drainers, pauses = [], []
+
+    class RecordingDrainer(PendingDrainer):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.sleep = pauses.append
+            drainers.append(self)
+
+    monkeypatch.setattr(firebase_upload, "PendingDrainer", RecordingDrainer)
+    worker = firebase_upload.get_upload_worker()
+    # The first live upload finds the connection up and kicks off the journal drain
+    worker.enqueue(payload(-1))
+    deadline = time.monotonic() + 5.0
+    while journal.pending_count() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert journal.pending_count() == 0
+    assert [d.max_rate for d in drainers] == [firebase_upload.DRAIN_MAX_RATE]
+    # 250 events in batches of 100: paused after the first two so no more than 200/s go out
+    assert len(pauses) == 2 and all(p > 0 for p in pauses)
+    worker.stop()
+    assert backend.committed == 251
+
+
+def test_drain_skips_while_another_is_running(uploads):
+    _, journal = uploads
+    journal.append(payload(0))
+    with firebase_upload._drain_lock:
+        assert firebase_upload.drain_pending_logs() == 0
+    assert journal.pending_count() == 1
+    assert firebase_upload.upload_pending_logs() == 1
@@ -0,0 +1,32 @@
+import os
+import sys
+
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QApplication
+
+import font_registry
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+def test_font_files_are_registered_once():
+    font_registry.preload_async().join()
+    path = os.path.join(font_registry.FONTS_DIR, 'Gotham-UltraItalic.otf')
+    families = font_registry.register_font_file(path)
+    assert families and font_registry.register_font_file(path) is families
+    assert font_registry.font('branding').family() == families[0]
+
+
+def test_fonts_and_metrics_are_cached_per_role():
+    assert font_registry.metrics('time') is font_registry.metrics('time')
+    overlay = font_registry.font('overlay')
+    overlay.setPointSize(5)
+    assert font_registry.font('overlay').pointSize() == 24
+    assert font_registry.font('time_percent').weight() == QFont.Weight.Bold
+
+
+def test_missing_font_file_falls_back(monkeypatch, tmp_path):
+    monkeypatch.setitem(font_registry.ROLES, 'missing', ([str(tmp_path / 'nope.ttf')], 'Arial', 10,
+                                                         QFont.Weight.Normal, False, 0))
+    assert font_registry.font('missing').family() == 'Arial'
+    font_registry.clear_cache()
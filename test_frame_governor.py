@@ -0,0 +1,77 @@
+import pytest
+
+from frame_governor import FrameRateGovernor
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def run_frames(governor, clock, count, busy):
+    """Run `count` frames that each take `busy` seconds of processing; returns the windows closed."""
+    closed = 0
+    for _ in range(count):
+        governor.frame_start()
+        clock.now += busy
+        closed += governor.wait()
+    return closed
+
+
+def make_governor(**kwargs):
+    clock = FakeClock()
+    return FrameRateGovernor(clock=clock, sleep=clock.sleep, **kwargs), clock
+
+
+def test_light_load_sleeps_out_the_budget():
+    governor, clock = make_governor(target_fps=20.0)
+    closed = run_frames(governor, clock, 40, busy=0.01)
+    assert closed == 2
+    # 50 ms budget, 10 ms of it spent processing
+    assert clock.slept[0] == pytest.approx(0.04)
+    assert governor.effective_fps == 20.0
+    assert governor.achieved_fps == pytest.approx(20.0)
+
+
+def test_backs_off_under_load_but_not_below_min_fps():
+    governor, clock = make_governor(target_fps=20.0, min_fps=5.0, backoff=0.8)
+    # 60 ms per frame against a 50 ms budget: no sleeping, and the first window backs off
+    assert run_frames(governor, clock, 17, busy=0.06) == 1
+    assert not clock.slept
+    assert governor.effective_fps == pytest.approx(16.0)
+    run_frames(governor, clock, 200, busy=0.3)
+    assert governor.effective_fps == 5.0
+    assert governor.stats()['mean_busy'] == pytest.approx(0.3)
+
+
+def test_recovers_step_by_step_once_load_drops():
+    governor, clock = make_governor(target_fps=20.0, min_fps=5.0, recover_step=2.0)
+    run_frames(governor, clock, 100, busy=0.3)
+    assert governor.effective_fps == 5.0
+    rates = []
+    for _ in range(10):
+        while not run_frames(governor, clock, 1, busy=0.001):
+            pass
+        rates.append(governor.effective_fps)
+    assert rates[:3] == [7.0, 9.0, 11.0]
+    assert rates[-1] == 20.0
+    assert max(rates) == 20.0
+
+
+def test_capture_wait_counts_against_the_budget():
+    governor, clock = make_governor(target_fps=10.0)
+    run_frames(governor, clock, 1, busy=0.0)
+    # 80 ms waiting for the camera before the frame arrives, 10 ms processing it
+    clock.now += 0.08
+    governor.frame_start()
+    clock.now += 0.01
+    governor.wait()
+    assert clock.slept[-1] == pytest.approx(0.01)
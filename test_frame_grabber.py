@@ -0,0 +1,93 @@
+import threading
+import time
+
+import numpy as np
+
+from frame_grabber import FrameGrabber
+
+
+class FakeCapture:
+    """cv2.VideoCapture stand-in yielding `count` frames whose pixels hold their index."""
+    def __init__(self, count, shape=(4, 6, 3), gate=None):
+        self.count = count
+        self.shape = shape
+        self.gate = gate
+        self.produced = 0
+        self.opened = True
+
+    def set(self, prop, value):
+        return True
+
+    def isOpened(self):
+        return self.opened
+
+    def read(self, image=None):
+        if self.gate is not None:
+            self.gate.acquire()
+        if self.produced >= self.count:
+            return False, None
+        frame = np.full(self.shape, self.produced, dtype=np.uint8)
+        self.produced += 1
+        if image is not None:
+            image[...] = frame
+            return True, image
+        return True, frame
+
+    def release(self):
+        self.opened = False
+
+
+def test_read_returns_newest_frame_and_counts_dropped():
+    gate = threading.Semaphore(0)
+    grabber = FrameGrabber(FakeCapture(10, gate=gate))
+    grabber.start()
+    for _ in range(5):
+        gate.release()
+    deadline = time.monotonic() + 2.0
+    while grabber.stats()['frames_captured'] < 5 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    ret, frame = grabber.read()
+    # Frames 0-3 were replaced before anyone read them
+    assert ret and frame[0, 0, 0] == 4
+    assert grabber.stats()['frames_dropped'] == 4
+    # Nothing newer yet: a short read times out without finishing the grabber
+    assert grabber.read(timeout=0.05) == (False, None)
+    assert not grabber.finished
+    gate.release()
+    ret, frame = grabber.read()
+    assert ret and frame[0, 0, 0] == 5
+    grabber.stop(timeout=0)
+    gate.release()
+    grabber.join(2.0)
+    assert not grabber.is_alive()
+
+
+def test_eof_delivers_last_frame_then_finishes():
+    grabber = FrameGrabber(FakeCapture(3))
+    grabber.start()
+    grabber.join(2.0)
+    ret, frame = grabber.read(timeout=None)
+    assert ret and frame[0, 0, 0] == 2
+    assert grabber.finished
+    assert grabber.read(timeout=None) == (False, None)
+    stats = grabber.stats()
+    assert (stats['frames_captured'], stats['frames_read']) == (3, 1)
+
+
+def test_stop_wakes_a_reader_waiting_without_timeout():
+    gate = threading.Semaphore(0)
+    grabber = FrameGrabber(FakeCapture(10, gate=gate))
+    grabber.start()
+    result = []
+    reader = threading.Thread(target=lambda: result.append(grabber.read(timeout=None)))
+    reader.start()
+    time.sleep(0.05)
+    assert reader.is_alive()
+    grabber.stop(timeout=0.1)
+    reader.join(2.0)
+    assert result == [(False, None)]
+    assert grabber.finished
+    # Let the capture thread leave its blocked read
+    gate.release()
+    grabber.join(2.0)
+    assert not grabber.is_alive()
@@ -0,0 +1,57 @@
+import sys
+
+from PyQt6.QtCore import QPoint, Qt
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QApplication
+
+from gradient_slider import GradientSlider
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+def _slider(**kwargs):
+    slider = GradientSlider(Qt.Orientation.Horizontal, **kwargs)
+    slider.resize(300, 30)
+    slider.setRange(0, 1000)
+    return slider
+
+
+def test_animates_only_while_visible_and_playing():
+    slider = _slider()
+    slider.set_playing(True)
+    assert not slider.timer.isActive()
+    slider.show()
+    assert slider.timer.isActive()
+    slider.set_playing(False)
+    assert not slider.timer.isActive()
+    slider.set_playing(True)
+    slider.hide()
+    assert not slider.timer.isActive()
+
+
+def test_static_slider_never_starts_timer():
+    slider = _slider(animated=False)
+    slider.show()
+    slider.set_playing(True)
+    slider.set_buffering(True)
+    assert not slider.timer.isActive()
+    slider.hide()
+
+
+def test_cached_rendering_tracks_value_and_colours():
+    slider = _slider()
+    slider.set_gradient_colors([(0.0, '#ff0000'), (1.0, '#ff0000')])
+    slider.set_glow_color(QColor(0, 0, 0, 0))
+    slider.setValue(500)
+    image = slider.grab().toImage()
+    groove = slider._groove_rect()
+    inside = image.pixelColor(QPoint(groove.left() + groove.width() // 4, groove.center().y()))
+    outside = image.pixelColor(QPoint(groove.left() + groove.width() * 3 // 4, groove.center().y()))
+    assert (inside.red(), inside.green()) == (255, 0)
+    assert outside.green() > 100  # groove over the window background, not the bar
+
+    strip = slider._gradient_strip
+    slider.set_gradient_colors([(0.0, '#00ff00'), (1.0, '#00ff00')])
+    image = slider.grab().toImage()
+    assert slider._gradient_strip is not strip
+    assert image.pixelColor(QPoint(groove.left() + groove.width() // 4, groove.center().y())).green() == 255
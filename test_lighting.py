@@ -0,0 +1,63 @@
+import cv2
+import numpy as np
+import pytest
+
+from lighting import LIGHTING_MODES, LightingNormalizer
+
+
+def camera_frame(seed=0, shape=(120, 160, 3), dark=False):
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 256, size=shape, dtype=np.uint8)
+    return (frame // 4) if dark else frame
+
+
+def legacy_equalize_rgb(frame):
+    """The old per-frame path: equalise the Y plane back to BGR, then convert to RGB for FaceMesh."""
+    yuv = cv2.cvtColor(frame, cv2.COLOR_BGR2YUV)
+    yuv[:, :, 0] = cv2.equalizeHist(yuv[:, :, 0])
+    return cv2.cvtColor(cv2.cvtColor(yuv, cv2.COLOR_YUV2BGR), cv2.COLOR_BGR2RGB)
+
+
+def test_equalize_matches_legacy_pipeline():
+    normalizer = LightingNormalizer('equalize')
+    for seed in range(3):
+        frame = camera_frame(seed, dark=bool(seed % 2))
+        assert np.array_equal(normalizer(frame), legacy_equalize_rgb(frame))
+
+
+def test_none_is_colour_conversion_only():
+    frame = camera_frame()
+    assert np.array_equal(LightingNormalizer('none')(frame), cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+
+def test_gamma_brightens_dark_frames():
+    frame = camera_frame(dark=True)
+    out = LightingNormalizer('gamma', gamma=0.7)(frame)
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    assert np.all(out >= rgb) and out.mean() > rgb.mean()
+
+
+def test_clahe_only_touches_the_eye_region():
+    frame = camera_frame(dark=True)
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    out = LightingNormalizer('clahe')(frame, eye_region=(40, 30, 60, 20))
+    outside = np.ones(frame.shape[:2], dtype=bool)
+    outside[30:50, 40:100] = False
+    assert np.array_equal(out[outside], rgb[outside])
+    assert not np.array_equal(out[30:50, 40:100], rgb[30:50, 40:100])
+    # Without an eye region the whole frame is corrected
+    whole = LightingNormalizer('clahe')(frame)
+    assert not np.array_equal(whole[outside], rgb[outside])
+
+
+def test_buffers_are_reused_per_frame_size():
+    normalizer = LightingNormalizer('equalize')
+    first = normalizer(camera_frame(0))
+    assert normalizer(camera_frame(1)) is first
+    assert normalizer(camera_frame(2, shape=(60, 80, 3))).shape == (60, 80, 3)
+
+
+def test_unknown_mode_is_rejected():
+    assert 'equalize' in LIGHTING_MODES
+    with pytest.raises(ValueError):
+        LightingNormalizer('sepia')
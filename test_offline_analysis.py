@@ -0,0 +1,112 @@
+import csv
+import os
+import tempfile
+from datetime import datetime
+
+import cv2
+import numpy as np
+import pytest
+
+import offline_analysis
+from offline_analysis import analyze_video, extract_ears, plan_chunks, write_blink_log
+
+FPS = 20
+# Frames where the synthetic "eyes" are closed; 4-frame closures are blinks
+CLOSED = [range(30, 34), range(95, 99), range(150, 154), range(199, 203), range(260, 264)]
+
+
+class BrightnessEarExtractor:
+    """Stands in for FaceMesh: bright frames are open eyes, dark frames closed, black is no face."""
+    def __call__(self, frame):
+        level = frame.mean()
+        if level < 20:
+            return None
+        return 0.3 if level > 128 else 0.1
+
+
+def make_video(path, frames=300):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), FPS, (64, 48))
+    closed = {i for r in CLOSED for i in r}
+    for i in range(frames):
+        level = 60 if i in closed else 200
+        if i in (120, 121):
+            level = 0  # face lost for two frames
+        writer.write(np.full((48, 64, 3), level, dtype=np.uint8))
+    writer.release()
+
+
+def test_plan_chunks_covers_all_frames():
+    chunks = plan_chunks(1001, 20.0, 10)
+    assert chunks[0] == (0, 200) and chunks[-1] == (1000, 1001)
+    assert sum(end - start for start, end in chunks) == 1001
+
+
+def test_chunked_analysis_matches_single_pass():
+    with tempfile.TemporaryDirectory() as tmp:
+        video = os.path.join(tmp, 'session.avi')
+        make_video(video)
+        single = analyze_video(video, workers=1, chunk_seconds=1000, threshold=0.22,
+                               extractor_factory=BrightnessEarExtractor)
+        # 3 s chunks put the 199-202 closure across a chunk boundary
+        chunked = analyze_video(video, workers=3, chunk_seconds=3, threshold=0.22,
+                                extractor_factory=BrightnessEarExtractor)
+        assert len(single['blink_frames']) == len(CLOSED)
+        assert list(chunked['blink_frames']) == list(single['blink_frames'])
+        assert np.isnan(chunked['ears'][120])
+
+        out = os.path.join(tmp, 'session.csv')
+        write_blink_log(chunked['blink_frames'], chunked['fps'], out, datetime(2025, 1, 1, 17, 0, 0))
+        with open(out, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ['real_time_12h', 'elapsed_hms', 'blink_count']
+        assert rows[1] == ['05:00:01 PM', '0:00:01', '1']
+        assert len(rows) == len(CLOSED) + 1
+
+
+class KeyframeSeekCapture:
+    """VideoCapture whose seeks land on the keyframe before the target, or past it."""
+    VideoCapture = cv2.VideoCapture
+
+    def __init__(self, path, gop=25, overshoot=False):
+        self._cap = self.VideoCapture(path)
+        self.gop = gop
+        self.overshoot = overshoot
+
+    def set(self, prop, value):
+        if prop != cv2.CAP_PROP_POS_FRAMES:
+            return self._cap.set(prop, value)
+        landed = value + 7 if self.overshoot else value - value % self.gop
+        return self._cap.set(prop, landed)
+
+    def __getattr__(self, name):
+        return getattr(self._cap, name)
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = str(tmp_path / 'session.avi')
+    make_video(path)
+    return path
+
+
+def reference_ears(path):
+    return extract_ears(path, workers=1, chunk_seconds=1000, extractor_factory=BrightnessEarExtractor)[0]
+
+
+@pytest.mark.parametrize('overshoot', [False, True])
+def test_inaccurate_seeks_are_corrected(video, monkeypatch, overshoot):
+    expected = reference_ears(video)
+    monkeypatch.setattr(offline_analysis.cv2, 'VideoCapture',
+                        lambda path: KeyframeSeekCapture(path, overshoot=overshoot))
+    # Single worker so the patched capture is used; 1.6 s chunks never start on a keyframe
+    ears, _ = extract_ears(video, workers=1, chunk_seconds=1.6, extractor_factory=BrightnessEarExtractor)
+    np.testing.assert_array_equal(ears, expected)
+
+
+@pytest.mark.parametrize('reported', [0, 120, 290, 400])
+def test_wrong_frame_count_falls_back_to_decoding(video, monkeypatch, reported):
+    expected = reference_ears(video)
+    assert len(expected) == 300
+    monkeypatch.setattr(offline_analysis, 'video_info', lambda path: (reported, FPS))
+    ears, _ = extract_ears(video, workers=1, chunk_seconds=3, extractor_factory=BrightnessEarExtractor)
+    np.testing.assert_array_equal(ears, expected)
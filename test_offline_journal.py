@@ -0,0 +1,58 @@
+import json
+import os
+
+import pytest
+
+from offline_journal import OfflineJournal
+
+
+def payload(i):
+    return {"collection_name": f"viewer_movie_{i % 3}", "data": {"blink_count": i}}
+
+
+def test_replay_resumes_after_failure(tmp_path):
+    with OfflineJournal(str(tmp_path / "journal.sqlite3"), compact_every=4) as journal:
+        journal.append_many([payload(i) for i in range(10)])
+        journal.append(payload(10))
+        assert journal.pending_count() == 11
+
+        sent = []
+
+        def flaky(payloads):
+            if len(sent) >= 6:
+                raise ConnectionError("offline again")
+            sent.extend(p["data"]["blink_count"] for p in payloads)
+
+        with pytest.raises(ConnectionError):
+            journal.replay(flaky, batch_size=3)
+        # Two batches went through and were acknowledged; the third is still pending
+        assert sent == list(range(6))
+        assert journal.pending_count() == 5
+
+    # Reopen as after a crash: replay continues after the acknowledged offset, without duplicates
+    with OfflineJournal(str(tmp_path / "journal.sqlite3")) as journal:
+        assert journal.replay(lambda payloads: sent.extend(p["data"]["blink_count"] for p in payloads)) == 5
+        assert sent == list(range(11))
+        assert journal.pending_count() == 0
+        assert journal.read_batch() == []
+
+
+def test_compaction_removes_acknowledged_rows(tmp_path):
+    with OfflineJournal(str(tmp_path / "journal.sqlite3")) as journal:
+        journal.append_many([payload(i) for i in range(5)])
+        journal.ack(3)
+        assert journal.compact() == 3
+        assert [seq for seq, _ in journal.read_batch()] == [4, 5]
+        # Sequence numbers keep increasing after compaction
+        assert journal.append(payload(5)) == 6
+
+
+def test_migrates_legacy_json_files(tmp_path):
+    for i in range(3):
+        with open(tmp_path / f"offline_viewer_movie_{i}.json", "w", encoding="utf-8") as f:
+            json.dump(payload(i), f)
+    (tmp_path / "notes.json").write_text("{}")
+    with OfflineJournal(str(tmp_path / "journal.sqlite3")) as journal:
+        assert journal.migrate_json_dir(str(tmp_path)) == 3
+        assert [p for _, p in journal.read_batch()] == [payload(i) for i in range(3)]
+    assert not any(name.startswith("offline_") for name in os.listdir(tmp_path))
@@ -1,33 +1,86 @@
 import os
+import re
 import sys
 import tempfile
 from PyQt6.QtWidgets import QApplication
 from overlay_title import OverlayTitleLabel
+from release_names import EXTENSIONS, SAMPLE_FILE_NAMES, TAGS, random_release_names
+from title_parser import ParsedTitle, parse, slug
 
-# Test filenames for extraction edge cases
-test_filenames = [
-    'Pravinkoodu.Shappu.2025.DS4K.1080p.SONYLIV.WEBRip.DD.mkv',
-    'The.Godfather.Part.II.1974.1080p.BluRay.x264.YIFY.mp4',
-    'Inception_2010_720p_WEB-DL.mkv',
-    'Friends.S05E14.The.One.Where.Everybody.Finds.Out.720p.HDTV.x264.mkv',
-    '12.Angry.Men.1957.1080p.BluRay.x265.HEVC.AAC-SARTRE.mkv',
-    'Chernobyl.S01E05.Vichnaya.Pamyat.2019.1080p.WEBRip.HEVC.x265.mkv',
-    'Movie.without.tags.mkv',
-    'S01E01.mkv',
-    'pr.mkv',
-    'Avatar.2009.2160p.UHD.BluRay.x265.mkv',
-    'Some.Movie.2022.mp4',
-    'Old_Movie.1939.avi',
-    'Show.Name.S2E3.720p.mkv',
-    'Edge_Case_OnlyYear.2020.mkv',
-    'Strange-File-Name-__.mkv',
+app = QApplication.instance() or QApplication(sys.argv)
+
+# Expected (title, year, episode) for SAMPLE_FILE_NAMES, in order
+expected_titles = [
+    ('Pravinkoodu Shappu 2025', 2025, None),
+    ('The Godfather Part Ii 1974', 1974, None),
+    ('Inception 2010', 2010, None),
+    ('Friends S05E14 The One Where Everybody Finds Out', None, 'S05E14'),
+    ('12 Angry Men 1957', 1957, None),
+    ('Chernobyl S01E05 Vichnaya Pamyat 2019', 2019, 'S01E05'),
+    ('Movie Without Tags', None, None),
+    ('S01E01', None, 'S01E01'),
+    ('Pr', None, None),
+    ('Avatar 2009', 2009, None),
+    ('Some Movie 2022', 2022, None),
+    ('Old Movie 1939', 1939, None),
+    ('Show Name S2E3', None, 'S02E03'),
+    ('Edge Case Onlyyear 2020', 2020, None),
+    ('Strange-File-Name', None, None),
 ]
 
+def test_parse_known_filenames():
+    assert [tuple(parse(f)) for f in SAMPLE_FILE_NAMES] == expected_titles
+    assert parse('The.Matrix.(1999).1080p.mkv') == ParsedTitle('The Matrix (1999)', 1999, None)
+    assert parse('/videos/Some.Movie.2022.mp4') == parse('Some.Movie.2022.mp4')
+    # Tags in front of the title are skipped rather than leaving nothing to cut
+    assert parse('1080p.Movie.Name.mkv') == ParsedTitle('Movie Name', None, None)
+    assert parse('WEB-DL.x264.The.Movie.2020.mkv').title == 'The Movie 2020'
+    # ... but tag words that can be title words are kept
+    for file_name, title in (('Galaxy.Quest.1999.1080p.mkv', 'Galaxy Quest 1999'),
+                             ('Extended.Family.2023.mkv', 'Extended Family 2023'),
+                             ('Apple.Tree.Yard.2017.mkv', 'Apple Tree Yard 2017'),
+                             ('Cam.2018.1080p.mkv', 'Cam 2018'),
+                             ('Prime.Suspect.S01E01.mkv', 'Prime Suspect S01E01')):
+        assert parse(file_name).title == title, file_name
+    assert slug(parse('Extended.Family.2023.mkv').title) != slug(parse('Family.2023.mkv').title)
+
+
+def test_parse_properties():
+    for file_name, words, year, episode in random_release_names(500):
+        parsed = parse(file_name)
+        expected = ' '.join(words + ([episode] if episode else []) + ([str(year)] if year else []))
+        assert parsed.title == expected.title(), file_name
+        assert parsed.year == year and parsed.episode == episode, file_name
+        # No tag or extension survives, and parsing is memoized
+        assert not any(tag.lower() in parsed.title.lower().split() for tag in TAGS + EXTENSIONS), file_name
+        assert parse(file_name) is parsed
+
+
+def test_slug_properties():
+    for file_name, _, _, _ in random_release_names(200, seed=1):
+        value = slug(parse(file_name).title)
+        assert re.fullmatch(r'[a-z0-9]+(_[a-z0-9]+)*', value), value
+        assert slug(value) == value
+    assert slug('Friends S05E14 The One') == 'friends_s05e14_the_one'
+    assert slug('__A--b__') == 'a_b'
+
+
+def test_overlay_and_title_bar_agree():
+    from window_controls import ModernWindowControls
+    label = OverlayTitleLabel()
+    controls = ModernWindowControls()
+    for fname in SAMPLE_FILE_NAMES:
+        label.show_title(fname, duration=100)
+        controls.set_title(fname)
+        title = parse(fname).title
+        assert title in label.text() and f"{title} |" in controls.titleLabel.text()
+
+
 def run_title_extraction_tests():
-    app = QApplication(sys.argv)
+    app = QApplication.instance() or QApplication(sys.argv)
     label = OverlayTitleLabel()
     print("\n--- Overlay Title Extraction Tests ---")
-    for fname in test_filenames:
+    for fname in SAMPLE_FILE_NAMES:
         label.show_title(fname, duration=100)
         # Extracted HTML text (for display)
         print(f"File: {fname}\n  Overlay: {label.text()}")
@@ -45,7 +98,7 @@ def test_font_fallback():
         temp_path = font_path + '.bak'
         os.rename(font_path, temp_path)
     try:
-        app = QApplication(sys.argv)
+        app = QApplication.instance() or QApplication(sys.argv)
         label = OverlayTitleLabel()
         print("\n[Font Fallback Test] Font should fall back to Arial if Gotham is missing.")
         print(f"Font used: {label.font().family()}")
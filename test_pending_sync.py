@@ -0,0 +1,86 @@
+import pytest
+
+from offline_journal import OfflineJournal
+from pending_sync import PendingDrainer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def fill(journal, n):
+    journal.append_many([{"collection_name": "viewer_movie", "data": {"blink_count": i}} for i in range(n)])
+
+
+def test_drain_is_rate_limited_and_reports_progress(tmp_path):
+    clock = FakeClock()
+    sent, progress = [], []
+    with OfflineJournal(str(tmp_path / "journal.sqlite3")) as journal:
+        fill(journal, 250)
+        drainer = PendingDrainer(journal, sent.extend, batch_size=100, max_rate=50.0, clock=clock, sleep=clock.sleep)
+        assert drainer.drain(on_progress=lambda *p: progress.append(p)) == 250
+        assert journal.pending_count() == 0
+    assert len(sent) == 250
+    assert progress == [(100, 150), (200, 50), (250, 0)]
+    # 100 events at 50/s: two seconds between batches, no pause after the last one
+    assert clock.slept == [2.0, 2.0]
+
+
+def test_interrupted_drain_resumes(tmp_path):
+    path = str(tmp_path / "journal.sqlite3")
+    sent = []
+
+    def failing(payloads):
+        if len(sent) >= 20:
+            raise ConnectionError("lost connection")
+        sent.extend(p["data"]["blink_count"] for p in payloads)
+
+    with OfflineJournal(path) as journal:
+        fill(journal, 50)
+        with pytest.raises(ConnectionError):
+            PendingDrainer(journal, failing, batch_size=10, max_rate=None).drain()
+
+    # A new process picks up after the last acknowledged batch
+    with OfflineJournal(path) as journal:
+        drainer = PendingDrainer(journal, lambda ps: sent.extend(p["data"]["blink_count"] for p in ps),
+                                 batch_size=10, max_rate=None)
+        assert drainer.drain() == 30
+    assert sent == list(range(50))
+
+
+def test_drain_stops_when_offline_or_asked(tmp_path):
+    online = [True]
+    sent = []
+
+    def send(payloads):
+        sent.extend(payloads)
+        if len(sent) == 10:
+            online[0] = False
+
+    with OfflineJournal(str(tmp_path / "journal.sqlite3")) as journal:
+        fill(journal, 30)
+        drainer = PendingDrainer(journal, send, batch_size=10, max_rate=None, is_online=lambda: online[0])
+        assert drainer.drain() == 10
+        online[0] = True
+        assert drainer.drain(should_stop=lambda: len(sent) >= 20) == 10
+        assert journal.pending_count() == 10
+
+
+def test_drain_compacts_every_compact_every_events(tmp_path):
+    with OfflineJournal(str(tmp_path / "journal.sqlite3"), compact_every=100) as journal:
+        fill(journal, 250)
+        compacted = []
+        compact = journal.compact
+        journal.compact = lambda: compacted.append(compact())
+        assert PendingDrainer(journal, lambda payloads: None, batch_size=10, max_rate=None).drain() == 250
+    # After 100 and 200 events and once at the end, not after each of the 25 batches
+    assert compacted == [100, 100, 50]
@@ -0,0 +1,73 @@
+import threading
+import time
+
+from row_forwarder import RowForwarder
+
+
+class Source:
+    """Pretends to be a tailer: every notify() corresponds to one new row."""
+    def __init__(self):
+        self.rows = []
+        self.reads = 0
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def write(self, row):
+        with self._lock:
+            self.rows.append(row)
+
+    def read(self):
+        self.threads.add(threading.current_thread().name)
+        with self._lock:
+            rows, self.rows = self.rows, []
+        self.reads += 1
+        return rows
+
+
+def test_burst_is_coalesced_into_one_batch_off_the_caller_thread():
+    source, batches = Source(), []
+    forwarder = RowForwarder(source.read, batches.append, debounce=0.05, max_delay=5.0)
+    forwarder.start()
+    for i in range(50):
+        source.write(i)
+        forwarder.notify()
+    time.sleep(0.3)
+    stats = forwarder.stats()
+    forwarder.stop()
+    assert batches == [list(range(50))]
+    assert source.threads == {"RowForwarder"}
+    assert stats['events'] == 50 and stats['batches'] == 1 and stats['events_coalesced'] == 49
+    assert stats['rows_forwarded'] == 50 and stats['lag_seconds'] == 0.0
+
+
+def test_steady_stream_is_forwarded_within_max_delay():
+    source, batches = Source(), []
+    forwarder = RowForwarder(source.read, batches.append, debounce=0.05, max_delay=0.1)
+    forwarder.start()
+    # Events every 20 ms never leave a 50 ms quiet gap; max_delay still forces batches out
+    for i in range(30):
+        source.write(i)
+        forwarder.notify()
+        time.sleep(0.02)
+    forwarder.stop()
+    assert len(batches) >= 3
+    assert [row for batch in batches for row in batch] == list(range(30))
+
+
+def test_stop_forwards_pending_rows_and_errors_are_counted():
+    source = Source()
+    calls = []
+
+    def flaky(rows):
+        calls.append(rows)
+        if len(calls) == 1:
+            raise RuntimeError("uploader down")
+
+    forwarder = RowForwarder(source.read, flaky, debounce=10.0, max_delay=10.0)
+    forwarder.start()
+    source.write("a")
+    forwarder.notify()
+    forwarder.stop()
+    assert calls == [["a"]]
+    assert forwarder.stats()['errors'] == 1
+    assert not forwarder.is_alive()
@@ -0,0 +1,131 @@
+import json
+import os
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from blink_log_writer import BlinkLogWriter
+from session_store import REALTIME_LOG_HEADER, SessionWriter, convert_csv, list_sessions, load_session, write_session
+
+
+def test_writer_round_trip_is_memory_mapped(tmp_path):
+    path = str(tmp_path / "movie_20250101_200000")
+    with SessionWriter(path, chunk_size=7, movie_name="movie", user_name="viewer") as writer:
+        for i in range(20):
+            writer.append(1_700_000_000_000 + 50 * i, 1000 + 50 * i if i % 4 else None,
+                          None if i == 3 else 0.3 - 0.01 * (i % 5), i in (6, 13))
+    session = load_session(path)
+    assert isinstance(session.t_ms, np.memmap) and session.t_ms.dtype == np.int64
+    assert len(session) == 20 and session.meta['rows'] == 20 and session.meta['blinks'] == 2
+    assert session.meta['user_name'] == "viewer"
+    assert session.media_position_ms[0] == -1 and session.media_position_ms[1] == 1050
+    assert np.isnan(session.ear[3]) and session.ear.dtype == np.float32
+    assert list(session.blink_times() - 1_700_000_000_000) == [300, 650]
+    assert list_sessions(str(tmp_path)) == [path]
+
+
+def test_converts_per_movie_csv_log(tmp_path):
+    csv_path = str(tmp_path / "Some.Movie.2001.csv")
+    with BlinkLogWriter(csv_path) as writer:
+        for row in (['08:15:01 PM', '0:00:01', 1], ['08:15:01 PM', '0:00:01', 2], ['08:15:09 PM', '0:00:09', 3]):
+            writer.append(row)
+    os.utime(csv_path, (datetime(2025, 4, 25, 21).timestamp(),) * 2)
+    session = load_session(convert_csv(csv_path, str(tmp_path / "sessions")))
+    first = int(datetime.combine(date(2025, 4, 25), datetime.strptime('20:15:01', '%H:%M:%S').time()).timestamp() * 1000)
+    assert list(session.t_ms) == [first, first, first + 8000]
+    assert session.blink.all() and np.isnan(session.ear).all()
+    assert session.meta['source'] == "Some.Movie.2001.csv"
+
+
+def test_converts_realtime_log_and_rejects_other_csv(tmp_path):
+    csv_path = tmp_path / "realtime_log.csv"
+    # Two detection runs: the count starts over at the fourth row
+    csv_path.write_text(','.join(REALTIME_LOG_HEADER) + "\n"
+                        "2025-04-25 13:33:00,0:00:05,1,default\n2025-04-25 13:33:01,0:00:06,3,default\n"
+                        "2025-04-25 13:33:04,0:00:09,4,default\n2025-04-25 14:00:00,0:00:02,1,default\n",
+                        encoding='utf-8')
+    session = load_session(convert_csv(str(csv_path), str(tmp_path / "sessions")))
+    first = int(datetime(2025, 4, 25, 13, 33).timestamp() * 1000)
+    assert list(session.t_ms - first) == [0, 1000, 1000, 4000, 1620000]
+    assert session.meta['movie_name'] == "default" and session.blink.all()
+
+    other = tmp_path / "other.csv"
+    other.write_text("a,b\n1,2\n", encoding='utf-8')
+    with pytest.raises(ValueError, match="not a blink, event or realtime log"):
+        convert_csv(str(other), str(tmp_path / "sessions"))
+
+
+def test_direct_read_of_selected_columns(tmp_path):
+    path = str(tmp_path / "s")
+    write_session(path, {'t_ms': [5, 6, 7], 'media_position_ms': [0, 40, -1], 'ear': [0.3, 0.2, 0.1],
+                         'blink': [False, True, False]})
+    session = load_session(path, mmap=False, fields=('media_position_ms', 'blink'))
+    assert not isinstance(session.media_position_ms, np.memmap)
+    assert list(session.media_position_ms) == [0, 40, -1] and list(session.blink) == [False, True, False]
+    assert not hasattr(session, 'ear') and len(session) == 3
+
+
+def test_full_chunks_reach_disk_before_close(tmp_path):
+    path = str(tmp_path / "live")
+    writer = SessionWriter(path, chunk_size=4, movie_name="movie")
+    for i in range(10):
+        writer.append(1000 + i, i, 0.3, i == 5)
+    # Two full chunks written; the last two samples are still in the buffer
+    session = load_session(path)
+    assert len(session) == 8 and list(session.t_ms) == list(range(1000, 1008))
+    assert session.meta['blinks'] == 1 and session.meta['movie_name'] == "movie"
+    writer.close()
+    assert len(load_session(path)) == 10
+
+
+def test_resume_appends_to_the_same_session(tmp_path):
+    path = str(tmp_path / "movie_20250101_200000")
+    with SessionWriter(path, chunk_size=3, movie_name="movie", threshold=0.2) as writer:
+        for i in range(5):
+            writer.append(1000 + i, i, 0.3, i == 1)
+    with SessionWriter(path, chunk_size=3, threshold=0.21) as writer:
+        for i in range(4):
+            writer.append(5000 + i, 100 + i, 0.3, i == 2)
+    session = load_session(path)
+    assert len(session) == 9 and session.meta['blinks'] == 2
+    assert session.meta['segments'] == [0, 5]
+    assert (session.meta['start_ms'], session.meta['end_ms']) == (1000, 5003)
+    assert session.meta['movie_name'] == "movie" and session.meta['threshold'] == 0.21
+    assert list(session.media_position_ms[4:6]) == [4, 100]
+    # append=False starts over
+    write_session(path, {'t_ms': [1], 'media_position_ms': [-1], 'ear': [0.3], 'blink': [False]})
+    assert len(load_session(path)) == 1 and load_session(path).meta['segments'] == [0]
+
+
+def test_crashed_session_keeps_completed_chunks(tmp_path):
+    path = str(tmp_path / "crashed")
+    writer = SessionWriter(path, chunk_size=4)
+    for i in range(6):
+        writer.append(i, i, 0.3, False)
+    # Crash mid-write: part of the next chunk reached one column file, meta.json was not updated
+    with open(os.path.join(path, 't_ms.npy'), 'ab') as f:
+        f.write(np.arange(3, dtype=np.int64).tobytes())
+    assert list(load_session(path).t_ms) == list(load_session(path, mmap=False).t_ms) == [0, 1, 2, 3]
+    with SessionWriter(path, chunk_size=4) as resumed:
+        resumed.append(100, 100, 0.3, True)
+    session = load_session(path)
+    assert list(session.t_ms) == [0, 1, 2, 3, 100] and list(session.blink) == [False] * 4 + [True]
+
+
+def test_resume_session_saved_with_np_save(tmp_path):
+    path = tmp_path / "legacy"
+    path.mkdir()
+    columns = {'t_ms': np.array([1, 2], np.int64), 'media_position_ms': np.array([-1, -1], np.int64),
+               'ear': np.array([0.3, 0.1], np.float32), 'blink': np.array([False, True])}
+    for name, column in columns.items():
+        np.save(path / f"{name}.npy", column)
+    (path / "meta.json").write_text(json.dumps({'format_version': 1, 'rows': 2, 'blinks': 1, 'start_ms': 1,
+                                                'end_ms': 2, 'fields': {}}), encoding='utf-8')
+    with SessionWriter(str(path)) as writer:
+        writer.append(3, 40, 0.3, False)
+    session = load_session(str(path))
+    assert list(session.t_ms) == [1, 2, 3] and list(session.media_position_ms) == [-1, -1, 40]
+    assert np.allclose(session.ear, [0.3, 0.1, 0.3])
+    # The re-laid-out columns read the same without the memory map
+    assert list(load_session(str(path), mmap=False).media_position_ms) == [-1, -1, 40]
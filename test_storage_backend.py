@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from storage_backend import FIRESTORE_MAX_BATCH, BackendError, FakeBackend, FirestoreBackend, StorageBackend, as_backend
+from upload_worker import UploadWorker
+
+
+def payload(i):
+    return {"collection_name": "viewer_movie", "data": {"blink_count": i}}
+
+
+def test_injected_failures_store_nothing(tmp_path):
+    path = tmp_path / "docs.jsonl"
+    backend = FakeBackend(path=str(path))
+    backend.fail_next()
+    with pytest.raises(BackendError):
+        backend.commit_batch([payload(0), payload(1)])
+    backend.commit_batch([payload(i) for i in range(FIRESTORE_MAX_BATCH + 1)])
+    backend.add("viewer_movie", {"blink_count": -1})
+    # One failed round trip, two for the oversized batch, one for add()
+    assert (backend.round_trips, backend.failures, backend.committed) == (4, 1, FIRESTORE_MAX_BATCH + 2)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == FIRESTORE_MAX_BATCH + 2
+    assert json.loads(lines[0]) == payload(0)
+
+
+def test_worker_hands_failed_batches_back():
+    backend = FakeBackend(failure_rate=0.5, seed=3)
+    failed = []
+    worker = UploadWorker(backend, max_batch_size=5, max_latency=0.01, on_failure=failed.extend)
+    worker.start()
+    for i in range(100):
+        worker.enqueue(payload(i))
+    worker.stop()
+    stats = worker.stats()
+    assert backend.failures and failed
+    assert stats['events_committed'] + stats['events_failed'] == 100
+    committed = {data["blink_count"] for _, data in backend.docs}
+    assert committed | {p["data"]["blink_count"] for p in failed} == set(range(100))
+    assert not committed & {p["data"]["blink_count"] for p in failed}
+
+
+def test_backends_must_implement_both_writes():
+    class AddOnly(StorageBackend):
+        def add(self, collection_name, data):
+            pass
+
+    with pytest.raises(TypeError):
+        StorageBackend()
+    with pytest.raises(TypeError):
+        AddOnly()
+    assert isinstance(as_backend(FakeBackend()), FakeBackend)
+    assert isinstance(as_backend(lambda: None), FirestoreBackend)
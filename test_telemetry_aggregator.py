@@ -0,0 +1,113 @@
+import pytest
+
+from blink_log_writer import BlinkLogWriter
+from session_store import SessionWriter
+from telemetry_aggregator import (EVENT_LOG_HEADER, TelemetryAggregator, aggregate, aggregate_blink_log,
+                                  aggregate_event_log, aggregate_session)
+
+
+def frames(seconds, fps=10, blink_at=(), media_offset=0):
+    """(t_ms, ear, media_position_ms, blinks) for a steady stream with blinks at the given ms."""
+    for i in range(int(seconds * fps)):
+        t = i * 1000 // fps
+        yield t, 0.3, t + media_offset, int(t in blink_at)
+
+
+def test_fixed_windows():
+    windows = aggregate(frames(25, blink_at=(1000, 9900, 10000, 24000)), mode='10s')
+    assert [(w['window_start_ms'], w['window_end_ms'], w['count']) for w in windows] == \
+        [(0, 10000, 2), (10000, 20000, 1), (20000, 30000, 1)]
+    assert windows[0]['timestamps_ms'] == [1000, 9900]
+    assert windows[1]['media_start_ms'] == 10000 and windows[1]['media_end_ms'] == 19900
+    assert abs(windows[2]['mean_ear'] - 0.3) < 1e-9
+
+
+def test_scene_windows_follow_media_position():
+    windows = aggregate(frames(30, blink_at=(12000,), media_offset=60000), mode='scene',
+                        scene_bounds=[70000, 75000])
+    assert [(w['scene'], w['count']) for w in windows] == [(0, 0), (1, 1), (2, 0)]
+    assert windows[1]['media_start_ms'] == 70000
+
+
+def test_blink_mode_emits_per_blink():
+    aggregator = TelemetryAggregator('blink')
+    assert aggregator.update(0, 0.3) == []
+    [summary] = aggregator.update(100, 0.1, blinks=1)
+    assert summary['count'] == 1 and summary['timestamps_ms'] == [100]
+    assert aggregator.flush() == []
+
+
+def record_live_session(tmp_path, session_start_ms=1_700_000_000_000):
+    """
+    Run a 35 s session the way BlinkCounterThread does: every frame goes to the session store,
+    frames with a face to the aggregator, blinks to the event log. Returns (live windows, session, event log).
+    """
+    session_path = str(tmp_path / "session")
+    events_path = str(tmp_path / "events.csv")
+    live = TelemetryAggregator('10s')
+    windows = []
+    count = 0
+    with SessionWriter(session_path, chunk_size=64, session_start_ms=session_start_ms) as session, \
+            BlinkLogWriter(events_path, header=EVENT_LOG_HEADER) as events:
+        for i in range(350):
+            t = i * 100
+            ear = None if 150 <= i < 160 else 0.3 - 0.001 * (i % 7)
+            blink = i in (12, 85, 99, 310)
+            if blink:
+                count += 1
+                events.append([t, '', count, f"{ear:.4f}", 5000 + t])
+            if ear is not None:
+                windows += live.update(t, ear, 5000 + t, int(blink))
+            session.append(session_start_ms + t, 5000 + t, ear, blink)
+    windows += live.flush()
+    return windows, session_path, events_path
+
+
+def test_session_replay_matches_live_aggregation(tmp_path):
+    live, session_path, _ = record_live_session(tmp_path)
+    replayed = aggregate_session(session_path, '10s')
+    assert len(replayed) == len(live) == 4
+    for offline, online in zip(replayed, live):
+        assert offline['mean_ear'] == pytest.approx(online['mean_ear'], abs=1e-6)
+        assert dict(offline, mean_ear=None) == dict(online, mean_ear=None)
+
+
+def test_event_log_reproduces_blink_counts_only(tmp_path):
+    live, _, events_path = record_live_session(tmp_path)
+    from_events = aggregate_event_log(events_path, '10s')
+    # No blinks between 10 and 30 s, so the event log has nothing to show for those windows
+    assert [w['window_start_ms'] for w in from_events] == [0, 30000]
+    with_blinks = [w for w in live if w['count']]
+    assert [(w['window_start_ms'], w['count'], w['timestamps_ms']) for w in from_events] == \
+        [(w['window_start_ms'], w['count'], w['timestamps_ms']) for w in with_blinks]
+
+
+def test_blink_log_aggregation(tmp_path):
+    legacy = str(tmp_path / "movie.csv")
+    with BlinkLogWriter(legacy) as writer:
+        for row in (['', '0:00:01', 1], ['', '0:00:01', 2], ['', '0:00:12', 3]):
+            writer.append(row)
+    assert [(w['count'], w['timestamps_ms']) for w in aggregate_blink_log(legacy, '10s')] == \
+        [(2, [1000, 1000]), (1, [12000])]
+
+
+def test_paused_session_replays_like_the_live_threads(tmp_path):
+    # Two threads for one viewing session: 0-14 s, paused, then 22-35 s on the same clock
+    path = str(tmp_path / "session")
+    start_ms = 1_700_000_000_000
+    windows = []
+    for first, last in ((0, 140), (220, 350)):
+        live = TelemetryAggregator('10s')
+        with SessionWriter(path, chunk_size=64, session_start_ms=start_ms) as session:
+            for i in range(first, last):
+                t = i * 100
+                blink = i in (50, 120, 230)
+                windows += live.update(t, 0.3, t, int(blink))
+                session.append(start_ms + t, t, 0.3, blink)
+        # Each thread flushes its open window when playback pauses
+        windows += live.flush()
+    replayed = aggregate_session(path, '10s')
+    assert [(w['window_start_ms'], w['count']) for w in windows] == \
+        [(0, 1), (10000, 1), (20000, 1), (30000, 0)]
+    assert [(w['window_start_ms'], w['count'], w['timestamps_ms']) for w in replayed] == \
+        [(w['window_start_ms'], w['count'], w['timestamps_ms']) for w in windows]
@@ -0,0 +1,77 @@
+import sys
+
+import pytest
+from PyQt6.QtWidgets import QApplication
+
+from time_display import TimeDisplayLabel, format_time
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_format_time():
+    assert format_time(0) == "00:00:00.00"
+    assert format_time(3_723_999) == "01:02:03.99"
+    assert format_time(-61_500) == "00:01:01.50"
+
+
+def test_updates_are_throttled_and_deduplicated():
+    clock = FakeClock()
+    label = TimeDisplayLabel(display_fps=10, clock=clock)
+    renders = label.renders
+    label.set_time(1000, 100_000)
+    assert label.text() == "00:00:01.00 01.00 %" and label.renders == renders + 1
+    # Within the 100 ms display interval: deferred to a trailing update
+    for ms in range(1010, 1060, 10):
+        clock.now += 0.01
+        label.set_time(ms, 100_000)
+    assert label.text() == "00:00:01.00 01.00 %"
+    clock.now += 0.1
+    label._throttle.timeout.emit()
+    assert label.text() == "00:00:01.05 01.05 %" and label.renders == renders + 2
+    # Same strings: no re-render
+    clock.now += 0.2
+    label.set_time(1051, 100_000)
+    assert label.renders == renders + 2
+
+
+def test_remaining_time_and_messages():
+    label = TimeDisplayLabel(clock=FakeClock())
+    label.set_time(30_000, 90_000, show_remaining=True, immediate=True)
+    assert label.text() == "00:01:00.00 33.33 %"
+    label.set_message("Error: no such file")
+    assert label.text() == "Error: no such file"
+    label.set_time(30_000, 90_000, show_remaining=True, immediate=True)
+    assert label.text() == "00:01:00.00 33.33 %"
+    assert label.sizeHint().width() > 0
+    label.grab()
+
+
+def test_size_hint_fits_long_messages():
+    label = TimeDisplayLabel(clock=FakeClock())
+    time_width = label.sizeHint().width()
+    label.set_message("Error: the media could not be loaded because the file format is not supported")
+    assert label.sizeHint().width() > time_width
+    assert label.sizeHint().width() >= label.fontMetrics().horizontalAdvance(label.text())
+    label.set_message("Error")
+    assert label.sizeHint().width() == time_width
+    label.set_time(0, 0, immediate=True)
+    assert label.sizeHint().width() == time_width
+
+
+def test_display_fps_must_be_positive():
+    with pytest.raises(ValueError):
+        TimeDisplayLabel(display_fps=0)
+    label = TimeDisplayLabel(clock=FakeClock())
+    for fps in (0, -5):
+        with pytest.raises(ValueError):
+            label.set_display_fps(fps)
+    label.set_display_fps(5)
+    assert label._interval == 0.2
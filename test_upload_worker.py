@@ -0,0 +1,76 @@
+import time
+
+from storage_backend import FakeBackend
+from upload_worker import UploadWorker
+
+
+def payload(i):
+    return {"collection_name": "viewer_movie", "data": {"blink_count": i}}
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+def test_full_batches_then_partial_batch_on_stop():
+    backend = FakeBackend()
+    worker = UploadWorker(backend, max_batch_size=4, max_latency=60.0)
+    # Queued before the thread starts, so batching does not depend on timing
+    for i in range(10):
+        worker.enqueue(payload(i))
+    worker.start()
+    worker.stop()
+    # Two full batches, then the remaining two flushed when the worker stops
+    assert backend.round_trips == 3
+    assert [data["blink_count"] for _, data in backend.docs] == list(range(10))
+    stats = worker.stats()
+    assert (stats['batches_committed'], stats['events_committed'], stats['queue_depth']) == (3, 10, 0)
+
+
+def test_partial_batch_flushed_after_max_latency():
+    backend = FakeBackend()
+    worker = UploadWorker(backend, max_batch_size=50, max_latency=0.05)
+    worker.start()
+    try:
+        worker.enqueue(payload(0))
+        worker.enqueue(payload(1))
+        assert wait_for(lambda: backend.committed == 2)
+        assert backend.round_trips == 1
+        assert worker.stats()['mean_queue_wait'] >= 0.0
+    finally:
+        worker.stop()
+
+
+def test_offline_batches_are_handed_back_without_a_round_trip():
+    backend = FakeBackend()
+    failed = []
+    reconnects = []
+    online = [False]
+    worker = UploadWorker(backend, max_batch_size=2, max_latency=60.0, is_online=lambda: online[0],
+                          on_failure=failed.extend, on_reconnect=lambda: reconnects.append(True))
+    worker.enqueue(payload(0))
+    worker.enqueue(payload(1))
+    worker.start()
+    assert wait_for(lambda: len(failed) == 2)
+    assert backend.round_trips == 0 and not reconnects
+    online[0] = True
+    worker.enqueue(payload(2))
+    worker.stop()
+    assert backend.committed == 1 and reconnects == [True]
+    assert worker.stats()['events_failed'] == 2
+
+
+def test_failed_commit_counts_as_failure():
+    backend = FakeBackend()
+    backend.fail_next()
+    failed = []
+    worker = UploadWorker(backend, max_batch_size=3, max_latency=60.0, on_failure=failed.extend)
+    for i in range(4):
+        worker.enqueue(payload(i))
+    worker.start()
+    worker.stop()
+    assert [p["data"]["blink_count"] for p in failed] == [0, 1, 2]
+    assert [data["blink_count"] for _, data in backend.docs] == [3]
@@ -0,0 +1,32 @@
+import sys
+
+from PyQt6.QtWidgets import QApplication
+
+from window_controls import ModernWindowControls
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+def test_branding_shine_stops_when_hidden_and_reuses_frames():
+    controls = ModernWindowControls()
+    label = controls.brandingLabel
+    assert not label.timer.isActive()
+    controls.resize(400, 30)
+    controls.show()
+    assert label.timer.isActive()
+    assert label.sizeHint() is label.sizeHint()
+
+    frames = set()
+    for _ in range(3 * (label.width() + label.SHINE_TAIL) // label.SHINE_STEP):
+        label.animate()
+        label.grab()
+        frames.add(id(label._frames[label.offset]))
+    # One sprite per shine position, rendered once and reused on later sweeps
+    assert len(frames) == len(label._frames) == -(-(label.width() + label.SHINE_TAIL) // label.SHINE_STEP)
+
+    controls.set_branding_visible(False)
+    assert not label.timer.isActive()
+    controls.set_branding_visible(True)
+    assert label.timer.isActive()
+    controls.hide()
+    assert not label.timer.isActive()
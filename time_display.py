@@ -0,0 +1,169 @@
+import math
+import time
+
+from PyQt6.QtCore import Qt, QTimer, QSize, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter, QStaticText, QTransform
+from PyQt6.QtWidgets import QLabel
+
+import font_registry
+
+DEFAULT_DISPLAY_FPS = 20
+TIME_COLOR = QColor('#e0e6f0')
+PERCENT_COLOR = QColor('#4f8cff')
+PERCENT_GAP = 16
+# Widest strings the label can show, used for a stable size hint
+_WIDEST_TIME = '00:00:00.00'
+_WIDEST_PERCENT = '100.00 %'
+
+
+def format_time(ms):
+    """Playback time as HH:MM:SS.cc; negative times (time remaining) are shown as their magnitude."""
+    total_seconds = abs(ms) // 1000
+    cs_part = (abs(ms) % 1000) // 10  # centiseconds, 2 digits
+    hours = total_seconds // 3600
+    minutes = (total_seconds % 3600) // 60
+    seconds = total_seconds % 60
+    return f"{hours:02}:{minutes:02}:{seconds:02}.{cs_part:02}"  # Always show centiseconds
+
+
+def format_percent(pos_ms, dur_ms):
+    percent = (pos_ms / dur_ms * 100) if dur_ms else 0.0
+    return f"{percent:05.2f} %"
+
+
+def _plain_static_text():
+    text = QStaticText()
+    text.setTextFormat(Qt.TextFormat.PlainText)
+    return text
+
+
+class TimeDisplayLabel(QLabel):
+    """
+    Playback time and percentage label for the controls bar.
+
+    `set_time()` can be called on every positionChanged: the text is re-rendered at most
+    `display_fps` times per second (the latest value is always shown once the throttle interval
+    passes), nothing is redrawn when the formatted strings did not change, and the strings are
+    drawn from cached QStaticText layouts instead of re-parsing rich text. Still a QLabel, so
+    the QLabel#timeLabel stylesheet (margins, minimum width) keeps applying.
+    """
+    clicked = pyqtSignal()
+
+    def __init__(self, parent=None, display_fps=DEFAULT_DISPLAY_FPS, clock=time.monotonic):
+        super().__init__(parent)
+        self.clock = clock
+        self.set_display_fps(display_fps)
+        self._last_render = None
+        self._pending = None
+        self._throttle = QTimer(self)
+        self._throttle.setSingleShot(True)
+        self._throttle.timeout.connect(self._render_pending)
+        self._time_font = font_registry.font('time')
+        self._percent_font = font_registry.font('time_percent')
+        self._time_text = _plain_static_text()
+        self._percent_text = _plain_static_text()
+        self._time_key = None
+        self._message = None
+        self._text_size = None
+        self.renders = 0
+        self._show(format_time(0), format_percent(0, 0))
+
+    def set_display_fps(self, display_fps):
+        if not display_fps > 0:
+            raise ValueError(f"display_fps must be positive, got {display_fps!r}")
+        self._interval = 1.0 / display_fps
+
+    def set_time(self, pos_ms, dur_ms, show_remaining=False, immediate=False):
+        """Show `pos_ms` (or the time remaining) and the percentage watched, throttled."""
+        self._pending = (pos_ms, dur_ms, show_remaining)
+        now = self.clock()
+        if immediate or self._last_render is None or now - self._last_render >= self._interval:
+            self._throttle.stop()
+            self._render_pending()
+        elif not self._throttle.isActive():
+            # Trailing update, so the final position is shown even if no further call arrives
+            self._throttle.start(max(1, int((self._last_render + self._interval - now) * 1000)))
+
+    def set_message(self, message):
+        """Replace the time with a plain message (e.g. a playback error) until the next set_time()."""
+        self._throttle.stop()
+        self._pending = None
+        self._message = _plain_static_text()
+        self._message.setText(message)
+        self._message.prepare(QTransform(), self.font())
+        self._time_key = None
+        # A long message may need more room than the time does
+        self.updateGeometry()
+        self.update()
+
+    def _render_pending(self):
+        if self._pending is None:
+            return
+        pos_ms, dur_ms, show_remaining = self._pending
+        self._pending = None
+        self._last_render = self.clock()
+        if show_remaining and dur_ms > 0:
+            time_str = format_time(pos_ms - dur_ms)
+        else:
+            time_str = format_time(pos_ms)
+        self._show(time_str, format_percent(pos_ms, dur_ms))
+
+    def _show(self, time_str, percent_str):
+        if self._message is None and (time_str, percent_str) == self._time_key:
+            return
+        if self._message is not None:
+            self._message = None
+            self.updateGeometry()
+        self._time_key = (time_str, percent_str)
+        self._time_text.setText(time_str)
+        self._time_text.prepare(QTransform(), self._time_font)
+        self._percent_text.setText(percent_str)
+        self._percent_text.prepare(QTransform(), self._percent_font)
+        self.renders += 1
+        self.update()
+
+    def text(self):
+        if self._message is not None:
+            return self._message.text()
+        return f"{self._time_text.text()} {self._percent_text.text()}"
+
+    def sizeHint(self):
+        if self._text_size is None:
+            time_fm = font_registry.metrics('time')
+            percent_fm = font_registry.metrics('time_percent')
+            width = time_fm.horizontalAdvance(_WIDEST_TIME) + PERCENT_GAP + percent_fm.horizontalAdvance(_WIDEST_PERCENT)
+            self._text_size = QSize(width, max(time_fm.height(), percent_fm.height()))
+        size = self._text_size
+        if self._message is not None:
+            message = self._message.size()
+            size = size.expandedTo(QSize(math.ceil(message.width()), math.ceil(message.height())))
+        return size.grownBy(self.contentsMargins())
+
+    def minimumSizeHint(self):
+        return self.sizeHint()
+
+    def mousePressEvent(self, event):
+        self.clicked.emit()
+        super().mousePressEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        rect = self.contentsRect()
+        if self._message is not None:
+            painter.setFont(self.font())
+            painter.setPen(TIME_COLOR)
+            size = self._message.size()
+            painter.drawStaticText(int(rect.left()), int(rect.center().y() - size.height() / 2), self._message)
+            painter.end()
+            return
+        painter.setFont(self._time_font)
+        painter.setPen(TIME_COLOR)
+        time_size = self._time_text.size()
+        total = time_size.width() + PERCENT_GAP + self._percent_text.size().width()
+        x = rect.left() + max(0.0, (rect.width() - total) / 2)
+        y = rect.center().y() - time_size.height() / 2
+        painter.drawStaticText(int(x), int(y), self._time_text)
+        painter.setFont(self._percent_font)
+        painter.setPen(PERCENT_COLOR)
+        painter.drawStaticText(int(x + time_size.width() + PERCENT_GAP), int(y), self._percent_text)
+        painter.end()
@@ -0,0 +1,82 @@
+"""
+Movie / show title extraction from release-style file names, shared by the overlay, the window
+title bar, the blink logs and the Firestore collection names.
+
+    >>> parse('The.Godfather.Part.II.1974.1080p.BluRay.x264.YIFY.mp4')
+    ParsedTitle(title='The Godfather Part Ii 1974', year=1974, episode=None)
+
+The name is cut after the first year or before the first quality/source tag, whichever comes
+first. Patterns are compiled once and results are memoized, since the same file name is parsed
+on every play, title change and upload.
+"""
+import os
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+_EXTENSION = re.compile(r'\.[^.]+$')
+_SEPARATORS = re.compile(r'[._]+')
+_YEAR = re.compile(r'(?<!\d)(?:19|20)\d{2}(?!\d)')
+_TAGS = re.compile(
+    r'\b(1080p|720p|2160p|4k|8k|blu[- ]?ray|brrip|web[- ]?dl|webrip|hdrip|dvdrip|x264|x265|hevc|aac|ac3|mp3|h264|dsr|'
+    r'ds4k|ds|repack|remux|remastered|subs|dubbed|dual[- ]?audio|proper|uncut|extended|limited|hd|sd|cam|hdtv|yts|'
+    r'yify|rarbg|smg|ettv|etrg|evo|galaxy|mkvcage|mkvhub|sonyliv|amazon|netflix|prime|hotstar|zee5|voot|disney|apple|'
+    r'atv|amzn|hmax|web|tc|ts|dv|rip|hdr|uhd|sdr|avc|vc1|dts|truehd|flac|mka|mks|mkv|mp4|avi|mov|wmv|mpg|mpeg|ogg|'
+    r'ogm|rmvb|rm|divx|xvid|fgt)\b',
+    re.IGNORECASE)
+# Tags that are never title words (resolution, source, codec): only these are skipped in front of a title
+_TECHNICAL_TAGS = re.compile(
+    r'(1080p|720p|2160p|4k|8k|blu[- ]?ray|brrip|web[- ]?dl|webrip|hdrip|dvdrip|hdtv|x264|x265|hevc|h264|avc|xvid|'
+    r'divx|aac|ac3|dts)\b\s*',
+    re.IGNORECASE)
+_TRAILING_PUNCTUATION = re.compile(r'[^\w\s)]+$')
+_WHITESPACE = re.compile(r'\s+')
+_EPISODE = re.compile(r'S(\d{1,2})[\s._-]*E(\d{1,2})', re.IGNORECASE)
+_NON_SLUG = re.compile(r'[^a-zA-Z0-9]+')
+
+
+class ParsedTitle(NamedTuple):
+    title: str                # display title, title-cased, including the year if the name had one
+    year: Optional[int]
+    episode: Optional[str]    # e.g. 'S05E14', zero-padded
+
+
+@lru_cache(maxsize=1024)
+def parse(filename):
+    """Title, year and season/episode of a video file name (a path is reduced to its base name)."""
+    filename = os.path.basename(filename)
+    stem = _EXTENSION.sub('', filename)
+    name = _SEPARATORS.sub(' ', stem).strip()
+    # Technical tags in front of the title (e.g. '1080p.Movie.Name') would cut it down to nothing
+    match_tag = _TECHNICAL_TAGS.match(name)
+    while match_tag:
+        name = name[match_tag.end():]
+        match_tag = _TECHNICAL_TAGS.match(name)
+    match_year = _YEAR.search(name)
+    cut_idx = match_year.end() if match_year else None
+    # Any other tag word opening the name is part of the title ('Extended Family', 'Prime Suspect')
+    match_tag = next((m for m in _TAGS.finditer(name) if m.start() > 0), None)
+    if match_tag:
+        cut_idx = match_tag.start() if cut_idx is None else min(cut_idx, match_tag.start())
+    if cut_idx is not None:
+        # Keep the closing parenthesis of "Title (1999)"
+        if name[cut_idx:cut_idx + 1] == ')':
+            cut_idx += 1
+        name = name[:cut_idx]
+    name = _WHITESPACE.sub(' ', name).strip()
+    name = _TRAILING_PUNCTUATION.sub('', name).strip()
+    if len(name) < 4:
+        # Too little (or nothing) left, e.g. only tags: fall back to the first two words of the name
+        name = ' '.join(_SEPARATORS.sub(' ', stem).split()[:2]) or stem
+    # Only a year that is part of the kept title counts (not one after a tag)
+    year_kept = match_year and not (match_tag and match_tag.start() < match_year.start())
+    year = int(match_year.group()) if year_kept else None
+    match_episode = _EPISODE.search(filename)
+    episode = f"S{int(match_episode.group(1)):02d}E{int(match_episode.group(2)):02d}" if match_episode else None
+    return ParsedTitle(name.title(), year, episode)
+
+
+@lru_cache(maxsize=1024)
+def slug(name):
+    """Lower-case identifier for Firestore collection names: runs of anything else become '_'."""
+    return _NON_SLUG.sub('_', name).strip('_').lower()
@@ -0,0 +1,128 @@
+import queue
+import threading
+import time
+
+from storage_backend import FIRESTORE_MAX_BATCH, as_backend
+
+_STOP = object()
+
+
+class UploadWorker(threading.Thread):
+    """
+    Background thread that drains a queue of viewer-log payloads into Firestore batched writes.
+    Producers (the blink thread) only call `enqueue`, which never blocks on the network.
+    A batch is committed once it holds `max_batch_size` events or its oldest event has waited
+    `max_latency` seconds, whichever comes first.
+
+    `client` is a storage_backend.StorageBackend (e.g. FakeBackend for benchmarks) or anything
+    exposing the Firestore `batch()` / `collection(name).document()` API. `is_online` is consulted before each commit;
+    batches that cannot be sent are handed to `on_failure(payloads)`. `on_reconnect` runs whenever
+    the worker goes from offline (or freshly started) to online, e.g. to drain pending logs.
+    """
+    def __init__(self, client, max_batch_size=50, max_latency=2.0, is_online=None,
+                 on_failure=None, on_reconnect=None):
+        super().__init__(daemon=True, name="UploadWorker")
+        self.client = client
+        self.max_batch_size = max(1, min(max_batch_size, FIRESTORE_MAX_BATCH))
+        self.max_latency = max_latency
+        self.is_online = is_online
+        self.on_failure = on_failure
+        self.on_reconnect = on_reconnect
+        self._queue = queue.Queue()
+        self._online = False
+        self._lock = threading.Lock()
+        self._events_committed = 0
+        self._events_failed = 0
+        self._batches_committed = 0
+        self._flush_total = 0.0
+        self._flush_max = 0.0
+        self._flush_last = 0.0
+        self._wait_total = 0.0
+
+    def _get_client(self):
+        # A zero-argument callable may be passed instead of a client to create it lazily
+        return self.client() if callable(self.client) else self.client
+
+    def enqueue(self, payload):
+        """Queue one {"collection_name", "data"} payload. Never blocks."""
+        self._queue.put((payload, time.monotonic()))
+
+    def stop(self, timeout=5.0):
+        """Flush whatever is queued and stop the thread."""
+        self._queue.put(_STOP)
+        self.join(timeout)
+
+    def stats(self):
+        """Snapshot of queue depth and flush-latency statistics (seconds)."""
+        with self._lock:
+            batches = self._batches_committed
+            return {
+                'queue_depth': self._queue.qsize(),
+                'events_committed': self._events_committed,
+                'events_failed': self._events_failed,
+                'batches_committed': batches,
+                'last_flush_latency': self._flush_last,
+                'mean_flush_latency': self._flush_total / batches if batches else 0.0,
+                'max_flush_latency': self._flush_max,
+                'mean_queue_wait': self._wait_total / self._events_committed if self._events_committed else 0.0,
+            }
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = item[1] + self.max_latency
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    def _check_online(self):
+        online = self.is_online() if self.is_online else True
+        if online and not self._online and self.on_reconnect:
+            try:
+                self.on_reconnect()
+            except Exception as e:
+                print(f"[WARNING] Reconnect hook failed: {e}")
+        self._online = online
+        return online
+
+    def _flush(self, batch):
+        payloads = [p for p, _ in batch]
+        if not self._check_online():
+            self._fail(payloads, "offline")
+            return
+        start = time.monotonic()
+        try:
+            as_backend(self._get_client()).commit_batch(payloads)
+        except Exception as e:
+            self._online = False
+            self._fail(payloads, e)
+            return
+        end = time.monotonic()
+        with self._lock:
+            latency = end - start
+            self._flush_last = latency
+            self._flush_total += latency
+            self._flush_max = max(self._flush_max, latency)
+            self._batches_committed += 1
+            self._events_committed += len(batch)
+            self._wait_total += sum(end - t for _, t in batch)
+
+    def _fail(self, payloads, reason):
+        with self._lock:
+            self._events_failed += len(payloads)
+        if self.on_failure:
+            self.on_failure(payloads)
+        else:
+            print(f"[WARNING] Dropped {len(payloads)} upload(s): {reason}")
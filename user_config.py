@@ -10,6 +10,8 @@ ANIMALS = [
 ]
 
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "user_config.json")
+# Per-user blink calibration, keyed by user name, stored next to user_config.json
+CALIBRATION_PATH = os.path.join(os.path.dirname(__file__), "calibration_profiles.json")
 
 def get_or_create_username():
     if os.path.exists(CONFIG_PATH):
@@ -24,5 +26,37 @@ def get_or_create_username():
         json.dump({"user_name": username}, f)
     return username
 
+def _load_calibration_profiles():
+    if not os.path.exists(CALIBRATION_PATH):
+        return {}
+    try:
+        with open(CALIBRATION_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def load_calibration(user_name):
+    """Return the saved calibration dict for `user_name` (threshold, open_ear, closed_ear, ...) or None."""
+    return _load_calibration_profiles().get(user_name or "unknownuser")
+
+def save_calibration(user_name, threshold, open_ear, closed_ear):
+    """Store (or refresh) a user's calibration so later sessions can skip the startup calibration."""
+    from datetime import datetime
+    profiles = _load_calibration_profiles()
+    key = user_name or "unknownuser"
+    previous = profiles.get(key, {})
+    profiles[key] = {
+        "threshold": float(threshold),
+        "open_ear": float(open_ear),
+        "closed_ear": float(closed_ear),
+        "sessions": previous.get("sessions", 0) + 1,
+        "updated": datetime.now().isoformat(timespec="seconds"),
+    }
+    # Write then rename so a crash never leaves a half-written file
+    tmp_path = CALIBRATION_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(profiles, f, indent=2)
+    os.replace(tmp_path, CALIBRATION_PATH)
+
 if __name__ == "__main__":
     print(get_or_create_username())
@@ -2,7 +2,9 @@ from PyQt6.QtWidgets import QWidget, QHBoxLayout, QPushButton
 from PyQt6.QtCore import Qt, QSize
 from PyQt6.QtWidgets import QWidget, QHBoxLayout, QPushButton, QLabel, QSpacerItem, QSizePolicy
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QIcon, QFontMetrics, QPainterPath
+from PyQt6.QtGui import QIcon, QPainterPath
+import font_registry
+import title_parser
 
 class ModernWindowControls(QWidget):
     def mousePressEvent(self, event):
@@ -45,61 +47,98 @@ class ModernWindowControls(QWidget):
         # --- Premium animated branding label: gradient shine sweep ---
         from PyQt6.QtCore import QTimer
         from PyQt6.QtWidgets import QLabel
-        from PyQt6.QtGui import QPainter, QLinearGradient, QColor, QFont, QBrush
+        from PyQt6.QtGui import QPainter, QLinearGradient, QColor, QBrush, QPixmap
 
         class AnimatedBrandingLabel(QLabel):
+            """
+            Branding text with a shine sweeping across it. The text layout is computed once per
+            font and size, and each shine position is rendered to a sprite frame the first time
+            it is shown, so steady-state painting is one pixmap blit. The 30 ms tick only runs
+            while the label is visible and its window is not minimised.
+            """
+            SHINE_STEP = 4
+            SHINE_TAIL = 80
+
             def __init__(self, parent=None):
                 super().__init__(parent)
                 self.setText("")
                 self.offset = 0
                 self.timer = QTimer(self)
+                self.timer.setInterval(30)
                 self.timer.timeout.connect(self.animate)
-                self.timer.start(30)
                 self.setStyleSheet("padding-left:13px; padding-right:10px; background: transparent;")
-                # Load Gotham-UltraItalic.otf from fonts directory
-                import os
-                from PyQt6.QtGui import QFontDatabase, QFont
-                fonts_dir = os.path.join(os.path.dirname(__file__), 'fonts')
-                gotham_ultra_italic_path = os.path.join(fonts_dir, 'Gotham-UltraItalic.otf')
-                font_loaded = False
-                if os.path.exists(gotham_ultra_italic_path):
-                    font_id = QFontDatabase.addApplicationFont(gotham_ultra_italic_path)
-                    if font_id != -1:
-                        family = QFontDatabase.applicationFontFamilies(font_id)[0]
-                        self.gotham_font = QFont(family, 13, QFont.Weight.Bold, italic=True)
-                        font_loaded = True
-                    else:
-                        print('[WARNING] Failed to load Gotham-UltraItalic.otf, using fallback font.')
-                if not font_loaded:
-                    self.gotham_font = QFont("Arial", 13, QFont.Weight.Bold, italic=True)
+                # Gotham-UltraItalic.otf, registered once per process (Arial if unavailable)
+                self.gotham_font = font_registry.font('branding')
+                self.sub_font = font_registry.font('branding_sub')
                 self.setFont(self.gotham_font)
                 self.text_main = "FILMDA."
                 self.text_sub = "AI Player"
+                self._size_hint = None
+                self._layout_size = None
+                self._frames = {}
 
             def sizeHint(self):
-                fm_main = QFontMetrics(QFont("Gotham Bold Italic", 13, QFont.Weight.Bold, italic=True))
-                fm_sub = QFontMetrics(QFont("Gotham", 11))
-                total_width = 13 + fm_main.horizontalAdvance(self.text_main) + 6 + fm_sub.horizontalAdvance(self.text_sub) + 13
-                total_height = max(fm_main.height(), fm_sub.height()) + 6
-                return QSize(total_width, total_height)
+                if self._size_hint is None:
+                    fm_main = font_registry.metrics('branding')
+                    fm_sub = font_registry.metrics('branding_sub')
+                    total_width = 13 + fm_main.horizontalAdvance(self.text_main) + 6 + fm_sub.horizontalAdvance(self.text_sub) + 13
+                    total_height = max(fm_main.height(), fm_sub.height()) + 6
+                    self._size_hint = QSize(total_width, total_height)
+                return self._size_hint
+
+            def _should_animate(self):
+                return self.isVisible() and not self.window().isMinimized()
+
+            def _update_timer(self):
+                if self._should_animate():
+                    if not self.timer.isActive():
+                        self.timer.start()
+                elif self.timer.isActive():
+                    self.timer.stop()
+
+            def showEvent(self, event):
+                super().showEvent(event)
+                self._update_timer()
+
+            def hideEvent(self, event):
+                # Also delivered when the window is minimised or branding is hidden in fullscreen
+                super().hideEvent(event)
+                self._update_timer()
+
+            def resizeEvent(self, event):
+                self._layout_size = None
+                self._frames.clear()
+                self.offset = 0
+                super().resizeEvent(event)
 
             def animate(self):
-                self.offset = (self.offset + 4) % (self.width() + 80)
+                if not self._should_animate():
+                    self.timer.stop()
+                    return
+                # Sweep period rounded up to whole steps, so every pass reuses the same sprite frames
+                steps = -(-(self.width() + self.SHINE_TAIL) // self.SHINE_STEP)
+                self.offset = (self.offset + self.SHINE_STEP) % (steps * self.SHINE_STEP)
                 self.update()
 
-            def paintEvent(self, event):
-                painter = QPainter(self)
+            def _layout_text(self):
+                fm = font_registry.metrics('branding')
+                self._baseline = (self.height() + fm.ascent() - fm.descent()) // 2
+                self._text_x = 13
+                self._text_path = QPainterPath()
+                self._text_path.addText(self._text_x, self._baseline, self.gotham_font, self.text_main)
+                self._sub_x = self._text_x + fm.horizontalAdvance(self.text_main) + 6
+                self._layout_size = self.size()
+
+            def _render_frame(self, offset):
+                ratio = self.devicePixelRatioF()
+                frame = QPixmap(max(1, round(self.width() * ratio)), max(1, round(self.height() * ratio)))
+                frame.setDevicePixelRatio(ratio)
+                frame.fill(Qt.GlobalColor.transparent)
+                painter = QPainter(frame)
                 painter.setRenderHint(QPainter.RenderHint.Antialiasing)
                 # --- Animate FILMDA. AI with a wide, bright shine ---
-                painter.setFont(self.gotham_font)
-                fm = QFontMetrics(self.gotham_font)
-                y = (self.height() + fm.ascent() - fm.descent()) // 2
-                text_x = 13
-                text_main = self.text_main
-                text_sub = self.text_sub
-                text_main_width = fm.horizontalAdvance(text_main)
-                # Draw animated gradient only over FILMDA. AI
-                grad = QLinearGradient(text_x + self.offset - 120, 0, text_x + self.offset + 80, 0)
+                text_x = self._text_x
+                grad = QLinearGradient(text_x + offset - 120, 0, text_x + offset + 80, 0)
                 grad.setColorAt(0.0, QColor("#3e4b8a"))
                 grad.setColorAt(0.35, QColor("#3e4b8a"))
                 grad.setColorAt(0.45, QColor(255,255,255,235))  # Brighter, wider shine
@@ -107,15 +146,24 @@ class ModernWindowControls(QWidget):
                 grad.setColorAt(1.0, QColor("#3e4b8a"))
                 painter.setPen(Qt.PenStyle.NoPen)
                 painter.setBrush(QBrush(grad))
-                # Draw FILMDA. AI with animated brush
-                path = QPainterPath()
-                path.addText(text_x, y, self.gotham_font, text_main)
-                painter.drawPath(path)
+                painter.drawPath(self._text_path)
                 # Draw 'Player' static, regular
                 painter.setPen(QColor("#666"))
-                painter.setFont(QFont("Gotham", 11, QFont.Weight.Normal, italic=False))
-                x = text_x + text_main_width + 6
-                painter.drawText(x, y, text_sub)
+                painter.setFont(self.sub_font)
+                painter.drawText(self._sub_x, self._baseline, self.text_sub)
+                painter.end()
+                return frame
+
+            def paintEvent(self, event):
+                if self._layout_size != self.size():
+                    self._layout_text()
+                    self._frames.clear()
+                frame = self._frames.get(self.offset)
+                if frame is None:
+                    frame = self._frames[self.offset] = self._render_frame(self.offset)
+                painter = QPainter(self)
+                painter.drawPixmap(0, 0, frame)
+                painter.end()
 
         self.brandingLabel = AnimatedBrandingLabel()
         layout.addWidget(self.brandingLabel, 0, Qt.AlignmentFlag.AlignVCenter)
@@ -129,6 +177,12 @@ class ModernWindowControls(QWidget):
         self.titleLabel.setMaximumWidth(140)
         self.titleLabel.setTextFormat(Qt.TextFormat.RichText)
         layout.addWidget(self.titleLabel, 0, Qt.AlignmentFlag.AlignVCenter)
+        # Offline-log sync status, only shown while a backlog is being uploaded
+        self.syncLabel = QLabel()
+        self.syncLabel.setObjectName("syncStatusLabel")
+        self.syncLabel.setStyleSheet("font-size: 9px; color: #6f7890; padding: 0 6px 0 0; background: transparent;")
+        self.syncLabel.hide()
+        layout.addWidget(self.syncLabel, 0, Qt.AlignmentFlag.AlignVCenter)
 
         # Window control buttons (min, max, close)
         self.minBtn = QPushButton()
@@ -157,35 +211,20 @@ class ModernWindowControls(QWidget):
     def set_branding_visible(self, visible):
         self.brandingLabel.setVisible(visible)
 
+    def set_sync_status(self, uploaded, remaining):
+        """Show pending-upload progress; hidden once nothing is left to sync."""
+        if remaining:
+            self.syncLabel.setText(f"Syncing {uploaded}/{uploaded + remaining}")
+            self.syncLabel.show()
+        else:
+            self.syncLabel.hide()
+
     def set_title(self, text):
         """
         Set the window title label to a cleaned movie/show name using robust extraction logic (same as overlay).
         """
-        import re
         if text:
-            # Remove extension
-            name = re.sub(r'\.[^.]+$', '', text)
-            # Replace dots and underscores with spaces
-            name = re.sub(r'[._]+', ' ', name)
-            # Try to stop at year if present (e.g. 2024, 1999)
-            match_year = re.search(r'(19|20)\d{2}', name)
-            cut_idx = match_year.end() if match_year else None
-            # Remove known tags and everything after first occurrence
-            tag_regex = r'\b(1080p|720p|2160p|4k|8k|blu[- ]?ray|brrip|web[- ]?dl|webrip|hdrip|dvdrip|x264|x265|hevc|aac|ac3|mp3|h264|dsr|ds4k|ds|repack|remux|remastered|subs|dubbed|dual[- ]?audio|proper|uncut|extended|limited|hd|sd|cam|hdtv|yts|yify|rarbg|smg|ettv|etrg|evo|galaxy|mkvcage|mkvhub|sonyliv|amazon|netflix|prime|hotstar|zee5|voot|disney|apple|atv|amzn|hmax|web|tc|ts|dv|rip|hdr|uhd|sdr|avc|vc1|dts|truehd|flac|mka|mks|mkv|mp4|avi|mov|wmv|mov|mpg|mpeg|ogg|ogm|wmv|rmvb|rm|divx|xvid|fgt|rarbg|evo|yify|yts)\b'
-            match_tag = re.search(tag_regex, name, re.IGNORECASE)
-            if match_tag:
-                cut_idx = min(cut_idx, match_tag.start()) if cut_idx else match_tag.start()
-            if cut_idx:
-                name = name[:cut_idx]
-            # Remove trailing non-word chars
-            name = re.sub(r'[^\w\s]+$', '', name)
-            # Remove extra spaces
-            name = re.sub(r'\s+', ' ', name).strip()
-            # Safety: If name is too short, fall back to first 2 words
-            if len(name) < 4:
-                name = ' '.join(text.replace('.', ' ').replace('_', ' ').split()[:2])
-            # Title case for display
-            name = name.title()
+            name = title_parser.parse(text).title
             self.titleLabel.setText(f"<span style='font-family: Gotham, Arial, sans-serif; font-size:10px; color:#b0b8c9; font-weight:400;'>{name} |</span>")
         else:
             self.titleLabel.setText("")